@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Adaptive Timing
+Goal: Wait timeouts and retries derived from each step's measured latency instead of fixed constants
+"""
+
+import time
+from collections import defaultdict, deque
+
+from step_timing import percentile, summarize
+
+# Fixed timeouts (s) the engine used per wait; also the starting point before enough samples exist.
+# Each wait has its own step so a quick wait never shares samples with a slow one.
+DEFAULT_TIMEOUTS = {
+    "loading": 30,
+    "start_button": 10,
+    "app_window": 10,
+    "code_select": 15,
+    "code_switch": 15,
+    "project_open": 30,
+    "tab": 10,
+    "tab_ready": 10,
+    "add_button": 5,
+    "open_modal": 5,
+    "select": 5,
+    "create": 5,
+    "modal_close": 5,
+    "row_appear": 10,
+}
+
+# Waits whose timeout is not an error: the loading indicator is often gone before
+# the wait starts, so its samples say nothing about how long a real load takes
+UNTUNED_STEPS = ("loading",)
+
+
+class FixedTiming:
+    """
+    The original behaviour: the DEFAULT_TIMEOUTS constants, one attempt, nothing learned
+    """
+
+    def __init__(self, timeouts=None):
+        self.timeouts = dict(DEFAULT_TIMEOUTS, **(timeouts or {}))
+
+    def timeout(self, step):
+        return self.timeouts.get(step, 10)
+
+    def run(self, step, attempt, retry_on):
+        return attempt(self.timeout(step))
+
+    def summary(self):
+        return {}
+
+
+class TimingPolicy(FixedTiming):
+    """
+    Learns how long each wait takes and sizes its timeout from that.
+
+    Once a step has `min_samples` successful waits, its timeout is the
+    `pct` percentile of the recent ones times `k`, clamped between `floor`
+    and `ceiling` seconds. When the site is fast, a stuck step fails in
+    seconds; when it is slow, the timeout grows with it. A wait that times
+    out is retried up to `retries` times with twice the timeout and a short
+    backoff sleep; until a step has its samples, all of its attempts together
+    get at most `cold_budget` times the fixed timeout. Only waits go through
+    run(), never clicks, so a retry cannot add an area twice. Steps in
+    `untuned` keep their fixed timeout.
+    """
+
+    def __init__(self, timeouts=None, k=3.0, pct=99, floor=0.5, ceiling=60, min_samples=20,
+                 retries=2, backoff=0.25, history=500, untuned=UNTUNED_STEPS, cold_budget=1.5):
+        super().__init__(timeouts)
+        self.untuned = set(untuned)
+        self.k = k
+        self.pct = pct
+        self.floor = floor
+        self.ceiling = ceiling
+        self.min_samples = min_samples
+        self.retries = retries
+        self.backoff = backoff
+        self.cold_budget = cold_budget
+        self.samples = defaultdict(lambda: deque(maxlen=history))
+        self.timeouts_hit = defaultdict(int)
+        self.retried_ok = defaultdict(int)
+
+    def tuned(self, step):
+        """
+        True once the step's timeout comes from its measured latency
+        """
+        return step not in self.untuned and len(self.samples[step]) >= self.min_samples
+
+    def timeout(self, step):
+        if not self.tuned(step):
+            return super().timeout(step)
+        return min(self.ceiling, max(self.floor, percentile(list(self.samples[step]), self.pct) * self.k))
+
+    def observe(self, step, seconds):
+        self.samples[step].append(seconds)
+
+    def run(self, step, attempt, retry_on):
+        """
+        Call attempt(timeout) until it doesn't raise retry_on, doubling the timeout each time.
+
+        An untuned step gives up once `cold_budget` times its fixed timeout
+        is spent, so a 10s wait takes at most 15s rather than 10 + 20 + 40s.
+        """
+        timeout = self.timeout(step)
+        budget = None if self.tuned(step) else timeout * self.cold_budget
+        run_started = time.perf_counter()
+        for number in range(self.retries + 1):
+            started = time.perf_counter()
+            try:
+                value = attempt(timeout)
+            except retry_on:
+                self.timeouts_hit[step] += 1
+                if number == self.retries:
+                    raise
+                time.sleep(self.backoff * 2 ** number)
+                timeout = min(self.ceiling, timeout * 2)
+                if budget is not None:
+                    timeout = min(timeout, budget - (time.perf_counter() - run_started))
+                    if timeout < self.floor:
+                        raise
+                continue
+            self.observe(step, time.perf_counter() - started)
+            if number:
+                self.retried_ok[step] += 1
+            return value
+
+    def summary(self):
+        """
+        {step: current timeout, latency stats, timeouts hit and waits saved by a retry}
+        """
+        return {
+            step: dict(summarize(list(samples)), timeout=self.timeout(step),
+                       timeouts=self.timeouts_hit[step], retried_ok=self.retried_ok[step])
+            for step, samples in self.samples.items()
+        }
+
+    def report(self):
+        summary = self.summary()
+        if not summary:
+            return
+        print("\n⏲️  Adaptive timeouts:")
+        for step, stats in summary.items():
+            print(f"   {step:<12} timeout={stats['timeout']:6.2f}s p95={stats['p95'] * 1000:7.1f}ms "
+                  f"n={stats['count']:<5} timeouts={stats['timeouts']} saved by retry={stats['retried_ok']}")
+
+
+FIXED_TIMING = FixedTiming()
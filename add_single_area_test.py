@@ -4,88 +4,31 @@ Test adding a single area category - Complete cycle proof of concept
 Goal: Select radio button → open dropdown → pick option → submit
 """
 
-import time
-import json
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from driver_factory import DriverConfig, create_driver
+from driver_trace import trace_driver
+from catalog_discovery import discover_catalog, build_catalog, write_catalog
+from comcheck_engine import (
+    catalog_path_for, find_code, populate_areas, report, select_code, open_interior_lighting,
+    select_populated, CREATE_BUTTON_XPATH,
+)
 
 def discover_all_area_categories(driver):
     """
-    Discover and catalog all area categories and subcategories
+    Discover and catalog all area categories and subcategories from the open modal
     """
     print("=== DISCOVERING ALL AREA CATEGORIES ===")
     
-    categories_catalog = {}
-    
     try:
-        # Find all radio buttons in the modal
-        radio_buttons = driver.find_elements(By.CSS_SELECTOR, "input[type='radio']")
-        print(f"Found {len(radio_buttons)} radio buttons")
-        
-        for i, radio in enumerate(radio_buttons):
-            try:
-                # Get the label text for this radio button
-                radio_id = radio.get_attribute('id')
-                if not radio_id:
-                    continue
-                    
-                # Find the label associated with this radio
-                try:
-                    label = driver.find_element(By.CSS_SELECTOR, f"label[for='{radio_id}']")
-                    category_name = label.text.strip()
-                except:
-                    # Fallback: look for text near the radio
-                    category_name = f"Category_{i+1}"
-                
-                if not category_name:
-                    continue
-                    
-                print(f"\nDiscovering category: '{category_name}'")
-                
-                # Click the radio button to unlock its dropdown
-                driver.execute_script("arguments[0].click();", radio)
-                time.sleep(1)
-                
-                # Look for the associated dropdown/select element
-                subcategories = []
-                try:
-                    # Try to find select element near this radio
-                    parent = radio.find_element(By.XPATH, "./..")
-                    select_elem = parent.find_element(By.TAG_NAME, "select")
-                    
-                    # Get all options from the dropdown
-                    select_obj = Select(select_elem)
-                    options = select_obj.options
-                    
-                    for option in options[1:]:  # Skip first "Select..." option
-                        option_text = option.text.strip()
-                        if option_text:
-                            subcategories.append(option_text)
-                    
-                    print(f"  Found {len(subcategories)} subcategories")
-                    categories_catalog[category_name] = subcategories
-                    
-                except Exception as e:
-                    print(f"  ⚠️ Could not find dropdown for '{category_name}': {e}")
-                    # Still add the category, even if no subcategories found
-                    categories_catalog[category_name] = []
-                
-            except Exception as e:
-                print(f"  ❌ Error processing radio button {i+1}: {e}")
-                continue
+        categories_catalog, dropped = discover_catalog(driver)
+        for category_name in dropped:
+            print(f"  ⏭️  Dropped '{category_name}' (no subcategories)")
         
         # Save the catalog
-        catalog_file = '/Users/home/comcheck_scrape/iecc_2018_areas_catalog.json'
-        with open(catalog_file, 'w') as f:
-            json.dump({
-                "code": "IECC 2018", 
-                "categories": categories_catalog,
-                "total_categories": len(categories_catalog),
-                "total_subcategories": sum(len(subcats) for subcats in categories_catalog.values())
-            }, f, indent=2)
+        catalog_file = catalog_path_for("CEZ_IECC2018")
+        write_catalog(build_catalog(find_code("CEZ_IECC2018"), categories_catalog), catalog_file)
         
         print(f"\n✅ DISCOVERY COMPLETE!")
         print(f"📁 Saved catalog to: {catalog_file}")
@@ -98,104 +41,20 @@ def discover_all_area_categories(driver):
         print(f"❌ Error during discovery: {e}")
         return {}
 
-def populate_all_area_categories(driver, catalog_file='/Users/home/comcheck_scrape/iecc_2018_areas_catalog.json'):
+def populate_all_area_categories(driver, catalog_file=catalog_path_for("CEZ_IECC2018")):
     """
     Populate all area categories from the catalog
     """
     print("=== POPULATING ALL AREA CATEGORIES ===")
     
-    # Load the catalog
     try:
-        with open(catalog_file, 'r') as f:
-            catalog_data = json.load(f)
-        categories = catalog_data['categories']
-        total_combinations = sum(len(subcats) for subcats in categories.values() if subcats)
-        print(f"📊 Loaded catalog with {len(categories)} categories and {total_combinations} total combinations")
+        result = populate_areas(driver, "CEZ_IECC2018", catalog_file)
     except Exception as e:
         print(f"❌ Could not load catalog: {e}")
         return
     
-    success_count = 0
-    error_count = 0
-    
-    # Iterate through each category and its subcategories
-    for category_name, subcategories in categories.items():
-        if not subcategories:  # Skip categories with no subcategories
-            print(f"⏭️  Skipping '{category_name}' (no subcategories)")
-            continue
-            
-        print(f"\n📂 Processing category: '{category_name}' ({len(subcategories)} subcategories)")
-        
-        for i, subcategory in enumerate(subcategories, 1):
-            try:
-                print(f"  🔄 Adding {i}/{len(subcategories)}: '{subcategory}'")
-                
-                # Step 1: Click Add Area Category button to open modal
-                add_area_button = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable((By.ID, "addAreaCategory"))
-                )
-                add_area_button.click()
-                time.sleep(2)
-                
-                # Step 2: Find and click the radio button for this category
-                radio_buttons = driver.find_elements(By.CSS_SELECTOR, "input[type='radio']")
-                category_radio = None
-                
-                for radio in radio_buttons:
-                    radio_id = radio.get_attribute('id')
-                    if radio_id:
-                        try:
-                            label = driver.find_element(By.CSS_SELECTOR, f"label[for='{radio_id}']")
-                            if label.text.strip() == category_name:
-                                category_radio = radio
-                                break
-                        except:
-                            continue
-                
-                if not category_radio:
-                    print(f"    ❌ Could not find radio button for '{category_name}'")
-                    error_count += 1
-                    continue
-                
-                # Click the radio button
-                driver.execute_script("arguments[0].click();", category_radio)
-                time.sleep(1)
-                
-                # Step 3: Find the dropdown and select the subcategory
-                try:
-                    parent = category_radio.find_element(By.XPATH, "./..")
-                    select_elem = parent.find_element(By.TAG_NAME, "select")
-                    select_obj = Select(select_elem)
-                    select_obj.select_by_visible_text(subcategory)
-                    time.sleep(1)
-                except Exception as e:
-                    print(f"    ❌ Could not select subcategory '{subcategory}': {e}")
-                    error_count += 1
-                    continue
-                
-                # Step 4: Click "Create Area Category" button
-                try:
-                    create_button = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Create Area Category')] | //*[@value='Create Area Category']"))
-                    )
-                    create_button.click()
-                    time.sleep(2)  # Wait for modal to close and area to be added
-                    
-                    success_count += 1
-                    print(f"    ✅ Successfully added '{subcategory}'")
-                    
-                except Exception as e:
-                    print(f"    ❌ Could not click Create button: {e}")
-                    error_count += 1
-                
-            except Exception as e:
-                print(f"    ❌ Error adding '{subcategory}': {e}")
-                error_count += 1
-    
-    print(f"\n🏁 POPULATION COMPLETE!")
-    print(f"✅ Successfully added: {success_count}")
-    print(f"❌ Errors: {error_count}")
-    print(f"📊 Success rate: {success_count/(success_count + error_count)*100:.1f}%" if (success_count + error_count) > 0 else "No items processed")
+    report(result)
+    return result
 
 def test_single_area_addition():
     """
@@ -206,9 +65,8 @@ def test_single_area_addition():
         print("=== TESTING SINGLE AREA CATEGORY ADDITION ===")
         print("Step 1: Setting up and navigating to IECC 2018...")
         
-        service = ChromeService()
-        driver = webdriver.Chrome(service=service)
-        driver.maximize_window()
+        driver = create_driver(DriverConfig.interactive())
+        trace_driver(driver)
         
         # Navigate and setup (reusing our proven flow)
         url = "https://energycode.pnl.gov/COMcheckWeb/"
@@ -236,33 +94,16 @@ def test_single_area_addition():
         except:
             pass
         
-        # Select IECC 2018
-        code_dropdown = WebDriverWait(driver, 15).until(
-            EC.element_to_be_clickable((By.ID, "code"))
-        )
-        select = Select(code_dropdown)
-        select.select_by_value("CEZ_IECC2018")
+        # Select IECC 2018 and wait for the page update
+        select_code(driver, "CEZ_IECC2018")
         print("✓ Selected IECC 2018")
-        
-        # Wait for page update after code selection
-        time.sleep(2)
-        try:
-            WebDriverWait(driver, 30).until(
-                EC.invisibility_of_element_located((By.ID, "loadingIndicator"))
-            )
-        except:
-            pass
-        time.sleep(3)
         print("✓ Page updated after code selection")
         
         print("Step 2: Clicking Interior Lighting Method and Areas tab...")
         # Click the Interior Lighting Method and Areas tab (it's a label/tab, not a radio button)
         try:
             # Try clicking the label for the radio button (which acts as the tab)
-            int_lighting_tab = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "label[for='bat_category_int_lighting']"))
-            )
-            int_lighting_tab.click()
+            open_interior_lighting(driver)
             print("✓ Clicked Interior Lighting Method and Areas tab via label")
         except:
             # Fallback: click the radio input directly
@@ -271,7 +112,6 @@ def test_single_area_addition():
             )
             int_lighting_radio.click()
             print("✓ Clicked Interior Lighting Method and Areas tab via radio input")
-        time.sleep(2)
         
         print("Step 3: Opening Add Area Category modal...")
         # Click Add Area Category button using the exact ID from the screenshot
@@ -302,7 +142,9 @@ def test_single_area_addition():
                         print(f"  Button {i+1}: ID='{btn_id}', Text='{btn_text}', Class='{btn_class}'")
                 raise
         
-        time.sleep(3)
+        WebDriverWait(driver, 10).until(
+            EC.visibility_of_element_located((By.XPATH, CREATE_BUTTON_XPATH))
+        )
         print("✓ Modal opened")
         
         print("Step 4: Using the open modal for single area test...")
@@ -347,7 +189,6 @@ def test_single_area_addition():
         # Click the Convention Center radio button
         print("Step 6: Clicking Convention Center radio button...")
         driver.execute_script("arguments[0].click();", convention_radio)
-        time.sleep(2)
         print("✓ Clicked Convention Center radio button")
         
         # Find the dropdown and select subcategory (using discovery script approach)
@@ -357,6 +198,7 @@ def test_single_area_addition():
             # Try to find select element near this radio (same as discovery script)
             parent = convention_radio.find_element(By.XPATH, "./..")
             select_elem = parent.find_element(By.TAG_NAME, "select")
+            WebDriverWait(driver, 5).until(select_populated(select_elem))
             
             # Get all options from the dropdown (same as discovery script)
             select_obj = Select(select_elem)
@@ -377,7 +219,6 @@ def test_single_area_addition():
                 target_subcategory = subcategories[0]
                 select_obj.select_by_visible_text(target_subcategory)
                 print(f"✓ Selected: '{target_subcategory}'")
-                time.sleep(1)
             else:
                 print("❌ No valid subcategories found")
                 return
@@ -425,7 +266,7 @@ def test_single_area_addition():
                 raise Exception("Could not find Create Area Category button")
             
             create_button.click()
-            time.sleep(3)
+            WebDriverWait(driver, 10).until(EC.staleness_of(create_button))
             print("✓ Clicked Create Area Category button")
             print("✓ SINGLE AREA CATEGORY TEST COMPLETED!")
             
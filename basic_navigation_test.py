@@ -5,11 +5,10 @@ Goal: Navigate to COMcheck and successfully read the first code option from drop
 """
 
 import time
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from driver_factory import DriverConfig, create_driver
 
 def test_basic_navigation():
     """
@@ -21,9 +20,7 @@ def test_basic_navigation():
         print("Step 1: Initializing WebDriver...")
         
         # Setup Chrome driver
-        service = ChromeService()
-        driver = webdriver.Chrome(service=service)
-        driver.maximize_window()
+        driver = create_driver(DriverConfig.interactive())
         
         print("Step 2: Navigating to COMcheck-Web...")
         url = "https://energycode.pnl.gov/COMcheckWeb/"
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+End-to-End Population Benchmark
+Goal: Areas per second, per-step p50/p95 and WebDriver command counts for fixed codes
+"""
+
+import sys
+import json
+import time
+import platform
+import argparse
+from datetime import datetime
+
+from code_catalogs import load_catalog, catalog_path_for, count_combinations
+from driver_factory import DriverConfig, launch_driver, browser_rss_mb
+from comcheck_engine import (
+    start_application, select_code, open_interior_lighting, populate_areas,
+)
+from driver_trace import CommandTrace
+from standin_server import serve_in_thread
+
+BENCHMARK_CODES = ["CEZ_IECC2015", "CEZ_IECC2018"]
+DEFAULT_OUTPUT = "benchmark_results.json"
+
+# Metrics compared against a baseline run: (key, True when higher is better)
+REGRESSION_METRICS = [("areas_per_second", True), ("seconds_per_area", False), ("commands_per_area", False)]
+
+
+def benchmark_code(code_value, url, batch=False, headless=True):
+    """
+    Populate one code in a fresh browser and measure the run
+    """
+    catalog = load_catalog(catalog_path_for(code_value))
+    timer = CommandTrace(keep_events=False)
+    driver, browser = launch_driver(DriverConfig(headless=headless))
+    try:
+        timer.attach(driver)
+
+        started = time.perf_counter()
+        with timer.tagged(code=code_value), timer.step('bootstrap'):
+            start_application(driver, url)
+        with timer.tagged(code=code_value), timer.step('code_switch'):
+            select_code(driver, code_value)
+            open_interior_lighting(driver)
+        bootstrap_commands = sum(timer.command_counts().values())
+
+        result = populate_areas(driver, code_value, catalog, batch=batch, timer=timer)
+        total = time.perf_counter() - started
+        browser['rss_mb_end'] = browser_rss_mb(driver)
+    finally:
+        driver.quit()
+
+    commands = timer.command_counts()
+    added = result['success']
+    loop_commands = sum(commands.values()) - bootstrap_commands
+    return {
+        "code": code_value,
+        "areas_expected": count_combinations(catalog['categories']),
+        "areas_added": added,
+        "errors": result['errors'],
+        "total_seconds": total,
+        "loop_seconds": result['elapsed'],
+        "seconds_per_area": result['elapsed'] / added if added else None,
+        "areas_per_second": added / result['elapsed'] if result['elapsed'] else 0.0,
+        "steps": timer.summary(),
+        "commands": dict(commands.most_common()),
+        "command_seconds": {command: stats['total'] for command, stats in timer.command_summary().items()},
+        "commands_total": sum(commands.values()),
+        "commands_per_area": loop_commands / added if added else None,
+        "browser": browser,
+    }
+
+
+def per_area_changes(results, baseline):
+    """
+    (code, seconds per area before, after) for every code in both runs
+    """
+    previous = {run['code']: run for run in baseline.get('runs', [])}
+    return [
+        (run['code'], previous[run['code']].get('seconds_per_area'), run.get('seconds_per_area'))
+        for run in results['runs'] if run['code'] in previous
+    ]
+
+
+def compare(results, baseline, tolerance):
+    """
+    List metrics that got worse than the baseline by more than tolerance (a fraction)
+    """
+    regressions = []
+    previous = {run['code']: run for run in baseline.get('runs', [])}
+    for run in results['runs']:
+        before = previous.get(run['code'])
+        if not before:
+            continue
+        for key, higher_is_better in REGRESSION_METRICS:
+            old, new = before.get(key), run.get(key)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{run['code']} {key}: {old:.3f} -> {new:.3f} ({change:+.0%})")
+    return regressions
+
+
+def print_run(run):
+    """
+    Human-readable summary of one benchmarked code
+    """
+    print(f"\n📊 {run['code']}: {run['areas_added']}/{run['areas_expected']} areas, "
+          f"{run['areas_per_second']:.2f} areas/s"
+          + (f" ({run['seconds_per_area']:.3f}s per area)" if run['seconds_per_area'] else "")
+          + f", {run['commands_total']} WebDriver commands")
+    for name, stats in run['steps'].items():
+        print(f"   {name:<15} n={stats['count']:<4} p50={stats['p50'] * 1000:8.1f}ms "
+              f"p95={stats['p95'] * 1000:8.1f}ms")
+
+
+def main(argv=None):
+    """
+    Command line entry point: benchmark against the stand-in server or a live URL
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the COMcheck population engine.")
+    parser.add_argument("codes", nargs="*", default=BENCHMARK_CODES, help="code values to benchmark")
+    parser.add_argument("--url", help="landing page to benchmark (default: local stand-in server)")
+    parser.add_argument("--latency", type=float, default=0.05, help="stand-in server latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="stand-in server latency spread")
+    parser.add_argument("--batch", action="store_true", help="benchmark the batched per-category mode")
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="results JSON")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed regression (fraction)")
+    args = parser.parse_args(argv)
+
+    server = None
+    url = args.url
+    if not url:
+        server, url = serve_in_thread(latency=args.latency, jitter=args.jitter)
+        print(f"🧪 Using stand-in server at {url} (latency {args.latency}s)")
+
+    results = {
+        "timestamp": datetime.now().isoformat(timespec='seconds'),
+        "url": args.url or "standin",
+        "latency": None if args.url else args.latency,
+        "batch": args.batch,
+        "python": platform.python_version(),
+        "runs": [],
+    }
+    try:
+        for code_value in args.codes:
+            run = benchmark_code(code_value, url, batch=args.batch, headless=not args.headed)
+            results['runs'].append(run)
+            print_run(run)
+    finally:
+        if server:
+            server.shutdown()
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📁 Saved benchmark results to: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        for code_value, before, after in per_area_changes(results, baseline):
+            if before and after:
+                print(f"⏱️  {code_value}: {before:.3f}s -> {after:.3f}s per area ({(after - before) / before:+.0%})")
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"❌ Regression: {line}")
+        if regressions:
+            return 1
+        print("✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
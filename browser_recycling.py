@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Browser Recycling
+Goal: Notice when a long-running browser has grown slow or large, so it can be swapped for a fresh one
+"""
+
+import statistics
+from collections import deque
+
+DEFAULT_MAX_AREAS = 150
+DEFAULT_MAX_RSS_MB = 1500
+DEFAULT_SLOWDOWN = 2.0
+
+
+class RecyclePolicy:
+    """
+    Decides when the add-area loop should checkpoint and restart the browser.
+
+    Three triggers, each disabled by passing None: `max_areas` added in the
+    current browser, browser RSS above `max_rss_mb` (sampled every
+    `rss_every` areas, since it walks the process tree), and the median of
+    the last `window` area times exceeding `slowdown` times the median of the
+    first `window` areas of the run. The baseline is kept across restarts,
+    so a fresh browser is held to the speed of the first one.
+    """
+
+    def __init__(self, max_areas=DEFAULT_MAX_AREAS, max_rss_mb=DEFAULT_MAX_RSS_MB, slowdown=DEFAULT_SLOWDOWN,
+                 window=10, rss_every=10, rss_probe=None):
+        self.max_areas = max_areas
+        self.max_rss_mb = max_rss_mb
+        self.slowdown = slowdown
+        self.window = window
+        self.rss_every = rss_every
+        self.rss_probe = rss_probe
+        self.areas = 0
+        self.baseline = []
+        self.recent = deque(maxlen=window)
+        self.last_rss_mb = None
+        self.recycles = []
+
+    def observe(self, seconds, count=1):
+        """
+        Record the time of `count` added areas (batch passes report an average)
+        """
+        for _ in range(count):
+            self.areas += 1
+            if len(self.baseline) < self.window:
+                self.baseline.append(seconds)
+            else:
+                self.recent.append(seconds)
+
+    def check(self, driver):
+        """
+        Why the browser should be recycled now, or None
+        """
+        if self.max_areas and self.areas >= self.max_areas:
+            return f"{self.areas} areas added in this browser"
+        if self.max_rss_mb and self.rss_probe and self.areas and self.areas % self.rss_every == 0:
+            self.last_rss_mb = self.rss_probe(driver)
+            if self.last_rss_mb is not None and self.last_rss_mb > self.max_rss_mb:
+                return f"browser RSS {self.last_rss_mb:.0f} MB over {self.max_rss_mb} MB"
+        if self.slowdown and len(self.recent) == self.window:
+            start, now = statistics.median(self.baseline), statistics.median(self.recent)
+            if now > self.slowdown * start:
+                return f"median area time {now:.2f}s vs {start:.2f}s at the start"
+        return None
+
+    def recycled(self, reason):
+        """
+        Start counting afresh for the new browser
+        """
+        self.recycles.append(reason)
+        self.areas = 0
+        self.recent.clear()
+
+    def disable(self):
+        self.max_areas = self.max_rss_mb = self.slowdown = None
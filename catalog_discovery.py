@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Area Catalog Discovery
+Goal: Read every area category and subcategory from the modal in one script call
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import date
+
+from code_catalogs import CODES_FILE, CATALOG_SCHEMA_VERSION, load_codes, catalog_path_for, count_combinations
+from driver_factory import DriverConfig, create_driver
+from catalog_store import CatalogStore
+from comcheck_engine import (
+    APP_URL, CREATE_BUTTON_CSS, start_application, select_code,
+    open_interior_lighting, open_area_modal, close_modal,
+)
+
+# Walks the open area modal and calls back with {catalog: {label: [options]}, dropped: [labels]}.
+# Only radios inside the modal that sit next to a <select> are area categories;
+# project-type and tab radios elsewhere on the page are never clicked.
+DISCOVER_MODAL_JS = """
+var createSelector = arguments[0], stepTimeout = arguments[1], done = arguments[arguments.length - 1];
+var root = document.querySelector(createSelector);
+while (root && !root.querySelector("input[type='radio']")) root = root.parentElement;
+if (!root) return done({catalog: {}, dropped: []});
+
+function labelFor(radio) {
+    var label = radio.id && document.querySelector("label[for='" + radio.id + "']");
+    return label ? (label.innerText || label.textContent).trim() : '';
+}
+function options(select) {
+    return Array.prototype.slice.call(select.options, 1)
+        .map(function (option) { return option.text.trim(); })
+        .filter(function (text) { return text; });
+}
+
+var radios = Array.prototype.filter.call(root.querySelectorAll("input[type='radio']"), function (radio) {
+    return labelFor(radio) && radio.parentElement && radio.parentElement.querySelector('select');
+});
+var result = {catalog: {}, dropped: []};
+
+function next(i) {
+    if (i >= radios.length) return done(result);
+    var radio = radios[i], name = labelFor(radio), select = radio.parentElement.querySelector('select');
+    var started = Date.now();
+    radio.click();
+    (function poll() {
+        if (!select.disabled && select.options.length > 1) {
+            result.catalog[name] = options(select);
+            return next(i + 1);
+        }
+        if (Date.now() - started > stepTimeout) {
+            result.dropped.push(name);
+            return next(i + 1);
+        }
+        setTimeout(poll, 25);
+    })();
+}
+next(0);
+"""
+
+
+def discovered_path_for(code_value):
+    """
+    Where a discovered catalog goes unless told otherwise: iecc_2015_areas_catalog.discovered.json,
+    next to the catalog the engine reads, so a run never overwrites it
+    """
+    return catalog_path_for(code_value).replace("_catalog.json", "_catalog.discovered.json")
+
+
+def discover_catalog(driver, step_timeout=5):
+    """
+    Extract {category: [subcategory, ...]} from the open area modal in one script call.
+
+    Returns:
+        tuple: (categories, dropped) where dropped lists labelled radios whose
+               dropdown never filled.
+    """
+    # Upper bound for a modal with up to 100 categories that all time out
+    driver.set_script_timeout(step_timeout * 100)
+    outcome = driver.execute_async_script(DISCOVER_MODAL_JS, CREATE_BUTTON_CSS, int(step_timeout * 1000))
+    return outcome.get('catalog', {}), outcome.get('dropped', [])
+
+
+def build_catalog(code, categories):
+    """
+    Wrap discovered categories in the versioned catalog document
+    """
+    return {
+        "schema_version": CATALOG_SCHEMA_VERSION,
+        "code": code['text'],
+        "code_value": code['value'],
+        "generated": date.today().isoformat(),
+        "total_categories": len(categories),
+        "total_subcategories": count_combinations(categories),
+        "categories": categories,
+    }
+
+
+def write_catalog(catalog, path):
+    """
+    Write a catalog document as indented JSON
+    """
+    with open(path, 'w') as f:
+        json.dump(catalog, f, indent=2)
+
+
+def discover_code(driver, code):
+    """
+    Switch the application to a code and extract its catalog from the modal
+    """
+    select_code(driver, code['value'])
+    open_interior_lighting(driver)
+    open_area_modal(driver)
+    try:
+        categories, dropped = discover_catalog(driver)
+    finally:
+        close_modal(driver)
+    return build_catalog(code, categories), dropped
+
+
+def discover(codes, url=APP_URL, headless=True, output_for=discovered_path_for, store=None):
+    """
+    Regenerate catalogs for several codes in one browser session.
+
+    Each catalog is written as JSON to output_for(code value) and, when a
+    CatalogStore is given, imported into it. By default that is a
+    .discovered.json file beside the committed catalog; pass
+    output_for=catalog_path_for to replace the catalogs the engine reads.
+    """
+    driver = None
+    written = {}
+    try:
+        driver = create_driver(DriverConfig(headless=headless))
+        start_application(driver, url)
+        for code in codes:
+            started = time.time()
+            try:
+                catalog, dropped = discover_code(driver, code)
+            except Exception as e:
+                print(f"❌ {code['text']}: {e}")
+                continue
+            path = output_for(code['value'])
+            write_catalog(catalog, path)
+            if store is not None:
+                store.import_catalog(code['value'], catalog)
+            written[code['value']] = path
+            print(f"✅ {code['text']}: {catalog['total_categories']} categories, "
+                  f"{catalog['total_subcategories']} subcategories in {time.time() - started:.1f}s -> {path}")
+            if dropped:
+                print(f"   ⏭️  Dropped without options: {', '.join(dropped)}")
+    finally:
+        if driver:
+            driver.quit()
+    return written
+
+
+def main(argv=None):
+    """
+    Command line entry point: regenerate catalogs for some or all codes
+    """
+    parser = argparse.ArgumentParser(description="Regenerate COMcheck area catalogs from the live modal.")
+    parser.add_argument("codes", nargs="*", help="code values (default: all of all_codes.json)")
+    parser.add_argument("--url", default=APP_URL, help="COMcheck-Web landing page")
+    parser.add_argument("--codes-file", default=CODES_FILE, help="code list JSON")
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    parser.add_argument("--store", help="also import the catalogs into this SQLite catalog store")
+    parser.add_argument("--output", help="catalog JSON path, single code only "
+                                         "(default: <code>_areas_catalog.discovered.json)")
+    parser.add_argument("--force", action="store_true",
+                        help="overwrite the <code>_areas_catalog.json files the engine reads")
+    args = parser.parse_args(argv)
+
+    codes = load_codes(args.codes_file)
+    if args.codes:
+        unknown = set(args.codes) - {code['value'] for code in codes}
+        if unknown:
+            parser.error(f"Unknown code values: {', '.join(sorted(unknown))}")
+        codes = [code for code in codes if code['value'] in args.codes]
+    if args.output and len(codes) != 1:
+        parser.error("--output can only be used with a single code")
+    if args.output and args.force:
+        parser.error("--output and --force are mutually exclusive")
+    if args.output:
+        def output_for(code_value):
+            return os.path.abspath(args.output)
+    else:
+        output_for = catalog_path_for if args.force else discovered_path_for
+    store = CatalogStore(args.store) if args.store else None
+    written = discover(codes, url=args.url, headless=not args.headed, output_for=output_for, store=store)
+    return 0 if len(written) == len(codes) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+SQLite Catalog Store
+Goal: One indexed file holding the area catalogs of every code year, loaded one code at a time
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import argparse
+import threading
+
+from code_catalogs import BASE_DIR, CODES_FILE, load_codes, catalog_path_for, load_catalog, count_combinations
+
+DEFAULT_STORE = os.path.join(BASE_DIR, "catalogs.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS codes (
+    code_value TEXT PRIMARY KEY,
+    total_categories INTEGER NOT NULL,
+    total_combinations INTEGER NOT NULL,
+    meta TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS areas (
+    code_value TEXT NOT NULL REFERENCES codes(code_value) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    subcategory TEXT,
+    PRIMARY KEY (code_value, position)
+);
+CREATE INDEX IF NOT EXISTS areas_category ON areas(category, code_value);
+CREATE INDEX IF NOT EXISTS areas_subcategory ON areas(subcategory, code_value);
+"""
+
+
+class CatalogStore:
+    """
+    Area catalogs for all codes in one SQLite file.
+
+    Catalogs go in and come out in the JSON shape used by the engine
+    ({'categories': {category: [subcategory, ...]}, ...}); categories with
+    no subcategories are kept as a row with a NULL subcategory so the
+    shape round-trips. Each thread gets its own connection, so sweep
+    workers and threads can read concurrently; the database runs in WAL
+    mode so readers are not blocked by an import. A read-only store must
+    already exist (FileNotFoundError otherwise).
+    """
+
+    def __init__(self, path=DEFAULT_STORE, readonly=False):
+        if readonly and not os.path.exists(path):
+            raise FileNotFoundError(f"No catalog store at {path} (run: python catalog_store.py import)")
+        self.path = path
+        self.readonly = readonly
+        self._local = threading.local()
+        self._cache = {}
+        if not readonly:
+            with self._connection() as connection:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.executescript(SCHEMA)
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            if self.readonly:
+                connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=30)
+            else:
+                connection = sqlite3.connect(self.path, timeout=30)
+                connection.execute("PRAGMA foreign_keys=ON")
+            self._local.connection = connection
+        return connection
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def import_catalog(self, code_value, catalog):
+        """
+        Store (or replace) one code's catalog; returns its number of (category, subcategory) pairs
+        """
+        catalog = load_catalog(catalog)
+        categories = catalog['categories']
+        meta = {key: value for key, value in catalog.items() if key != 'categories'}
+        rows = []
+        for category, subs in categories.items():
+            for sub in subs or [None]:
+                rows.append((code_value, len(rows), category, sub))
+        total = count_combinations(categories)
+        with self._connection() as connection:
+            connection.execute("DELETE FROM codes WHERE code_value = ?", (code_value,))
+            connection.execute(
+                "INSERT INTO codes (code_value, total_categories, total_combinations, meta) VALUES (?, ?, ?, ?)",
+                (code_value, len(categories), total, json.dumps(meta)),
+            )
+            connection.executemany(
+                "INSERT INTO areas (code_value, position, category, subcategory) VALUES (?, ?, ?, ?)", rows
+            )
+        self._cache.pop(code_value, None)
+        return total
+
+    def import_files(self, codes, catalog_for=catalog_path_for):
+        """
+        Import every code whose catalog JSON exists; returns {code value: area count}
+        """
+        imported = {}
+        for code in codes:
+            path = catalog_for(code['value'])
+            if os.path.exists(path):
+                imported[code['value']] = self.import_catalog(code['value'], path)
+        return imported
+
+    def codes(self):
+        """
+        Stored code values with their category and area counts
+        """
+        rows = self._connection().execute(
+            "SELECT code_value, total_categories, total_combinations FROM codes ORDER BY code_value"
+        )
+        return [{"code_value": value, "total_categories": categories, "total_combinations": total}
+                for value, categories, total in rows]
+
+    def has(self, code_value):
+        row = self._connection().execute("SELECT 1 FROM codes WHERE code_value = ?", (code_value,)).fetchone()
+        return row is not None
+
+    def total_combinations(self, code_value):
+        """
+        Number of areas a code's catalog adds, as counted at import
+        """
+        row = self._connection().execute(
+            "SELECT total_combinations FROM codes WHERE code_value = ?", (code_value,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"No catalog stored for '{code_value}'")
+        return row[0]
+
+    def catalog(self, code_value):
+        """
+        One code's catalog in the JSON shape; only that code's rows are read
+        """
+        if code_value not in self._cache:
+            connection = self._connection()
+            row = connection.execute("SELECT meta FROM codes WHERE code_value = ?", (code_value,)).fetchone()
+            if row is None:
+                raise KeyError(f"No catalog stored for '{code_value}'")
+            categories = {}
+            for category, sub in connection.execute(
+                "SELECT category, subcategory FROM areas WHERE code_value = ? ORDER BY position", (code_value,)
+            ):
+                subs = categories.setdefault(category, [])
+                if sub is not None:
+                    subs.append(sub)
+            self._cache[code_value] = dict(json.loads(row[0]), categories=categories)
+        return self._cache[code_value]
+
+    def codes_with(self, category=None, subcategory=None):
+        """
+        Code values whose catalog has the category and/or subcategory
+        """
+        clauses, params = [], []
+        if category is not None:
+            clauses.append("category = ?")
+            params.append(category)
+        if subcategory is not None:
+            clauses.append("subcategory = ?")
+            params.append(subcategory)
+        where = " AND ".join(clauses) or "1"
+        rows = self._connection().execute(
+            f"SELECT DISTINCT code_value FROM areas WHERE {where} ORDER BY code_value", params
+        )
+        return [row[0] for row in rows]
+
+    def export_catalog(self, code_value, path):
+        """
+        Write one code's catalog back out as indented JSON
+        """
+        catalog = self.catalog(code_value)
+        with open(path, 'w') as f:
+            json.dump(catalog, f, indent=2)
+
+
+def exported_path_for(code_value):
+    """
+    Default export location: iecc_2015_areas_catalog.exported.json, so an export never replaces the source JSON
+    """
+    return catalog_path_for(code_value).replace("_catalog.json", "_catalog.exported.json")
+
+
+def main(argv=None):
+    """
+    Command line entry point: import, export and list stored catalogs
+    """
+    parser = argparse.ArgumentParser(description="Manage the SQLite area catalog store.")
+    parser.add_argument("--store", default=DEFAULT_STORE, help="SQLite catalog store")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="import catalog JSON files")
+    import_parser.add_argument("codes", nargs="*", help="code values (default: every code with a catalog file)")
+    import_parser.add_argument("--codes-file", default=CODES_FILE, help="code list JSON")
+    export_parser = commands.add_parser("export", help="write a stored catalog as JSON")
+    export_parser.add_argument("code", help="code value")
+    export_parser.add_argument("--output", help="JSON path (default: <code>_areas_catalog.exported.json)")
+    commands.add_parser("list", help="list stored codes")
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        codes = load_codes(args.codes_file)
+        if args.codes:
+            unknown = sorted(set(args.codes) - {code['value'] for code in codes})
+            if unknown:
+                parser.error(f"Unknown code values (not in {args.codes_file}): {', '.join(unknown)}")
+            codes = [code for code in codes if code['value'] in args.codes]
+        try:
+            imported = CatalogStore(args.store).import_files(codes)
+        except ValueError as e:
+            parser.error(str(e))
+        for code_value, total in imported.items():
+            print(f"  ✅ {code_value}: {total} areas")
+        for code_value in args.codes:
+            if code_value not in imported:
+                print(f"  ⏭️  {code_value}: no catalog at {catalog_path_for(code_value)}")
+        return 0
+
+    # Reading never creates a store: a mistyped --store is reported, not replaced by an empty one
+    try:
+        store = CatalogStore(args.store, readonly=True)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    if args.command == "export":
+        output = args.output or exported_path_for(args.code)
+        try:
+            store.export_catalog(args.code, output)
+        except KeyError as e:
+            parser.error(str(e.args[0]))
+        print(f"📁 Saved {args.code} catalog to: {output}")
+    else:
+        for entry in store.codes():
+            print(f"  {entry['code_value']:<32} {entry['total_categories']:>3} categories "
+                  f"{entry['total_combinations']:>4} areas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Code and Catalog Files
+Goal: Locate and load all_codes.json and the per-code area catalogs (no browser needed)
+"""
+
+import os
+import re
+import json
+
+try:
+    import yaml
+except ImportError:  # optional; only needed for YAML spec files
+    yaml = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CODES_FILE = os.path.join(BASE_DIR, "all_codes.json")
+
+# Version of the catalog document written by catalog_discovery and expected on load
+CATALOG_SCHEMA_VERSION = 2
+
+
+def load_codes(codes_file=CODES_FILE):
+    """
+    Load the list of code options extracted from the COMcheck code dropdown
+    """
+    with open(codes_file, 'r') as f:
+        return json.load(f)
+
+
+def find_code(code_value, codes_file=CODES_FILE):
+    """
+    Look up a code entry by its dropdown value (e.g. 'CEZ_IECC2015')
+    """
+    for code in load_codes(codes_file):
+        if code['value'] == code_value:
+            return code
+    raise ValueError(f"Unknown code value '{code_value}' (not in {codes_file})")
+
+
+def catalog_path_for(code_value):
+    """
+    Default catalog location for a code: CEZ_IECC2015 -> iecc_2015_areas_catalog.json
+    """
+    slug = code_value[4:] if code_value.startswith("CEZ_") else code_value
+    slug = re.sub(r'([a-z])(\d)', r'\1_\2', slug.lower())
+    return os.path.join(BASE_DIR, f"{slug}_areas_catalog.json")
+
+
+def check_catalog(catalog, source="catalog"):
+    """
+    Raise ValueError for a catalog document this code can't read; warn when it has no schema_version
+    """
+    if not isinstance(catalog, dict) or not isinstance(catalog.get('categories'), dict):
+        raise ValueError(f"{source} has no 'categories' mapping")
+    version = catalog.get('schema_version')
+    if version is None:
+        print(f"⚠️  {source} has no schema_version; assuming version {CATALOG_SCHEMA_VERSION}")
+    elif version != CATALOG_SCHEMA_VERSION:
+        raise ValueError(f"{source} has schema_version {version!r}; expected {CATALOG_SCHEMA_VERSION}")
+    return catalog
+
+
+def load_catalog(catalog):
+    """
+    Load an area catalog from a path (checked with check_catalog), or pass through an already loaded catalog dict
+    """
+    if isinstance(catalog, dict):
+        return catalog
+    with open(catalog, 'r') as f:
+        return check_catalog(json.load(f), catalog)
+
+
+def read_spec_file(path):
+    """
+    Load a hand-written spec file: YAML (.yaml/.yml, needs PyYAML) or JSON
+    """
+    if path.endswith((".yaml", ".yml")):
+        if yaml is None:
+            raise RuntimeError("PyYAML is required to read YAML specs (pip install pyyaml)")
+        with open(path, 'r') as f:
+            return yaml.safe_load(f) or {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def count_combinations(categories):
+    """
+    Total number of (category, subcategory) pairs that will be added
+    """
+    return sum(len(subcats) for subcats in categories.values() if subcats)
@@ -0,0 +1,1325 @@
+#!/usr/bin/env python3
+"""
+COMcheck Area Population Engine
+Goal: One parameterized loop that populates area categories for any code year
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+from collections import Counter, defaultdict
+from urllib.parse import quote
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import Select, WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from code_catalogs import find_code, catalog_path_for, load_catalog, count_combinations
+from driver_factory import DriverConfig, launch_driver, browser_rss_mb
+from progress_journal import ProgressJournal, DEFAULT_JOURNAL, ADDED, FAILED
+from step_timing import NULL_TIMER
+from recovery import RecoveryManager, CIRCUIT_OPEN
+from adaptive_timing import FIXED_TIMING, TimingPolicy
+from browser_recycling import RecyclePolicy, DEFAULT_MAX_AREAS, DEFAULT_MAX_RSS_MB, DEFAULT_SLOWDOWN
+from driver_trace import CommandTrace
+from catalog_store import CatalogStore
+from metrics import NULL_METRICS, DEFAULT_METRICS_PORT, Metrics, metered, serve_metrics
+
+APP_URL = "https://energycode.pnl.gov/COMcheckWeb/"
+
+CANCEL_BUTTON_XPATH = "//button[contains(@class, 'cancel')]"
+CREATE_BUTTON_XPATH = "//button[@class='accept default']"
+INT_LIGHTING_TAB_CSS = "label[for='bat_category_int_lighting']"
+AREA_ROW_SELECTOR = "#areaCategoryTable tbody tr"
+
+CREATE_BUTTON_CSS = "button.accept.default"
+CANCEL_BUTTON_CSS = "button[class*='cancel']"
+UNCONFIRMED_ADD = "reported added but not in area table"
+
+# Saving and reopening a project across a browser restart. The stand-in keeps
+# projects server-side under the page's `project` id and reopens one from
+# app.html?project=<id>; a site without that leaves the project in place.
+PROJECT_REFERENCE_JS = "return (typeof window.project !== 'undefined' && window.project) || null;"
+PROJECT_URL_PARAM = "project"
+BATCH_SELECTORS = {
+    "add": "addAreaCategory",
+    "create": CREATE_BUTTON_CSS,
+    "cancel": CANCEL_BUTTON_CSS,
+    "rows": AREA_ROW_SELECTOR,
+}
+
+# Cell texts of every row in the Interior Lighting area table
+AREA_ROWS_JS = """
+return Array.prototype.map.call(document.querySelectorAll(arguments[0]), function (row) {
+    return Array.prototype.map.call(row.querySelectorAll('td, th'), function (cell) {
+        return (cell.innerText || cell.textContent).trim();
+    });
+});
+"""
+
+# Cancels any open modal and brings back the INT. LIGHTING tab in one call;
+# returns true when the modal is gone and Add Area Category is visible
+RESET_JS = """
+var sel = arguments[0];
+function visible(el) {
+    return !!el && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+}
+Array.prototype.forEach.call(document.querySelectorAll(sel.cancel), function (button) {
+    if (visible(button)) button.click();
+});
+var tab = document.querySelector(sel.tab);
+if (tab && !visible(document.getElementById(sel.add))) tab.click();
+return !visible(document.querySelector(sel.create)) && visible(document.getElementById(sel.add));
+"""
+
+# Adds every subcategory of one category inside the page, driving the
+# modal's own handlers, and calls back with {added: [...], failed: {sub: reason}}
+BATCH_ADD_JS = """
+var category = arguments[0], subcategories = arguments[1], sel = arguments[2],
+    stepTimeout = arguments[3], done = arguments[arguments.length - 1];
+var result = {added: [], failed: {}};
+
+function visible(el) {
+    return !!el && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+}
+function createButton() { return document.querySelector(sel.create); }
+function rowCount() { return document.querySelectorAll(sel.rows).length; }
+function radioFor(name) {
+    var radios = document.querySelectorAll("input[type='radio']");
+    for (var i = 0; i < radios.length; i++) {
+        var label = radios[i].id && document.querySelector("label[for='" + radios[i].id + "']");
+        if (label && (label.innerText || label.textContent).trim() === name) return radios[i];
+    }
+    return null;
+}
+function until(check, then, fail) {
+    var started = Date.now();
+    (function poll() {
+        var value = null;
+        try { value = check(); } catch (e) {}
+        if (value) return then(value);
+        if (Date.now() - started > stepTimeout) return fail();
+        setTimeout(poll, 25);
+    })();
+}
+function next(i) {
+    if (i >= subcategories.length) return done(result);
+    var sub = subcategories[i], before = rowCount();
+    function fail(reason) {
+        result.failed[sub] = reason;
+        var cancel = document.querySelector(sel.cancel);
+        if (visible(cancel)) cancel.click();
+        var proceed = function () { next(i + 1); };
+        until(function () { return !visible(createButton()); }, proceed, proceed);
+    }
+    document.getElementById(sel.add).click();
+    until(function () { return visible(createButton()); }, function () {
+        var radio = radioFor(category);
+        if (!radio) return fail('radio not found');
+        radio.click();
+        until(function () {
+            var select = radio.parentElement && radio.parentElement.querySelector('select');
+            return select && !select.disabled && select.options.length > 1 && select;
+        }, function (select) {
+            var index = -1;
+            for (var j = 0; j < select.options.length; j++) {
+                if (select.options[j].text.trim() === sub) { index = j; break; }
+            }
+            if (index < 0) return fail('option not found');
+            select.selectedIndex = index;
+            select.dispatchEvent(new Event('input', {bubbles: true}));
+            select.dispatchEvent(new Event('change', {bubbles: true}));
+            createButton().click();
+            until(function () { return !visible(createButton()) && rowCount() > before; },
+                  function () { result.added.push(sub); next(i + 1); },
+                  function () { fail('area did not appear'); });
+        }, function () { fail('dropdown did not populate'); });
+    }, function () { fail('modal did not open'); });
+}
+next(0);
+"""
+
+# {label text: radio id} for every labelled radio in the area modal
+RADIO_MAP_JS = """
+var map = {};
+document.querySelectorAll("input[type='radio']").forEach(function (radio) {
+    if (!radio.id) return;
+    var label = document.querySelector("label[for='" + radio.id + "']");
+    if (label) map[(label.innerText || label.textContent).trim()] = radio.id;
+});
+return map;
+"""
+
+CLICK_RADIO_JS = """
+var radio = document.getElementById(arguments[0]);
+if (!radio) return false;
+radio.click();
+return true;
+"""
+
+# Selects arguments[1] in the radio's <select>: 'pending' until the
+# dropdown is enabled and filled, 'missing' if the option is not there
+SELECT_SUBCATEGORY_JS = """
+var radio = document.getElementById(arguments[0]);
+var select = radio && radio.parentElement && radio.parentElement.querySelector("select");
+if (!select || select.disabled || select.options.length < 2) return 'pending';
+for (var i = 0; i < select.options.length; i++) {
+    if (select.options[i].text.trim() === arguments[1]) {
+        select.selectedIndex = i;
+        select.dispatchEvent(new Event('input', {bubbles: true}));
+        select.dispatchEvent(new Event('change', {bubbles: true}));
+        return 'selected';
+    }
+}
+return 'missing';
+"""
+
+# Per-session lookups, keyed by WebDriver session id; dropped when the browser is closed
+_radio_ids = {}
+
+
+def wait_until(driver, condition, step, timing=FIXED_TIMING):
+    """
+    WebDriverWait for a condition with the step's timeout; a TimingPolicy
+    sizes that timeout from the step's measured latency and retries with backoff
+    """
+    return timing.run(step, lambda timeout: WebDriverWait(driver, timeout).until(condition), TimeoutException)
+
+
+def wait_for_loading(driver, appear_timeout=0, timing=FIXED_TIMING):
+    """
+    Wait for the loading indicator to disappear (it might not be present).
+
+    With appear_timeout, first give the indicator that long to show up so a
+    request that has not started yet is not mistaken for one that finished.
+    """
+    if appear_timeout:
+        try:
+            WebDriverWait(driver, appear_timeout).until(
+                EC.visibility_of_element_located((By.ID, "loadingIndicator"))
+            )
+        except Exception:
+            pass
+    try:
+        wait_until(driver, EC.invisibility_of_element_located((By.ID, "loadingIndicator")), 'loading', timing)
+    except Exception:
+        pass
+
+
+def select_populated(select_elem):
+    """
+    Condition: the <select> is enabled and has options beyond the placeholder
+    """
+    def _populated(driver):
+        try:
+            if not select_elem.is_enabled():
+                return False
+            options = select_elem.find_elements(By.TAG_NAME, "option")
+            return select_elem if len(options) > 1 else False
+        except StaleElementReferenceException:
+            return False
+    return _populated
+
+
+def row_count_above(count):
+    """
+    Condition: the area table has more than `count` rows
+    """
+    def _grown(driver):
+        rows = len(driver.find_elements(By.CSS_SELECTOR, AREA_ROW_SELECTOR))
+        return rows if rows > count else False
+    return _grown
+
+
+def code_ready(code_value, before=None, settle=2):
+    """
+    Condition: the reload started by switching to code_value is over and the
+    Interior Lighting tab can be clicked; returns the tab.
+
+    Right after the switch the old page still looks ready, so the reload
+    only counts as started once the loading indicator has been seen or the
+    project reference differs from `before` (read before the switch). If
+    neither shows up within `settle` seconds, the page is taken as it is.
+    """
+    state = {"started": False, "since": time.monotonic()}
+
+    def _ready(driver):
+        try:
+            if driver.find_element(By.ID, "code").get_attribute("value") != code_value:
+                return False
+            if any(indicator.is_displayed() for indicator in driver.find_elements(By.ID, "loadingIndicator")):
+                state['started'] = True
+                return False
+            if not state['started']:
+                reference = driver.execute_script(PROJECT_REFERENCE_JS)
+                state['started'] = reference is not None and str(reference) != str(before)
+            if not state['started'] and time.monotonic() - state['since'] < settle:
+                return False
+            tab = driver.find_element(By.CSS_SELECTOR, INT_LIGHTING_TAB_CSS)
+            return tab if tab.is_displayed() and tab.is_enabled() else False
+        except (NoSuchElementException, StaleElementReferenceException):
+            return False
+    return _ready
+
+
+def project_opened(reference):
+    """
+    Condition: the page has loaded the project `reference`
+    """
+    def _opened(driver):
+        return str(driver.execute_script(PROJECT_REFERENCE_JS)) == str(reference)
+    return _opened
+
+
+def selected_code(driver):
+    """
+    Value of the #code dropdown
+    """
+    return driver.find_element(By.ID, "code").get_attribute("value")
+
+
+def count_area_rows(driver):
+    """
+    Number of area rows currently in the Interior Lighting table
+    """
+    return len(driver.find_elements(By.CSS_SELECTOR, AREA_ROW_SELECTOR))
+
+
+def start_application(driver, url=APP_URL, timing=FIXED_TIMING):
+    """
+    Open COMcheck-Web, click Start and switch to the application window
+    """
+    driver.get(url)
+
+    start_button = wait_until(driver, EC.element_to_be_clickable((By.ID, "startButton")), 'start_button', timing)
+    start_button.click()
+
+    wait_until(driver, EC.number_of_windows_to_be(2), 'app_window', timing)
+    original_window = driver.current_window_handle
+    for window_handle in driver.window_handles:
+        if window_handle != original_window:
+            driver.switch_to.window(window_handle)
+            break
+
+    wait_for_loading(driver, timing=timing)
+
+
+def select_code(driver, code_value, timing=FIXED_TIMING):
+    """
+    Select a code in the #code dropdown and wait for the page to update
+    """
+    code_dropdown = wait_until(driver, EC.element_to_be_clickable((By.ID, "code")), 'code_select', timing)
+    # The code change reloads project data behind the loading indicator; remember
+    # the project first so the old, still-ready page is not taken for the new one
+    unchanged = code_dropdown.get_attribute("value") == code_value
+    before = driver.execute_script(PROJECT_REFERENCE_JS)
+    Select(code_dropdown).select_by_value(code_value)
+    forget_modal_lookups(driver)
+
+    wait_until(driver, code_ready(code_value, before, settle=0 if unchanged else 2), 'code_switch', timing)
+
+
+def open_interior_lighting(driver, timing=FIXED_TIMING):
+    """
+    Click the Interior Lighting Method and Areas tab
+    """
+    int_lighting_tab = wait_until(driver, EC.element_to_be_clickable((By.CSS_SELECTOR, INT_LIGHTING_TAB_CSS)),
+                                  'tab', timing)
+    int_lighting_tab.click()
+    wait_until(driver, EC.element_to_be_clickable((By.ID, "addAreaCategory")), 'tab_ready', timing)
+
+
+def close_modal(driver, timeout=2):
+    """
+    Best-effort close of an open area category modal
+    """
+    try:
+        cancel_btn = driver.find_element(By.XPATH, CANCEL_BUTTON_XPATH)
+        cancel_btn.click()
+        WebDriverWait(driver, timeout).until(
+            EC.invisibility_of_element_located((By.XPATH, CREATE_BUTTON_XPATH))
+        )
+    except Exception:
+        pass
+
+
+def reset_state(driver, timeout=3):
+    """
+    Scripted return to the known-good state (no modal, Interior Lighting tab
+    active); True when Add Area Category is usable again
+    """
+    selectors = {
+        "cancel": CANCEL_BUTTON_CSS,
+        "create": CREATE_BUTTON_CSS,
+        "tab": INT_LIGHTING_TAB_CSS,
+        "add": "addAreaCategory",
+    }
+    try:
+        if driver.execute_script(RESET_JS, selectors):
+            return True
+        # Modal animations or a slow tab switch: give them a moment
+        WebDriverWait(driver, timeout).until(
+            EC.invisibility_of_element_located((By.CSS_SELECTOR, CREATE_BUTTON_CSS))
+        )
+        WebDriverWait(driver, timeout).until(EC.element_to_be_clickable((By.ID, "addAreaCategory")))
+        return True
+    except TimeoutException:
+        return False
+
+
+def forget_modal_lookups(driver):
+    """
+    Drop the cached radio map for this session (after a code change, or before quitting)
+    """
+    _radio_ids.pop(driver.session_id, None)
+
+
+def category_radio_ids(driver, refresh=False):
+    """
+    {category label: radio id} for the open modal, read in one script call per session
+    """
+    if refresh or not _radio_ids.get(driver.session_id):
+        _radio_ids[driver.session_id] = driver.execute_script(RADIO_MAP_JS) or {}
+    return _radio_ids[driver.session_id]
+
+
+def find_category_radio(driver, category_name):
+    """
+    Radio id for the category, refreshing the cached map once if it is not there
+    """
+    radio_id = category_radio_ids(driver).get(category_name)
+    if not radio_id:
+        radio_id = category_radio_ids(driver, refresh=True).get(category_name)
+    return radio_id
+
+
+def select_subcategory(driver, radio_id, subcategory, timing=FIXED_TIMING):
+    """
+    Wait for the category's dropdown to fill, then select the subcategory by text
+    """
+    def _settled(d):
+        state = d.execute_script(SELECT_SUBCATEGORY_JS, radio_id, subcategory)
+        return state if state != 'pending' else False
+
+    state = wait_until(driver, _settled, 'select', timing)
+    if state != 'selected':
+        raise LookupError(f"'{subcategory}' is not an option for this category")
+
+
+def open_area_modal(driver, timing=FIXED_TIMING):
+    """
+    Click Add Area Category and wait until the modal's Create button is visible
+    """
+    add_area_button = wait_until(driver, EC.element_to_be_clickable((By.ID, "addAreaCategory")),
+                                 'add_button', timing)
+    add_area_button.click()
+    wait_until(driver, EC.visibility_of_element_located((By.XPATH, CREATE_BUTTON_XPATH)), 'open_modal', timing)
+
+
+def add_area(driver, category_name, subcategory, timer=NULL_TIMER, timing=FIXED_TIMING):
+    """
+    Add one area category through the modal; raises on failure.
+
+    Each step is timed under its name (open_modal, find_radio, select,
+    create, modal_close) when a StepTimer is passed. Waits take their
+    timeouts from `timing`; clicks are never retried.
+    """
+    rows_before = count_area_rows(driver)
+
+    # Step A: Open modal
+    with timer.step('open_modal'):
+        open_area_modal(driver, timing)
+
+    # Step B: Find and click the radio button for this category
+    with timer.step('find_radio'):
+        radio_id = find_category_radio(driver, category_name)
+        clicked = bool(radio_id) and driver.execute_script(CLICK_RADIO_JS, radio_id)
+        if radio_id and not clicked:
+            # The modal was rebuilt with new ids since the map was cached
+            radio_id = category_radio_ids(driver, refresh=True).get(category_name)
+            clicked = bool(radio_id) and driver.execute_script(CLICK_RADIO_JS, radio_id)
+    if not clicked:
+        raise LookupError(f"Could not find radio button for '{category_name}'")
+
+    # Step C: Wait for the category's dropdown to unlock, then select subcategory
+    try:
+        with timer.step('select'):
+            select_subcategory(driver, radio_id, subcategory, timing)
+    except Exception as e:
+        raise LookupError(f"Could not select subcategory '{subcategory}': {e}") from e
+
+    # Step D: Click Create Area Category button
+    try:
+        with timer.step('create'):
+            create_button = wait_until(driver, EC.element_to_be_clickable((By.XPATH, CREATE_BUTTON_XPATH)),
+                                       'create', timing)
+            create_button.click()
+    except Exception as e:
+        raise RuntimeError(f"Could not click Create button: {e}") from e
+
+    # Step E: The modal goes away and the new area shows up in the table
+    with timer.step('modal_close'):
+        wait_until(driver, EC.invisibility_of_element(create_button), 'modal_close', timing)
+        try:
+            wait_until(driver, row_count_above(rows_before), 'row_appear', timing)
+        except TimeoutException as e:
+            raise RuntimeError(f"'{subcategory}' did not appear in the area table") from e
+
+
+def read_area_rows(driver):
+    """
+    Cell texts of every row in the area table, in one script call
+    """
+    return driver.execute_script(AREA_ROWS_JS, AREA_ROW_SELECTOR) or []
+
+
+def match_area_rows(rows, categories):
+    """
+    Match area table rows to catalog areas.
+
+    A row is matched by a cell holding the subcategory and, when the table
+    shows it, a cell holding the category. Without a category column a row
+    is credited to the first category still short of that subcategory, so
+    subcategories that repeat across categories (e.g. 'Lobby') are told apart.
+
+    Returns:
+        tuple: (expected, found) Counters keyed by (category, subcategory),
+               and the cell texts of the rows that match no catalog area.
+    """
+    expected = Counter(
+        (category_name, subcategory)
+        for category_name, subcategories in categories.items() for subcategory in subcategories or []
+    )
+    categories_of = defaultdict(list)
+    for category_name, subcategory in expected:
+        categories_of[subcategory].append(category_name)
+
+    found = Counter()
+    unexpected = []
+    for cells in rows:
+        area = None
+        for cell in cells:
+            candidates = categories_of.get(cell)
+            if not candidates:
+                continue
+            named = [category_name for category_name in candidates if category_name in cells]
+            short = [category_name for category_name in candidates
+                     if found[(category_name, cell)] < expected[(category_name, cell)]]
+            area = ((named or short or candidates)[0], cell)
+            break
+        if area:
+            found[area] += 1
+        elif any(cells):
+            unexpected.append(cells)
+    return expected, found, unexpected
+
+
+def table_area_counts(driver, categories):
+    """
+    Counter of (category, subcategory) -> rows in the area table, in one script call
+    """
+    return match_area_rows(read_area_rows(driver), categories)[1]
+
+
+def verify_areas(driver, categories):
+    """
+    Diff the area table against the catalog, reading every row in one script call.
+
+    Rows are matched to catalog areas as in match_area_rows.
+
+    Returns:
+        dict: 'expected' and 'found' area counts (duplicates not counted),
+              'missing' and 'duplicates' as [category, subcategory, count]
+              lists in catalog order, and the
+              cell texts of 'unexpected' rows that match no catalog area.
+    """
+    expected, found, unexpected = match_area_rows(read_area_rows(driver), categories)
+
+    missing = expected - found
+    duplicates = found - expected
+    return {
+        "expected": sum(expected.values()),
+        "found": sum((found & expected).values()),
+        "missing": [[*area, count] for area, count in missing.items()],
+        "duplicates": [[*area, count] for area, count in duplicates.items()],
+        "unexpected": unexpected,
+    }
+
+
+def missing_catalog(categories, missing):
+    """
+    Catalog holding only the missing areas ([category, subcategory, count] lists), in catalog order
+    """
+    remaining = Counter({(category_name, subcategory): count for category_name, subcategory, count in missing})
+    subset = {}
+    for category_name, subcategories in categories.items():
+        for subcategory in subcategories or []:
+            if remaining[(category_name, subcategory)] > 0:
+                remaining[(category_name, subcategory)] -= 1
+                subset.setdefault(category_name, []).append(subcategory)
+    return {"categories": subset}
+
+
+def report_verification(verification):
+    """
+    Print the table-vs-catalog diff
+    """
+    print(f"\n🔎 Verified area table: {verification['found']}/{verification['expected']} catalog areas present")
+    for category_name, subcategory, count in verification['missing']:
+        print(f"   ❓ Missing: '{category_name}' → '{subcategory}'" + (f" (x{count})" if count > 1 else ""))
+    for category_name, subcategory, count in verification['duplicates']:
+        print(f"   ♊ Duplicate: '{category_name}' → '{subcategory}' ({count} extra)")
+    for cells in verification['unexpected']:
+        print(f"   ❔ Unexpected row: {' | '.join(cells)}")
+
+
+def verify_and_rerun(driver, code_value, catalog, batch=False, journal=None, timer=NULL_TIMER, timing=FIXED_TIMING,
+                     metrics=NULL_METRICS):
+    """
+    Verify the area table against the catalog and re-add only the missing areas, once.
+
+    Duplicates and unexpected rows are reported but never deleted.
+
+    Returns:
+        dict: The final verify_areas result, plus the counts of the re-run ('rerun') if one happened.
+    """
+    categories = load_catalog(catalog)['categories']
+    with timer.step('verify'):
+        verification = verify_areas(driver, categories)
+    report_verification(verification)
+    rerun = None
+    if verification['missing']:
+        print(f"\n🔁 Re-adding {sum(count for _, _, count in verification['missing'])} missing areas...")
+        rerun = populate_areas(driver, code_value, missing_catalog(categories, verification['missing']),
+                               batch=batch, journal=journal, timer=timer, timing=timing, metrics=metrics)
+        with timer.step('verify'):
+            verification = verify_areas(driver, categories)
+        report_verification(verification)
+    if rerun:
+        verification['rerun'] = {key: rerun[key] for key in ("total", "success", "errors", "elapsed")}
+    return verification
+
+
+def run_ok(result):
+    """
+    True when a populate() run finished with every catalog area in the project exactly once
+    """
+    if 'fatal' in result:
+        return False
+    verification = result.get('verification')
+    if verification is None:
+        return result['errors'] == 0
+    return not verification['missing'] and not verification['duplicates']
+
+
+def add_category_batch(driver, category_name, subcategories, step_timeout=5, categories=None):
+    """
+    Add all of a category's subcategories in one in-page script call.
+
+    The script repeats the open modal / radio / select / create sequence
+    through the page's own event handlers, so there is one WebDriver round
+    trip per category instead of several per area. The area table is read
+    before and after, and every reported addition is checked against the
+    rows it gained (see confirm_batch); `categories` is the catalog the rows
+    are matched against (default: just this category).
+
+    Returns:
+        tuple: (added, failed) where failed maps subcategory -> reason.
+    """
+    rows_before = read_area_rows(driver)
+    driver.set_script_timeout(batch_timeout(subcategories, step_timeout))
+    outcome = driver.execute_async_script(
+        BATCH_ADD_JS, category_name, list(subcategories), BATCH_SELECTORS, int(step_timeout * 1000)
+    )
+    return confirm_batch(driver, category_name, outcome, rows_before,
+                         categories or {category_name: list(subcategories)})
+
+
+def batch_timeout(subcategories, step_timeout=5):
+    """
+    Upper bound (s) for one BATCH_ADD_JS pass: four steps per area, all timing out
+    """
+    return step_timeout * 4 * len(subcategories) + 10
+
+
+def confirm_batch(driver, category_name, outcome, rows_before, categories):
+    """
+    (added, failed) from a BATCH_ADD_JS outcome for one category.
+
+    An addition is confirmed only by a row the area table gained since
+    rows_before that matches that exact (category, subcategory) pair (see
+    match_area_rows against `categories`); the others are moved to failed.
+    """
+    added = list(outcome.get('added', []))
+    failed = dict(outcome.get('failed', {}))
+
+    before = match_area_rows(rows_before, categories)[1]
+    gained = match_area_rows(read_area_rows(driver), categories)[1] - before
+    for subcategory in list(added):
+        if gained[(category_name, subcategory)] > 0:
+            gained[(category_name, subcategory)] -= 1
+        else:
+            added.remove(subcategory)
+            failed[subcategory] = UNCONFIRMED_ADD
+    return added, failed
+
+
+def plan_resume(driver, code_value, categories, journal):
+    """
+    Counter of (category, subcategory) already in the live table, reconciled against the journal.
+
+    Journal entries only say an add was attempted; the live table is the
+    authority. Journaled areas missing from the table are re-added and
+    table rows that were never journaled are kept.
+    """
+    present = table_area_counts(driver, categories)
+    if journal:
+        missing = [
+            (category, subcategory) for category, subcategory in journal.completed(code_value)
+            if category in categories and not present[(category, subcategory)]
+        ]
+        for category, subcategory in missing:
+            print(f"  ⚠️ Journaled '{category}' → '{subcategory}' is not in the area table, re-adding")
+    return present
+
+
+def populate_areas(driver, code_value, catalog, batch=False, journal=None, resume=False, timer=NULL_TIMER,
+                   recycler=None, timing=FIXED_TIMING, governor=None, metrics=NULL_METRICS):
+    """
+    Run the add-area loop on an application window that already has the code selected.
+
+    With batch=True each category is added in one in-page pass
+    (add_category_batch); subcategories the pass could not add are retried
+    one by one through the modal. Every attempt is appended to the journal
+    when one is given. With resume=True areas already in the live table
+    are skipped (see plan_resume). Per-step latencies go to timer.
+    Failed adds go through a RecoveryManager: one scripted reset_state per
+    failure, and a category is abandoned after repeated failures. With a
+    RecyclePolicy the loop stops early once the browser should be recycled
+    and says why in the result's 'recycle' (see populate). Wait timeouts
+    come from `timing` (see adaptive_timing). A shared RateGovernor, when
+    given, admits each add (or batch) and is told how long it took. Adds,
+    failures and step latencies are counted in `metrics`.
+    """
+    catalog_data = load_catalog(catalog)
+    categories = catalog_data['categories']
+    total_combinations = count_combinations(categories)
+    print(f"📊 Loaded {len(categories)} categories with {total_combinations} total area combinations")
+
+    success_count = 0
+    error_count = 0
+    skipped_count = 0
+    area_seconds = []
+    started = time.time()
+    recovery = RecoveryManager(lambda: reset_state(driver))
+    recycle_reason = None
+    timer = metered(timer, metrics)
+
+    present = plan_resume(driver, code_value, categories, journal) if resume else Counter()
+    if resume:
+        print(f"↩️  Resuming: {sum(present.values())} catalog areas already in the table")
+
+    def record(category_name, subcategory, status, **extra):
+        if journal:
+            journal.record(code_value, category_name, subcategory, status, **extra)
+
+    for category_name, subcategories in categories.items():
+        if recycle_reason:
+            break
+        if not subcategories:  # Skip categories with no subcategories
+            print(f"⏭️  Skipping '{category_name}' (no subcategories)")
+            continue
+
+        print(f"\n📂 Processing category: '{category_name}' ({len(subcategories)} subcategories)")
+
+        pending = []
+        for subcategory in subcategories:
+            if present[(category_name, subcategory)] > 0:
+                present[(category_name, subcategory)] -= 1
+                skipped_count += 1
+            else:
+                pending.append(subcategory)
+        if len(pending) < len(subcategories):
+            print(f"    ↩️  {len(subcategories) - len(pending)} already in the project")
+        subcategories = pending
+
+        if batch and subcategories:
+            if governor:
+                governor.acquire()
+            batch_started = time.time()
+            try:
+                with timer.tagged(code=code_value, category=category_name), timer.step('batch_category'):
+                    added, failed = add_category_batch(driver, category_name, subcategories,
+                                                       categories=categories)
+            except Exception as e:
+                print(f"    ⚠️ Batch pass failed, falling back to single adds: {e}")
+                reset_state(driver)
+                added, failed = [], {subcategory: str(e) for subcategory in subcategories}
+            if governor:
+                governor.release((time.time() - batch_started) / len(subcategories), failures=len(failed),
+                                 count=len(subcategories))
+            if added:
+                per_area = (time.time() - batch_started) / len(added)
+                area_seconds.extend([per_area] * len(added))
+                success_count += len(added)
+                metrics.inc("comcheck_areas_added_total", len(added), code=code_value)
+                metrics.observe("comcheck_area_seconds", per_area, times=len(added), code=code_value)
+                for subcategory in added:
+                    record(category_name, subcategory, ADDED, seconds=per_area)
+                print(f"    ✅ Batch added {len(added)}/{len(subcategories)} ({per_area:.2f}s per area)")
+                if recycler:
+                    recycler.observe(per_area, len(added))
+                    recycle_reason = recycler.check(driver)
+            for subcategory, reason in failed.items():
+                print(f"    ⚠️ '{subcategory}': {reason}")
+            # Areas the page reported as created are not retried, to avoid duplicates
+            subcategories = [
+                subcategory for subcategory in subcategories
+                if subcategory in failed and failed[subcategory] != UNCONFIRMED_ADD
+            ]
+            for subcategory, reason in failed.items():
+                if reason == UNCONFIRMED_ADD:
+                    record(category_name, subcategory, FAILED, error=reason)
+            error_count += len(failed) - len(subcategories)
+            if len(failed) > len(subcategories):
+                metrics.inc("comcheck_areas_failed_total", len(failed) - len(subcategories), code=code_value,
+                            failure="unconfirmed")
+            if recycle_reason:
+                break
+
+        for i, subcategory in enumerate(subcategories, 1):
+            if not recovery.allow(category_name):
+                error_count += 1
+                metrics.inc("comcheck_areas_failed_total", code=code_value, failure="circuit_open")
+                record(category_name, subcategory, FAILED, error=CIRCUIT_OPEN)
+                continue
+            print(f"  🔄 Adding {i}/{len(subcategories)}: '{subcategory}'")
+            if governor:
+                governor.acquire()
+            area_started = time.time()
+            with timer.tagged(code=code_value, category=category_name, subcategory=subcategory):
+                try:
+                    try:
+                        add_area(driver, category_name, subcategory, timer=timer, timing=timing)
+                    except Exception:
+                        if governor:
+                            governor.release(time.time() - area_started, failures=1)
+                        raise
+                    area_seconds.append(time.time() - area_started)
+                    if governor:
+                        governor.release(area_seconds[-1])
+                    success_count += 1
+                    metrics.inc("comcheck_areas_added_total", code=code_value)
+                    metrics.observe("comcheck_area_seconds", area_seconds[-1], code=code_value)
+                    recovery.success(category_name)
+                    record(category_name, subcategory, ADDED, seconds=area_seconds[-1])
+                    print(f"    ✅ Successfully added '{subcategory}' ({area_seconds[-1]:.2f}s)")
+                    if recycler:
+                        recycler.observe(area_seconds[-1])
+                        recycle_reason = recycler.check(driver)
+                except Exception as e:
+                    error_count += 1
+                    with timer.step('recover'):
+                        kind = recovery.failure(category_name, e)
+                    metrics.inc("comcheck_areas_failed_total", code=code_value, failure=kind)
+                    print(f"    ❌ [{kind}] {e}")
+                    record(category_name, subcategory, FAILED, error=str(e), failure=kind)
+            if recycle_reason:
+                break
+        if category_name in recovery.open:
+            print(f"    ⛔ Gave up on '{category_name}' after {recovery.threshold} failures in a row; "
+                  f"the rest is left for verification")
+
+    return {
+        "code": code_value,
+        "total": total_combinations,
+        "success": success_count,
+        "skipped": skipped_count,
+        "errors": error_count,
+        "elapsed": time.time() - started,
+        "area_seconds": area_seconds,
+        "recovery": recovery.summary(),
+        "recycle": recycle_reason,
+    }
+
+
+class WarmSession:
+    """
+    One initialized COMcheck-Web application window kept alive across codes.
+
+    The first code pays the cold bootstrap: launch Chrome, load the landing
+    page, click Start, wait for the second window and the loading indicator.
+    Later codes reload the application window for a fresh project and
+    switch #code. If that reset fails, or the browser has grown past
+    max_rss_mb, the browser is restarted from scratch. The session's timing
+    policy keeps learning step latencies across codes and restarts; restarts
+    are counted in its metrics.
+    """
+
+    def __init__(self, url=APP_URL, driver_config=None, timer=NULL_TIMER, max_rss_mb=None, timing=None,
+                 metrics=NULL_METRICS):
+        self.url = url
+        self.driver_config = driver_config or DriverConfig()
+        self.timer = timer
+        self.max_rss_mb = max_rss_mb
+        self.timing = TimingPolicy() if timing is None else timing
+        self.metrics = metrics
+        self.driver = None
+        self.browser = None
+        self.app_url = None
+        self.cold_seconds = []
+        self.warm_seconds = []
+        self.restarts = 0
+
+    def start(self):
+        """
+        Cold bootstrap: launch the browser and open the application window
+        """
+        self.driver, self.browser = launch_driver(self.driver_config)
+        print(f"✓ Browser up in {self.browser['startup_seconds']:.1f}s" +
+              (f", {self.browser['rss_mb']:.0f} MB RSS" if self.browser['rss_mb'] is not None else ""))
+        if self.timer is not NULL_TIMER:
+            self.timer.attach(self.driver)
+        with self.timer.step('bootstrap'):
+            start_application(self.driver, self.url, self.timing)
+        self.app_url = self.driver.current_url
+
+    def close(self):
+        if self.driver:
+            forget_modal_lookups(self.driver)
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+        self.driver = None
+
+    def restart(self, reason="restart"):
+        self.close()
+        self.restarts += 1
+        self.metrics.inc("comcheck_browser_restarts_total", reason=reason)
+        self.start()
+
+    def reset_project(self):
+        """
+        Reload the application window, which starts a new empty project
+        """
+        forget_modal_lookups(self.driver)
+        self.driver.get(self.app_url)
+        wait_for_loading(self.driver, timing=self.timing)
+
+    def open_project(self, reference, code_value):
+        """
+        Load a saved project into the application window by its reference.
+
+        Returns False when the page does not come back with that project on
+        code_value; the window then holds whatever the page loaded instead.
+        """
+        forget_modal_lookups(self.driver)
+        separator = "&" if "?" in self.app_url else "?"
+        self.driver.get(f"{self.app_url}{separator}{PROJECT_URL_PARAM}={quote(str(reference))}")
+        try:
+            wait_until(self.driver, project_opened(reference), 'project_open', self.timing)
+        except TimeoutException:
+            return False
+        wait_for_loading(self.driver, timing=self.timing)
+        return selected_code(self.driver) == code_value
+
+    def switch_code(self, code_value, project=None):
+        """
+        Leave the application on code_value's Interior Lighting tab; returns the driver.
+
+        With a project reference (see ProgressJournal.project) that project is
+        reopened instead of starting a new one; if it can't be, a new one is started.
+        """
+        started = time.perf_counter()
+        if self.driver and self.max_rss_mb:
+            rss_mb = browser_rss_mb(self.driver)
+            if rss_mb is not None and rss_mb > self.max_rss_mb:
+                print(f"♻️  Browser at {rss_mb:.0f} MB RSS, restarting before {code_value}")
+                self.close()
+                self.restarts += 1
+                self.metrics.inc("comcheck_browser_restarts_total", reason="memory")
+        cold = self.driver is None
+        with self.timer.tagged(code=code_value):
+            if cold:
+                self.start()
+            with self.timer.step('code_switch'):
+                try:
+                    reopened = bool(project) and self.open_project(project, code_value)
+                    if not reopened:
+                        if project:
+                            print(f"⚠️  Could not reopen project {project} on {code_value}, starting a new one")
+                        if not cold or project:
+                            self.reset_project()
+                        select_code(self.driver, code_value, self.timing)
+                    open_interior_lighting(self.driver, self.timing)
+                except Exception as e:
+                    if cold:
+                        raise
+                    print(f"⚠️  Warm switch to {code_value} failed ({e}), restarting browser")
+                    cold, reopened = True, False
+                    self.restart("switch_failed")
+                    select_code(self.driver, code_value, self.timing)
+                    open_interior_lighting(self.driver, self.timing)
+        seconds = time.perf_counter() - started
+        (self.cold_seconds if cold else self.warm_seconds).append(seconds)
+        self.last_switch = {"warm": not cold, "seconds": seconds, "reopened": reopened}
+        return self.driver
+
+    def recycle(self, code_value, categories):
+        """
+        Swap the browser for a fresh one with the current project reopened in it.
+
+        The new browser is started while the old one is still open. It only
+        replaces the old one when it shows the same project on code_value
+        with the same areas in its table (by category and subcategory);
+        otherwise it is closed and False is returned, leaving the old browser
+        in place. Also False when the page has no project reference to reopen.
+        """
+        reference = self.driver.execute_script(PROJECT_REFERENCE_JS)
+        if not reference:
+            return False
+        expected = table_area_counts(self.driver, categories)
+        old = self.driver, self.browser, self.app_url
+        with self.timer.step('recycle'):
+            problem = None
+            try:
+                self.start()
+                if not self.open_project(reference, code_value):
+                    problem = f"project {reference} did not reopen on {code_value}"
+                elif table_area_counts(self.driver, categories) != expected:
+                    problem = f"project {reference} reopened with a different area table"
+                else:
+                    open_interior_lighting(self.driver, self.timing)
+            except Exception as e:
+                problem = f"new browser failed: {e}"
+            if problem:
+                print(f"⚠️  Recycle aborted, keeping the old browser: {problem}")
+                self.close()
+                self.driver, self.browser, self.app_url = old
+                forget_modal_lookups(self.driver)
+                return False
+            forget_modal_lookups(old[0])
+            try:
+                old[0].quit()
+            except Exception:
+                pass
+        self.restarts += 1
+        self.metrics.inc("comcheck_browser_restarts_total", reason="recycle")
+        return True
+
+    def summary(self):
+        """
+        Cold bootstrap vs warm switch times, and the time warm switches saved
+        """
+        cold = statistics.mean(self.cold_seconds) if self.cold_seconds else None
+        warm = statistics.mean(self.warm_seconds) if self.warm_seconds else None
+        return {
+            "cold_starts": len(self.cold_seconds),
+            "cold_seconds_mean": cold,
+            "warm_switches": len(self.warm_seconds),
+            "warm_seconds_mean": warm,
+            "restarts": self.restarts,
+            "seconds_saved": (cold - warm) * len(self.warm_seconds) if cold and warm is not None else 0.0,
+        }
+
+    def report(self):
+        summary = self.summary()
+        print(f"\n🔥 Session: {summary['cold_starts']} cold start(s)"
+              + (f" at {summary['cold_seconds_mean']:.1f}s" if summary['cold_seconds_mean'] else "")
+              + f", {summary['warm_switches']} warm switch(es)"
+              + (f" at {summary['warm_seconds_mean']:.1f}s" if summary['warm_seconds_mean'] else "")
+              + f", {summary['restarts']} restart(s), ~{summary['seconds_saved']:.0f}s saved")
+        if isinstance(self.timing, TimingPolicy):
+            self.timing.report()
+
+
+def merge_runs(first, resumed):
+    """
+    Combine a run cut short for recycling with its resumed continuation
+    """
+    merged = dict(resumed)
+    merged['success'] = first['success'] + resumed['success']
+    merged['errors'] = first['errors'] + resumed['errors']
+    merged['skipped'] = first['skipped']  # the resumed run skips what the first one added
+    merged['elapsed'] = first['elapsed'] + resumed['elapsed']
+    merged['area_seconds'] = first['area_seconds'] + resumed['area_seconds']
+    merged['recycled'] = first.get('recycled', []) + [first['recycle']]
+    merged['recovery'] = {
+        "failures": dict(Counter(first['recovery']['failures']) + Counter(resumed['recovery']['failures'])),
+        "resets": first['recovery']['resets'] + resumed['recovery']['resets'],
+        "open_categories": sorted(set(first['recovery']['open_categories'])
+                                  | set(resumed['recovery']['open_categories'])),
+        "short_circuited": first['recovery']['short_circuited'] + resumed['recovery']['short_circuited'],
+    }
+    return merged
+
+
+def report(result):
+    """
+    Print the end-of-run summary for one code
+    """
+    success_count = result['success']
+    skipped_count = result.get('skipped', 0)
+    total_combinations = result['total']
+    print(f"\n🏁 FULL AUTOMATION COMPLETE! ({result['code']})")
+    print(f"✅ Successfully added: {success_count}")
+    if skipped_count:
+        print(f"↩️  Already present: {skipped_count}")
+    print(f"❌ Errors: {result['errors']}")
+    total_attempted = success_count + result['errors']
+    if total_attempted > 0:
+        success_rate = (success_count / total_attempted) * 100
+        print(f"📊 Success rate: {success_rate:.1f}%")
+    recovery = result.get('recovery')
+    if recovery and recovery['resets']:
+        failures = ", ".join(f"{kind} {count}" for kind, count in recovery['failures'].items())
+        print(f"🩹 Recovered {recovery['resets']} times ({failures})"
+              + (f", gave up on {', '.join(recovery['open_categories'])}" if recovery['open_categories'] else ""))
+    if result.get('recycled'):
+        print(f"♻️  Browser recycled {len(result['recycled'])} times ({'; '.join(result['recycled'])})")
+    area_seconds = result.get('area_seconds')
+    if area_seconds:
+        print(f"⏱️  Time per area: mean {statistics.mean(area_seconds):.2f}s, "
+              f"median {statistics.median(area_seconds):.2f}s, max {max(area_seconds):.2f}s")
+
+    verification = result.get('verification')
+    if verification is not None:
+        missing = sum(count for _, _, count in verification['missing'])
+        duplicates = sum(count for _, _, count in verification['duplicates'])
+        if not missing and not duplicates:
+            print(f"🎉 ALL {total_combinations} AREA CATEGORIES VERIFIED IN THE PROJECT!")
+        else:
+            print(f"⚠️  Area table has {missing} missing and {duplicates} duplicate areas")
+    elif success_count + skipped_count == total_combinations:
+        print(f"🎉 ALL {total_combinations} AREA CATEGORIES SUCCESSFULLY ADDED!")
+    else:
+        print(f"⚠️  {total_combinations - success_count - skipped_count} categories still need to be added")
+
+
+def finish_trace(timer, trace_path=None):
+    """
+    Print the command trace summary and write it out if a path was given
+    """
+    if timer is NULL_TIMER:
+        return
+    timer.report()
+    if trace_path:
+        timer.write(trace_path)
+        print(f"📁 Saved WebDriver trace to: {trace_path} (+ .folded)")
+
+
+def populate(code_value, catalog, url=APP_URL, inspect=False, headless=True, batch=False,
+             journal=None, resume=False, trace=False, trace_path=None, driver_config=None,
+             session=None, verify=True, recycle=None, timing=None, governor=None, metrics=None):
+    """
+    Populate every area category in the catalog for one code value.
+
+    Args:
+        code_value (str): Code dropdown value from all_codes.json (e.g. 'CEZ_IECC2015').
+        catalog (str | dict): Catalog JSON path, or an already loaded catalog.
+        url (str): COMcheck-Web landing page.
+        inspect (bool): Keep the browser open until Enter is pressed.
+        headless (bool): Use the headless low-overhead DriverConfig; False shows a
+            maximized window (ignored with driver_config).
+        batch (bool): Add each category in one in-page pass (see add_category_batch).
+        journal (str): Progress journal path; every attempt is appended to it.
+        resume (bool): Reopen the project the journal last recorded for this code
+            and skip areas already in its area table (see plan_resume).
+        trace (bool): Count and time every WebDriver command and print a summary.
+        trace_path (str): Also write the command trace (JSONL + .folded stacks) here.
+        driver_config (DriverConfig): Browser launch settings.
+        session (WarmSession): Reuse this session's browser and leave it open; url,
+            headless, driver_config and the trace options then come from the session.
+        verify (bool): Diff the area table against the catalog afterwards and
+            re-add only the missing areas (see verify_and_rerun).
+        recycle (RecyclePolicy): Restart the browser mid-code when it grows too
+            large or slow; progress is checkpointed in the journal and the
+            project is reopened in the new browser (see WarmSession.recycle).
+            Off unless given: reopening a project is not confirmed on the live site.
+        timing (FixedTiming): Wait timeouts for an owned session; the default
+            TimingPolicy learns them from measured step latency.
+        governor (RateGovernor): Concurrency limit shared with other workers
+            (see rate_governor); every add waits for a slot.
+        metrics (Metrics): Live counters and histograms (see metrics); defaults
+            to the session's.
+
+    Returns:
+        dict: Counts for the run ('code', 'total', 'success', 'skipped', 'errors', 'elapsed'),
+              the wall-clock seconds of each added area ('area_seconds'), the
+              browser's startup time and memory ('browser'), how long getting
+              the application ready for this code took ('session') and the
+              table-vs-catalog diff ('verification').
+    """
+    own_session = session is None
+    if own_session:
+        if driver_config is None:
+            driver_config = DriverConfig() if headless else DriverConfig.interactive()
+        timer = CommandTrace(keep_events=bool(trace_path)) if trace or trace_path else NULL_TIMER
+        session = WarmSession(url, driver_config, timer, timing=timing, metrics=metrics or NULL_METRICS)
+    timer = session.timer
+    timing = session.timing
+    metrics = session.metrics if metrics is None else metrics
+
+    result = {"code": code_value, "total": 0, "success": 0, "skipped": 0, "errors": 0,
+              "elapsed": 0.0, "area_seconds": []}
+    metrics.add("comcheck_active_workers", 1)
+    try:
+        print(f"=== AREA AUTOMATION: {code_value} ===")
+
+        print("Step 1: Getting COMcheck-Web ready...")
+        journal = ProgressJournal(journal) if journal else None
+        reference = journal.project(code_value) if journal and resume else None
+        driver = session.switch_code(code_value, project=reference)
+        switch = session.last_switch
+        print(f"✓ {'Reopened project ' + str(reference) + ' on' if switch['reopened'] else 'Selected'} "
+              f"{code_value} ({'warm switch' if switch['warm'] else 'cold start'} in {switch['seconds']:.1f}s)")
+        print("✓ Navigated to Interior Lighting Method and Areas")
+        if journal:
+            current = driver.execute_script(PROJECT_REFERENCE_JS)
+            if current and str(current) != str(reference):
+                journal.record_project(code_value, current)
+
+        print("Step 2: Starting full automation loop...")
+        with timer.tagged(code=code_value):
+            result = populate_areas(driver, code_value, catalog, batch=batch, journal=journal,
+                                    resume=resume, timer=timer, recycler=recycle, timing=timing,
+                                    governor=governor, metrics=metrics)
+            while result.get('recycle'):
+                reason = result['recycle']
+                print(f"\n♻️  Recycling the browser: {reason}")
+                if not session.recycle(code_value, load_catalog(catalog)['categories']):
+                    print("⚠️  This project can't be reopened in a new browser; carrying on without recycling")
+                    recycle.disable()
+                else:
+                    recycle.recycled(reason)
+                    driver = session.driver
+                more = populate_areas(driver, code_value, catalog, batch=batch, journal=journal,
+                                      resume=True, timer=timer, recycler=recycle, timing=timing,
+                                      governor=governor, metrics=metrics)
+                result = merge_runs(result, more)
+            if verify:
+                print("Step 3: Verifying the area table...")
+                result['verification'] = verify_and_rerun(driver, code_value, catalog, batch=batch,
+                                                          journal=journal, timer=timer, timing=timing,
+                                                          metrics=metrics)
+        result['browser'] = dict(session.browser, rss_mb_end=browser_rss_mb(driver))
+        result['session'] = dict(
+            switch,
+            share_of_code_time=switch['seconds'] / (switch['seconds'] + result['elapsed']),
+        )
+        report(result)
+
+    except Exception as e:
+        print(f"\n❌ FATAL ERROR: {e}")
+        result['fatal'] = str(e)
+
+    finally:
+        metrics.add("comcheck_active_workers", -1)
+        metrics.inc("comcheck_codes_finished_total", status="ok" if run_ok(result) else "failed")
+        if own_session:
+            finish_trace(timer, trace_path)
+            if session.driver:
+                print("\n🎯 AUTOMATION FINISHED!")
+                if inspect:
+                    print("Browser remaining open for inspection...")
+                    input("Press Enter to close browser...")
+            session.close()
+
+    return result
+
+
+def main(argv=None):
+    """
+    Command line entry point: populate one or more codes from all_codes.json in one browser
+    """
+    parser = argparse.ArgumentParser(description="Populate COMcheck area categories for code years.")
+    parser.add_argument("codes", nargs="+", help="code values from all_codes.json (e.g. CEZ_IECC2015)")
+    parser.add_argument("--catalog", help="catalog JSON path, single code only (default: <code>_areas_catalog.json)")
+    parser.add_argument("--store", help="read catalogs from this SQLite catalog store instead")
+    parser.add_argument("--url", default=APP_URL, help="COMcheck-Web landing page")
+    parser.add_argument("--inspect", action="store_true", help="show the browser and keep it open at the end")
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    parser.add_argument("--batch", action="store_true", help="add each category in one in-page pass")
+    parser.add_argument("--journal", default=DEFAULT_JOURNAL, help="progress journal (JSONL)")
+    parser.add_argument("--resume", action="store_true", help="skip areas already in the project")
+    parser.add_argument("--no-verify", action="store_true", help="skip the area table check at the end")
+    parser.add_argument("--recycle", action="store_true",
+                        help="restart the browser mid-code and reopen the project (stand-in only so far)")
+    parser.add_argument("--recycle-areas", type=int, default=DEFAULT_MAX_AREAS,
+                        help="restart the browser after this many areas (0: never)")
+    parser.add_argument("--max-rss-mb", type=int, default=DEFAULT_MAX_RSS_MB,
+                        help="restart the browser above this RSS (0: never)")
+    parser.add_argument("--max-slowdown", type=float, default=DEFAULT_SLOWDOWN,
+                        help="restart when area times reach this multiple of the first ones (0: never)")
+    parser.add_argument("--fixed-timeouts", action="store_true",
+                        help="use the built-in wait timeouts instead of learning them from step latency")
+    parser.add_argument("--trace", action="store_true", help="print a WebDriver command summary")
+    parser.add_argument("--trace-file", help="write the WebDriver command trace (JSONL) here")
+    parser.add_argument("--metrics-port", type=int, nargs="?", const=DEFAULT_METRICS_PORT,
+                        help=f"serve Prometheus metrics on this local port (default {DEFAULT_METRICS_PORT})")
+    parser.add_argument("--metrics-json", help="write the metrics as JSON here at exit")
+    args = parser.parse_args(argv)
+
+    if args.catalog and len(args.codes) > 1:
+        parser.error("--catalog can only be used with a single code")
+    if args.catalog and args.store:
+        parser.error("--catalog and --store are mutually exclusive")
+    try:
+        store = CatalogStore(args.store, readonly=True) if args.store else None
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    jobs = []
+    for code_value in args.codes:
+        try:
+            code = find_code(code_value)
+        except ValueError as e:
+            parser.error(str(e))
+        if store is not None:
+            if not store.has(code['value']):
+                parser.error(f"No catalog for {code['text']} in {args.store}")
+            jobs.append((code, store.catalog(code['value'])))
+            continue
+        catalog = args.catalog or catalog_path_for(code['value'])
+        if not os.path.exists(catalog):
+            parser.error(f"No catalog for {code['text']}: {catalog}")
+        try:
+            jobs.append((code, load_catalog(catalog)))
+        except ValueError as e:
+            parser.error(str(e))
+
+    driver_config = DriverConfig.interactive() if args.headed or args.inspect else DriverConfig()
+    timer = CommandTrace(keep_events=bool(args.trace_file)) if args.trace or args.trace_file else NULL_TIMER
+    metrics = Metrics() if args.metrics_port or args.metrics_json else NULL_METRICS
+    metrics_server = serve_metrics(metrics, args.metrics_port) if args.metrics_port else None
+    session = WarmSession(args.url, driver_config, timer, max_rss_mb=args.max_rss_mb or None,
+                          timing=FIXED_TIMING if args.fixed_timeouts else None, metrics=metrics)
+    results = []
+    try:
+        for code, catalog in jobs:
+            recycle = RecyclePolicy(
+                args.recycle_areas or None, args.max_rss_mb or None, args.max_slowdown or None,
+                rss_probe=browser_rss_mb,
+            ) if args.recycle else None
+            results.append(populate(code['value'], catalog, batch=args.batch, journal=args.journal,
+                                    resume=args.resume, session=session, verify=not args.no_verify,
+                                    recycle=recycle))
+        session.report()
+        finish_trace(timer, args.trace_file)
+        if args.inspect and session.driver:
+            print("Browser remaining open for inspection...")
+            input("Press Enter to close browser...")
+    finally:
+        session.close()
+        if metrics_server:
+            metrics_server.shutdown()
+        if args.metrics_json:
+            metrics.write_json(args.metrics_json)
+            print(f"📁 Saved metrics to: {args.metrics_json}")
+
+    return 0 if all(run_ok(result) for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,12 @@
 import time
 import yaml
 import argparse
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from driver_factory import DriverConfig, create_driver
+from catalog_discovery import discover_catalog
+from comcheck_engine import populate_areas, reset_state
 
 def start_comcheck_web(driver):
     """
@@ -49,9 +50,9 @@ def scrape_space_types_from_modal(driver):
     """
     Scrapes all space categories and subcategories from the 'Create Area Category' modal.
 
-    This function will be called once the modal is open. It will programmatically
-    click each category radio button to reveal its subcategory dropdown, then read
-    and store all the options.
+    This function will be called once the modal is open. A single in-page script
+    clicks each category radio button to reveal its subcategory dropdown, then reads
+    and stores all the options (see catalog_discovery.discover_catalog).
 
     Args:
         driver: The Selenium WebDriver instance.
@@ -60,43 +61,34 @@ def scrape_space_types_from_modal(driver):
         dict: A dictionary where keys are the main categories and values are lists
               of subcategory strings.
     """
-    # This function will:
-    # 1. Find all the radio button elements for the main categories.
-    # 2. Iterate through each radio button:
-    #    a. Get the text label of the category (e.g., "Common Space Types").
-    #    b. Click the radio button.
-    #    c. Find the corresponding <select> dropdown element.
-    #    d. Get all the <option> text from that dropdown.
-    #    e. Store this in a dictionary.
-    # 3. Return the completed dictionary.
-    pass
+    categories, _ = discover_catalog(driver)
+    return categories
 
 
-def add_all_space_types(driver, space_types):
+def add_all_space_types(driver, space_types, code_value=""):
     """
     Iterates through all space types and adds them to the project.
 
+    The driver must be on the Interior Lighting tab with the code selected; an
+    area modal left open by `add_area_category` is cancelled first. Repeated
+    space types are added once. The adds go through the population engine's
+    loop (see comcheck_engine.populate_areas); plan_compiler.py validates a
+    space-type file against the catalog store before a run.
+
     Args:
         driver: The Selenium WebDriver instance.
         space_types (dict): The dictionary of space types from the YAML file.
+        code_value (str): The selected code, for progress output.
+
+    Returns:
+        dict: Success, error and timing counts for the run.
     """
-    # This function will implement the main automation loop:
-    #
-    # 1. The modal should already be open from the `add_area_category` call.
-    #
-    # 2. Loop through each category (e.g., "Common Space Types") and its
-    #    list of subcategories from the `space_types` data.
-    #
-    # 3. For each subcategory:
-    #    a. Find and click the radio button for the main category.
-    #    b. Find the dropdown menu associated with that category.
-    #    c. Select the subcategory name from the dropdown.
-    #    d. Find and click the "Create Area Category" button.
-    #    e. Wait for the modal to close.
-    #    f. Call `add_area_category(driver)` again to reopen the modal
-    #       for the next iteration (unless it's the last item).
-    #
-    pass
+    reset_state(driver)
+    categories = {}
+    for category, subcategories in space_types.items():
+        unique = categories.setdefault(category, [])
+        unique.extend(sub for sub in dict.fromkeys(subcategories or []) if sub not in unique)
+    return populate_areas(driver, code_value, {"categories": categories})
 
 
 def main():
@@ -106,8 +98,7 @@ def main():
     driver = None
     try:
         print("Initializing WebDriver...")
-        service = ChromeService()
-        driver = webdriver.Chrome(service=service)
+        driver = create_driver(DriverConfig.interactive())
         
         # 2. Navigate to the COMcheck-Web URL.
         url = "https://energycode.pnl.gov/COMcheckWeb/"
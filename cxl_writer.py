@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Offline CXL Project Generator
+Goal: Write COMcheck CXL project files straight from the catalogs, no browser needed
+
+Experimental: the element layout follows the project model the engine drives
+in the browser, not a file exported by COMcheck, and has not been checked
+against one. It is no replacement for populating projects through the UI.
+--validate only round-trips a sample through the stand-in server's import,
+which reads this same layout; it says nothing about COMcheck itself.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime
+from xml.sax.saxutils import XMLGenerator
+
+from code_catalogs import (
+    BASE_DIR, CODES_FILE, load_codes, find_code, catalog_path_for, load_catalog, read_spec_file,
+)
+
+CXL_VERSION = "1"
+DEFAULT_FLOOR_AREA = 1000
+
+# File input that opens a .cxl in the application window. Only the stand-in
+# server has it; the live site's import control is not known.
+IMPORT_INPUT_ID = "importProject"
+
+
+def load_spec(path):
+    """
+    Load a space-type spec (YAML or JSON) as {category: [subcategories]}.
+
+    Accepts the catalog shape ({'categories': {...}}) or a bare
+    {category: [subcategories]} mapping as used by cxl_pop.py.
+    """
+    spec = read_spec_file(path)
+    categories = spec.get('categories', spec)
+    for category, subs in categories.items():
+        if not isinstance(subs, list):
+            raise ValueError(f"Spec {path}: '{category}' must list its subcategories")
+    return categories
+
+
+def iter_areas(categories):
+    """
+    (category, subcategory) pairs in catalog order, skipping empty categories
+    """
+    for category, subs in categories.items():
+        for sub in subs:
+            yield category, sub
+
+
+class CXLWriter:
+    """
+    Streams one project to a file with xml.sax's XMLGenerator.
+
+    Areas are written as they are added, so a project never has to be held
+    in memory as a tree. Element names follow the project model the engine
+    drives in the browser: code, project type, and one areaCategory per
+    Interior Lighting area. They are not taken from a real COMcheck export.
+    """
+
+    def __init__(self, stream):
+        self.xml = XMLGenerator(stream, encoding="utf-8", short_empty_elements=True)
+        self.depth = 0
+        self.areas = 0
+
+    def _indent(self):
+        self.xml.ignorableWhitespace("\n" + "  " * self.depth)
+
+    def start(self, name, attrs=None):
+        self._indent()
+        self.xml.startElement(name, attrs or {})
+        self.depth += 1
+
+    def end(self, name):
+        self.depth -= 1
+        self._indent()
+        self.xml.endElement(name)
+
+    def element(self, name, text):
+        self._indent()
+        self.xml.startElement(name, {})
+        self.xml.characters(str(text))
+        self.xml.endElement(name)
+
+    def begin_project(self, code, title, project_type="New Construction"):
+        self.xml.startDocument()
+        self.xml.startElement("building", {"cxlVersion": CXL_VERSION})
+        self.depth = 1
+        self.start("control")
+        self.element("code", code['value'])
+        self.element("codeName", code['text'])
+        self.element("generator", "cxl_writer.py")
+        self.element("generated", datetime.now().isoformat(timespec='seconds'))
+        self.end("control")
+        self.start("project")
+        self.element("title", title)
+        self.element("projectType", project_type)
+        self.end("project")
+        self.start("intLighting")
+
+    def add_area(self, category, subcategory, floor_area=DEFAULT_FLOOR_AREA):
+        self.areas += 1
+        self.start("areaCategory", {"key": str(self.areas)})
+        self.element("category", category)
+        self.element("activityType", subcategory)
+        self.element("floorArea", floor_area)
+        self.end("areaCategory")
+
+    def end_project(self):
+        self.end("intLighting")
+        self.depth = 0
+        self._indent()
+        self.xml.endElement("building")
+        self.xml.ignorableWhitespace("\n")
+        self.xml.endDocument()
+
+
+def write_cxl(path, code, categories, title=None, floor_area=DEFAULT_FLOOR_AREA):
+    """
+    Write a project with one area per (category, subcategory); returns the area count
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        writer = CXLWriter(f)
+        writer.begin_project(code, title or f"{code['text']} - all area categories")
+        for category, sub in iter_areas(categories):
+            writer.add_area(category, sub, floor_area)
+        writer.end_project()
+    return writer.areas
+
+
+def cxl_path_for(code_value, output_dir=BASE_DIR):
+    """
+    CEZ_IECC2015 -> <output_dir>/iecc_2015_areas.cxl (named like its catalog)
+    """
+    catalog_name = os.path.basename(catalog_path_for(code_value))
+    return os.path.join(output_dir, catalog_name.replace("_catalog.json", ".cxl"))
+
+
+def sample_catalog(categories, size, seed=None):
+    """
+    A random subset of size areas, in catalog order, for validating a generated project in the browser
+    """
+    areas = list(iter_areas(categories))
+    picked = set(random.Random(seed).sample(range(len(areas)), min(size, len(areas))))
+    sample = {}
+    for i, (category, sub) in enumerate(areas):
+        if i in picked:
+            sample.setdefault(category, []).append(sub)
+    return {"categories": sample}
+
+
+def import_cxl(driver, path, timing):
+    """
+    Open a .cxl file through the application window's project import and wait for the new project
+    """
+    from selenium.webdriver.common.by import By
+    from comcheck_engine import PROJECT_REFERENCE_JS, wait_until, wait_for_loading, forget_modal_lookups
+
+    previous = driver.execute_script(PROJECT_REFERENCE_JS)
+
+    def _imported(d):
+        return d.execute_script(PROJECT_REFERENCE_JS) not in (None, previous)
+
+    driver.find_element(By.ID, IMPORT_INPUT_ID).send_keys(os.path.abspath(path))
+    wait_until(driver, _imported, 'project_open', timing)
+    wait_for_loading(driver, timing=timing)
+    forget_modal_lookups(driver)
+
+
+def validate_sample(code, categories, size, seed=None):
+    """
+    Round-trip a CXL of sampled areas through a local stand-in server and diff its area table against the sample.
+
+    The sample is written with the same CXLWriter as the full projects, opened
+    through the stand-in page's project import (see import_cxl) and read back
+    with verify_areas. The stand-in parses the layout this module writes, so
+    this catches writer regressions only, not differences from COMcheck's format.
+
+    Returns:
+        dict: The verify_areas result for the sample, or {'fatal': reason} when the import failed.
+    """
+    # The population engine pulls in selenium; generation itself does not need it
+    from comcheck_engine import (WarmSession, open_interior_lighting, selected_code, verify_areas,
+                                 report_verification)
+    from driver_factory import DriverConfig
+    from standin_server import serve_in_thread
+
+    sample = sample_catalog(categories, size, seed)['categories']
+    server, url = serve_in_thread()
+    session = WarmSession(url, DriverConfig())
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, os.path.basename(cxl_path_for(code['value'])))
+        write_cxl(path, code, sample, title=f"{code['text']} - validation sample")
+        try:
+            session.start()
+            import_cxl(session.driver, path, session.timing)
+            if selected_code(session.driver) != code['value']:
+                raise RuntimeError(f"imported project is on {selected_code(session.driver)!r}")
+            open_interior_lighting(session.driver, session.timing)
+            verification = verify_areas(session.driver, sample)
+        except Exception as e:
+            print(f"❌ Could not import the {code['value']} sample: {e}")
+            return {"fatal": str(e)}
+        finally:
+            session.close()
+            server.shutdown()
+    report_verification(verification)
+    return verification
+
+
+def sample_ok(verification):
+    """
+    True when the imported sample holds exactly the sampled areas
+    """
+    return ('fatal' not in verification and not verification['missing'] and not verification['duplicates']
+            and not verification['unexpected'])
+
+
+def generate(codes, spec=None, output_dir=BASE_DIR, floor_area=DEFAULT_FLOOR_AREA):
+    """
+    Write one CXL per code; codes without a catalog (and no spec) are skipped.
+
+    Returns:
+        dict: {code value: {'path', 'areas', 'seconds'} or {'skipped': reason}}
+    """
+    results = {}
+    shared = load_spec(spec) if spec else None
+    for code in codes:
+        catalog = catalog_path_for(code['value'])
+        if shared is None and not os.path.exists(catalog):
+            results[code['value']] = {"skipped": f"no catalog at {catalog}"}
+            continue
+        started = time.perf_counter()
+        categories = shared if shared is not None else load_catalog(catalog)['categories']
+        path = cxl_path_for(code['value'], output_dir)
+        areas = write_cxl(path, code, categories, floor_area=floor_area)
+        results[code['value']] = {"path": path, "areas": areas, "seconds": time.perf_counter() - started}
+    return results
+
+
+def main(argv=None):
+    """
+    Command line entry point: generate CXL projects for some or all codes
+    """
+    parser = argparse.ArgumentParser(description="Generate COMcheck CXL projects without a browser.")
+    parser.add_argument("codes", nargs="*", help="code values (default: every code with a catalog)")
+    parser.add_argument("--spec", help="YAML/JSON space-type spec to use instead of each code's catalog")
+    parser.add_argument("--output-dir", default=BASE_DIR, help="where to write the .cxl files")
+    parser.add_argument("--floor-area", type=int, default=DEFAULT_FLOOR_AREA, help="floor area per area (ft2)")
+    parser.add_argument("--codes-file", default=CODES_FILE, help="code list JSON")
+    parser.add_argument("--validate", type=int, metavar="N",
+                        help="round-trip a CXL of N sampled areas per code through the local stand-in server "
+                             "(checks the writer, not COMcheck compatibility)")
+    parser.add_argument("--seed", type=int, help="random seed for the --validate sample")
+    args = parser.parse_args(argv)
+
+    if args.codes:
+        try:
+            codes = [find_code(value, args.codes_file) for value in args.codes]
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        codes = load_codes(args.codes_file)
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    print("🧪 Experimental CXL layout, not checked against a COMcheck export or import; "
+          "populate projects through the UI (comcheck_engine.py) for real use")
+    results = generate(codes, spec=args.spec, output_dir=args.output_dir, floor_area=args.floor_area)
+    for code in codes:
+        result = results[code['value']]
+        if 'skipped' in result:
+            print(f"  ⏭️  {code['text']}: {result['skipped']}")
+        else:
+            print(f"  ✅ {code['text']}: {result['areas']} areas in {result['seconds'] * 1000:.0f}ms "
+                  f"-> {result['path']}")
+
+    if not args.validate:
+        return 0
+    failed = []
+    for code in codes:
+        if 'skipped' in results[code['value']]:
+            continue
+        categories = load_spec(args.spec) if args.spec else load_catalog(catalog_path_for(code['value']))['categories']
+        if not sample_ok(validate_sample(code, categories, args.validate, seed=args.seed)):
+            failed.append(code['value'])
+    for value in failed:
+        print(f"❌ {value} sample did not round-trip through the stand-in")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
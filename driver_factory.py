@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Browser Driver Factory
+Goal: One place that decides how every entry point launches Chrome
+"""
+
+import os
+import time
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service as ChromeService
+
+try:
+    import psutil
+except ImportError:  # optional; /proc is used instead on Linux
+    psutil = None
+
+
+class DriverConfig:
+    """
+    Launch settings for a Chrome WebDriver.
+
+    The defaults are the low-overhead profile used by the population engine
+    and sweep workers: headless, 'eager' page loads (don't wait for images
+    and stylesheets), no extensions and a fixed small viewport. With
+    remote_url the browser is requested from a Selenium Grid (or standalone
+    server) instead of being started locally.
+    """
+
+    def __init__(self, headless=True, page_load_strategy="eager", window_size=(1280, 900),
+                 disable_extensions=True, maximize=False, extra_arguments=(), performance_log=False,
+                 remote_url=None):
+        self.headless = headless
+        self.page_load_strategy = page_load_strategy
+        self.window_size = window_size
+        self.disable_extensions = disable_extensions
+        self.maximize = maximize
+        self.extra_arguments = list(extra_arguments)
+        # Chrome's DevTools network events, read back with driver.get_log('performance')
+        self.performance_log = performance_log
+        self.remote_url = remote_url
+
+    @classmethod
+    def interactive(cls):
+        """
+        Visible, maximized window for the manual inspection scripts
+        """
+        return cls(headless=False, page_load_strategy="normal", window_size=None, maximize=True)
+
+    def chrome_options(self):
+        options = webdriver.ChromeOptions()
+        options.page_load_strategy = self.page_load_strategy
+        if self.headless:
+            options.add_argument("--headless=new")
+        if self.window_size:
+            options.add_argument(f"--window-size={self.window_size[0]},{self.window_size[1]}")
+        if self.disable_extensions:
+            options.add_argument("--disable-extensions")
+            options.add_argument("--disable-component-extensions-with-background-pages")
+        if self.headless:
+            options.add_argument("--disable-gpu")
+            options.add_argument("--mute-audio")
+            options.add_argument("--no-first-run")
+            options.add_argument("--disable-background-networking")
+        for argument in self.extra_arguments:
+            options.add_argument(argument)
+        if self.performance_log:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        return options
+
+
+def _process_tree_rss(pid):
+    """
+    Resident memory (bytes) of a process and all its descendants
+    """
+    if psutil:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes if p.is_running())
+        except psutil.Error:
+            return None
+
+    if not os.path.isdir("/proc"):
+        return None
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", 'r') as f:
+                # pid (comm) state ppid ...; comm may contain spaces
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        pending.extend(children.get(current, []))
+        try:
+            with open(f"/proc/{current}/status", 'r') as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total
+
+
+def browser_rss_mb(driver):
+    """
+    RSS in MB of the chromedriver process and the Chrome processes under it (None if unknown)
+
+    Remote browsers have no local process, so they always report None.
+    """
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    if process is None:
+        return None
+    rss = _process_tree_rss(process.pid)
+    return rss / (1024 * 1024) if rss is not None else None
+
+
+def session_alive(driver):
+    """
+    True when the WebDriver session still answers (False after InvalidSessionIdException and the like)
+    """
+    try:
+        driver.current_window_handle
+    except WebDriverException:
+        return False
+    return True
+
+
+def launch_driver(config=None):
+    """
+    Start Chrome with the given config, locally or on config.remote_url.
+
+    Returns:
+        tuple: (driver, stats) with 'startup_seconds' and 'rss_mb' measured right after launch.
+    """
+    config = config or DriverConfig()
+    started = time.perf_counter()
+    if config.remote_url:
+        driver = webdriver.Remote(command_executor=config.remote_url, options=config.chrome_options())
+    else:
+        driver = webdriver.Chrome(service=ChromeService(), options=config.chrome_options())
+    if config.maximize:
+        driver.maximize_window()
+    stats = {
+        "startup_seconds": time.perf_counter() - started,
+        "rss_mb": browser_rss_mb(driver),
+    }
+    return driver, stats
+
+
+def create_driver(config=None):
+    """
+    Start Chrome with the given config (default: headless low-overhead profile)
+    """
+    return launch_driver(config)[0]
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+WebDriver Command Trace
+Goal: Count and time every remote WebDriver command, tagged with the step that sent it
+"""
+
+import json
+import time
+import atexit
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from step_timing import StepTimer, summarize
+
+TAG_KEYS = ("code", "category", "subcategory")
+
+
+class CommandTrace(StepTimer):
+    """
+    StepTimer that also records each WebDriver command sent inside the steps.
+
+    Every selenium call (find_element, get_attribute, click, execute_script,
+    WebElement methods...) goes through the driver's execute method, so
+    attach() wraps that one method on the driver instance. Each command is
+    recorded with its duration, the current tags (code, category,
+    subcategory) and the stack of open steps.
+    """
+
+    def __init__(self, keep_events=True):
+        super().__init__()
+        self.keep_events = keep_events
+        self.events = []
+        self.tags = dict.fromkeys(TAG_KEYS)
+        self.command_samples = defaultdict(list)
+        self.stacks = defaultdict(float)
+        self._steps = []
+
+    def attach(self, driver):
+        """
+        Route the driver's remote commands through the trace; returns the driver
+        """
+        execute = driver.execute
+
+        def traced_execute(driver_command, params=None):
+            started = time.perf_counter()
+            ok = False
+            try:
+                response = execute(driver_command, params)
+                ok = True
+                return response
+            finally:
+                self._record(driver_command, time.perf_counter() - started, ok)
+
+        driver.execute = traced_execute
+        return driver
+
+    @contextmanager
+    def step(self, name):
+        self._steps.append(name)
+        try:
+            with super().step(name):
+                yield
+        finally:
+            self._steps.pop()
+
+    @contextmanager
+    def tagged(self, **tags):
+        previous = dict(self.tags)
+        self.tags.update(tags)
+        try:
+            yield
+        finally:
+            self.tags = previous
+
+    def _record(self, command, seconds, ok):
+        self.command_samples[command].append(seconds)
+        stack = [self.tags['code'] or "-"]
+        if self.tags['category']:
+            stack.append(self.tags['category'])
+        stack += self._steps + [command]
+        self.stacks[";".join(stack)] += seconds
+        if self.keep_events:
+            event = {"ts": time.time(), "command": command, "seconds": seconds, "ok": ok,
+                     "steps": list(self._steps)}
+            event.update(self.tags)
+            self.events.append(event)
+
+    def command_counts(self):
+        """
+        Counter of commands sent, by WebDriver command name
+        """
+        return Counter({command: len(samples) for command, samples in self.command_samples.items()})
+
+    def command_summary(self):
+        """
+        {command: summarize(durations)}, slowest total first
+        """
+        stats = {command: summarize(samples) for command, samples in self.command_samples.items()}
+        return dict(sorted(stats.items(), key=lambda item: -item[1]['total']))
+
+    def folded(self):
+        """
+        Flame-graph input: one 'code;category;step;...;command microseconds' line per stack
+        """
+        return [f"{stack} {int(seconds * 1e6)}" for stack, seconds in sorted(self.stacks.items())]
+
+    def write(self, path):
+        """
+        Write the event trace as JSONL and the folded stacks next to it (<path>.folded)
+        """
+        with open(path, 'w') as f:
+            for event in self.events:
+                f.write(json.dumps(event) + "\n")
+        with open(path + ".folded", 'w') as f:
+            f.write("\n".join(self.folded()) + "\n")
+
+    def report(self, limit=10):
+        """
+        Print the commands that took the most time, and the steps they ran in
+        """
+        commands = self.command_summary()
+        total = sum(stats['count'] for stats in commands.values())
+        print(f"\n🔬 WebDriver commands: {total} sent, "
+              f"{sum(stats['total'] for stats in commands.values()):.1f}s spent")
+        for command, stats in list(commands.items())[:limit]:
+            print(f"   {command:<28} n={stats['count']:<6} total={stats['total']:7.2f}s "
+                  f"p50={stats['p50'] * 1000:7.1f}ms p95={stats['p95'] * 1000:7.1f}ms")
+        hottest = sorted(self.stacks.items(), key=lambda item: -item[1])[:limit]
+        if hottest:
+            print("   Hottest stacks:")
+            for stack, seconds in hottest:
+                print(f"     {seconds:7.2f}s  {stack}")
+
+
+def trace_driver(driver, path=None, report=True):
+    """
+    Attach a CommandTrace to the driver and emit its summary when the process exits
+    """
+    trace = CommandTrace(keep_events=bool(path))
+    trace.attach(driver)
+
+    def _emit():
+        if report:
+            trace.report()
+        if path:
+            trace.write(path)
+            print(f"📁 Saved WebDriver trace to: {path} (+ .folded)")
+
+    atexit.register(_emit)
+    return trace
@@ -6,11 +6,10 @@ Goal: Get complete list of all codes for iteration
 
 import time
 import json
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from driver_factory import DriverConfig, create_driver
 
 def extract_all_codes():
     """
@@ -21,9 +20,7 @@ def extract_all_codes():
         print("=== EXTRACTING ALL CODE OPTIONS ===")
         print("Step 1: Initializing WebDriver...")
         
-        service = ChromeService()
-        driver = webdriver.Chrome(service=service)
-        driver.maximize_window()
+        driver = create_driver(DriverConfig.interactive())
         
         print("Step 2: Navigating to COMcheck-Web...")
         url = "https://energycode.pnl.gov/COMcheckWeb/"
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Remote WebDriver Nodes
+Goal: Spread sweep workers over Selenium Grid endpoints on several machines, within each node's capacity
+"""
+
+import sys
+import json
+import time
+import argparse
+import threading
+import urllib.request
+from multiprocessing.managers import BaseManager
+from urllib.parse import urlsplit
+
+from code_catalogs import read_spec_file
+
+
+def node_status(url, timeout=5):
+    """
+    Ask a Grid hub or standalone server whether it can take new sessions; returns (ready, message)
+    """
+    try:
+        with urllib.request.urlopen(f"{url}/status", timeout=timeout) as response:
+            value = json.loads(response.read()).get('value', {})
+    except (OSError, ValueError) as e:
+        return False, str(e)
+    return bool(value.get('ready')), value.get('message', '')
+
+
+def load_nodes(path):
+    """
+    Node list from a YAML/JSON file: [{'url', 'capacity', 'name'}, ...] or {'nodes': [...]}
+
+    A bare URL string is a node with capacity 1.
+    """
+    spec = read_spec_file(path)
+    entries = spec['nodes'] if isinstance(spec, dict) else spec
+    nodes = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"url": entry}
+        if not entry.get('url'):
+            raise ValueError(f"Node entry without a url in {path}: {entry}")
+        nodes.append({"url": entry['url'].rstrip("/"), "capacity": int(entry.get('capacity', 1)),
+                      "name": entry.get('name') or urlsplit(entry['url']).netloc})
+    return nodes
+
+
+class NodePool:
+    """
+    Capacity and health of a set of remote WebDriver endpoints.
+
+    acquire() hands out a slot on the healthy node with the lowest share of
+    its capacity in use; release() gives it back and says whether the
+    browser on it worked. After `max_failures` failures in a row a node is
+    benched for `cooldown` seconds, then probed on /status before it gets
+    work again. One pool serves all sweep workers through a NodeManager.
+    """
+
+    def __init__(self, nodes, max_failures=2, cooldown=60, probe=node_status):
+        self.nodes = {node['name']: dict(node, active=0, sessions=0, failures=0, errors=0, healthy=True,
+                                         benched_until=0.0, status="")
+                      for node in nodes}
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.probe = probe
+        self._lock = threading.Lock()
+
+    def check_all(self):
+        """
+        Probe every node now; returns the pool state
+        """
+        for node in self.nodes.values():
+            ready, message = self.probe(node['url'])
+            with self._lock:
+                node['healthy'], node['status'] = ready, message or ("ready" if ready else "not ready")
+                node['benched_until'] = 0.0 if ready else time.time() + self.cooldown
+        return self.state()
+
+    def capacity(self):
+        """
+        Browser slots on the nodes currently healthy
+        """
+        with self._lock:
+            return sum(node['capacity'] for node in self.nodes.values() if node['healthy'])
+
+    def _available(self, node, now):
+        if node['active'] >= node['capacity']:
+            return False
+        if node['healthy']:
+            return True
+        if now < node['benched_until']:
+            return False
+        # Bench time is over: only take it back if it answers
+        ready, message = self.probe(node['url'])
+        node['healthy'], node['status'] = ready, message or ("ready" if ready else "not ready")
+        node['failures'] = 0 if ready else node['failures']
+        node['benched_until'] = 0.0 if ready else now + self.cooldown
+        return ready
+
+    def acquire(self, avoid=None):
+        """
+        A free slot's node as (name, url), or None when every node is full or benched.
+
+        The node named `avoid` is only used when no other node has room.
+        """
+        with self._lock:
+            now = time.time()
+            candidates = [node for node in self.nodes.values() if self._available(node, now)]
+            candidates = [node for node in candidates if node['name'] != avoid] or candidates
+            if not candidates:
+                return None
+            node = min(candidates, key=lambda n: n['active'] / n['capacity'])
+            node['active'] += 1
+            node['sessions'] += 1
+            return node['name'], node['url']
+
+    def release(self, name, ok=True, error=None):
+        """
+        Return a slot; ok=False counts a failure against the node and may bench it
+        """
+        with self._lock:
+            node = self.nodes[name]
+            node['active'] = max(0, node['active'] - 1)
+            if ok:
+                node['failures'] = 0
+                return
+            node['failures'] += 1
+            node['errors'] += 1
+            if error:
+                node['status'] = str(error)[:200]
+            if node['failures'] >= self.max_failures:
+                node['healthy'] = False
+                node['benched_until'] = time.time() + self.cooldown
+
+    def state(self):
+        with self._lock:
+            return [
+                {key: node[key] for key in ("name", "url", "capacity", "active", "sessions", "errors",
+                                            "healthy", "status")}
+                for node in self.nodes.values()
+            ]
+
+
+class NodeManager(BaseManager):
+    """
+    Serves one NodePool to the sweep's worker processes
+    """
+
+
+NodeManager.register("NodePool", NodePool)
+
+
+def shared_pool(nodes, **options):
+    """
+    Start a manager process holding a NodePool; returns (manager, pool proxy)
+    """
+    manager = NodeManager()
+    manager.start()
+    return manager, manager.NodePool(nodes, **options)
+
+
+def report(state):
+    for node in state:
+        print(f"   {'🟢' if node['healthy'] else '🔴'} {node['name']:<24} {node['active']}/{node['capacity']} busy, "
+              f"{node['sessions']} sessions, {node['errors']} errors  {node['status']}")
+
+
+def main(argv=None):
+    """
+    Command line entry point: probe the nodes in a config file
+    """
+    parser = argparse.ArgumentParser(description="Check remote WebDriver nodes from a config file.")
+    parser.add_argument("config", help="YAML/JSON node list")
+    args = parser.parse_args(argv)
+
+    try:
+        pool = NodePool(load_nodes(args.config))
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    state = pool.check_all()
+    print(f"🌐 {sum(node['capacity'] for node in state if node['healthy'])} browser slots on "
+          f"{sum(1 for node in state if node['healthy'])}/{len(state)} healthy nodes")
+    report(state)
+    return 0 if any(node['healthy'] for node in state) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
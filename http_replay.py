@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+HTTP Replay Client
+Goal: Record the backend call behind one UI-created area, then replay it for the rest over pooled HTTP
+"""
+
+import sys
+import json
+import time
+import queue
+import argparse
+import http.client
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from concurrent.futures import ThreadPoolExecutor
+
+from code_catalogs import find_code, catalog_path_for, load_catalog, count_combinations
+from driver_factory import DriverConfig, launch_driver
+from comcheck_engine import APP_URL, start_application, select_code, open_interior_lighting, add_area
+from progress_journal import ProgressJournal, ADDED, FAILED
+from standin_server import serve_in_thread
+
+# Chrome resource types that carry the application's API calls
+REPLAY_RESOURCE_TYPES = ("XHR", "Fetch")
+
+# Headers the HTTP client sets itself (or that only make sense for the original request)
+DROPPED_HEADERS = {"content-length", "host", "connection", "cookie", "accept-encoding"}
+
+
+def network_requests(driver):
+    """
+    Drain Chrome's performance log; the XHR/fetch requests sent since the last call.
+
+    The driver must have been launched with DriverConfig(performance_log=True).
+    """
+    requests = []
+    for entry in driver.get_log('performance'):
+        message = json.loads(entry['message'])['message']
+        if message.get('method') != 'Network.requestWillBeSent':
+            continue
+        params = message['params']
+        if params.get('type') not in REPLAY_RESOURCE_TYPES:
+            continue
+        request = params['request']
+        body = request.get('postData')
+        if body is None and request.get('hasPostData'):
+            # Large bodies are left out of the event; ask DevTools for them
+            try:
+                body = driver.execute_cdp_cmd('Network.getRequestPostData',
+                                              {'requestId': params['requestId']})['postData']
+            except Exception:
+                body = None
+        requests.append({
+            "method": request['method'],
+            "url": request['url'],
+            "headers": request.get('headers', {}),
+            "body": body,
+        })
+    return requests
+
+
+def _parse_body(body):
+    """
+    (fields, is_form) for a JSON object or form-encoded body; (None, False) otherwise
+    """
+    try:
+        fields = json.loads(body)
+        return (fields, False) if isinstance(fields, dict) else (None, False)
+    except ValueError:
+        pass
+    if "=" in body:
+        return dict(parse_qsl(body, keep_blank_values=True)), True
+    return None, False
+
+
+class AreaRequestTemplate:
+    """
+    The recorded request that created an area, with the category and
+    subcategory fields located so other areas can be sent the same way.
+    """
+
+    def __init__(self, method, url, headers, fields, category_key, subcategory_key, form=False):
+        self.method = method
+        self.url = url
+        self.headers = {name: value for name, value in headers.items()
+                        if name.lower() not in DROPPED_HEADERS and not name.startswith(":")}
+        self.fields = fields
+        self.category_key = category_key
+        self.subcategory_key = subcategory_key
+        self.form = form
+
+    @classmethod
+    def from_requests(cls, requests, category_name, subcategory):
+        """
+        Pick the request whose body carried this category and subcategory; raises LookupError
+        """
+        for request in requests:
+            if not request['body']:
+                continue
+            fields, form = _parse_body(request['body'])
+            if not fields:
+                continue
+            category_key = next((key for key, value in fields.items() if value == category_name), None)
+            subcategory_key = next((key for key, value in fields.items() if value == subcategory), None)
+            if category_key and subcategory_key:
+                return cls(request['method'], request['url'], request['headers'], fields,
+                           category_key, subcategory_key, form)
+        raise LookupError(f"None of the {len(requests)} recorded requests carried "
+                          f"'{category_name}' / '{subcategory}'")
+
+    def render(self, category_name, subcategory):
+        """
+        Request body (bytes) for another area
+        """
+        fields = dict(self.fields)
+        fields[self.category_key] = category_name
+        fields[self.subcategory_key] = subcategory
+        body = urlencode(fields) if self.form else json.dumps(fields)
+        return body.encode('utf-8')
+
+    def describe(self):
+        return {"method": self.method, "url": self.url, "form": self.form,
+                "category_key": self.category_key, "subcategory_key": self.subcategory_key}
+
+
+# Methods that may be sent again after a dropped connection without doing the work twice
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP(S) connections to one host, shared by the replay threads
+    """
+
+    def __init__(self, url, timeout=30):
+        parts = urlsplit(url)
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port
+        self.timeout = timeout
+        self.connections_opened = 0
+        self._idle = queue.LifoQueue()
+
+    def _connect(self):
+        self.connections_opened += 1
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def request(self, method, url, body=None, headers=None):
+        """
+        Send one request; returns (status, response body)
+        """
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        try:
+            connection, reused = self._idle.get_nowait(), True
+        except queue.Empty:
+            connection, reused = self._connect(), False
+        try:
+            try:
+                connection.request(method, path, body=body, headers=headers or {})
+                response = connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                # Usually the server dropped an idle keep-alive connection before reading the
+                # request, but it may have handled it first: an add-area POST is not resent,
+                # it is reported as failed and left to a check of the area table (--resume)
+                if not reused or method.upper() not in IDEMPOTENT_METHODS:
+                    raise
+                connection = self._connect()
+                connection.request(method, path, body=body, headers=headers or {})
+                response = connection.getresponse()
+            data = response.read()
+        except Exception:
+            # A connection in an unknown state (timeout, half-read response) must not go back to the pool
+            connection.close()
+            raise
+        if response.will_close:
+            connection.close()
+        else:
+            self._idle.put(connection)
+        return response.status, data
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def replay_areas(template, areas, cookie_header="", concurrency=4, journal=None, code_value=None):
+    """
+    Create areas by sending the template request directly, concurrency at a time.
+
+    Areas are numbered by the server in completion order, not catalog order.
+
+    Returns:
+        tuple: (added, failed) lists of (category, subcategory); failed entries carry the reason.
+    """
+    pool = ConnectionPool(template.url)
+    headers = dict(template.headers)
+    if cookie_header:
+        headers["Cookie"] = cookie_header
+
+    def send(area):
+        category_name, subcategory = area
+        try:
+            status, data = pool.request(template.method, template.url,
+                                        template.render(category_name, subcategory), headers)
+            error = None if 200 <= status < 300 else f"HTTP {status}: {data[:200].decode('utf-8', 'replace')}"
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+            error = f"connection lost, the area may have been added: {e}"
+        except (OSError, http.client.HTTPException) as e:
+            error = str(e)
+        if journal:
+            journal.record(code_value, category_name, subcategory, FAILED if error else ADDED,
+                           replay=True, **({"error": error} if error else {}))
+        return area, error
+
+    added, failed = [], []
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for area, error in executor.map(send, areas):
+                if error:
+                    failed.append(area + (error,))
+                else:
+                    added.append(area)
+    finally:
+        pool.close()
+    return added, failed
+
+
+def replay_code(code_value, catalog, url=APP_URL, concurrency=4, journal=None, headless=True):
+    """
+    Add the first area through the UI while recording, then replay the rest over HTTP.
+
+    Returns:
+        dict: 'code', 'total', 'success', 'errors', 'elapsed', the request
+              template used ('template') and the replay failures ('failed').
+    """
+    catalog = load_catalog(catalog)
+    areas = [(category, sub) for category, subs in catalog['categories'].items() for sub in subs or []]
+    journal = ProgressJournal(journal) if journal else None
+    result = {"code": code_value, "total": len(areas), "success": 0, "errors": 0, "elapsed": 0.0,
+              "template": None, "failed": []}
+    if not areas:
+        return result
+
+    driver, _ = launch_driver(DriverConfig(headless=headless, performance_log=True))
+    try:
+        start_application(driver, url)
+        select_code(driver, code_value)
+        open_interior_lighting(driver)
+
+        started = time.time()
+        network_requests(driver)  # drop everything logged while bootstrapping
+        category_name, subcategory = areas[0]
+        add_area(driver, category_name, subcategory)
+        if journal:
+            journal.record(code_value, category_name, subcategory, ADDED)
+        template = AreaRequestTemplate.from_requests(network_requests(driver), category_name, subcategory)
+        result['template'] = template.describe()
+        print(f"✓ Recorded {template.method} {template.url} "
+              f"({template.category_key}, {template.subcategory_key})")
+
+        cookies = "; ".join(f"{cookie['name']}={cookie['value']}" for cookie in driver.get_cookies())
+        added, failed = replay_areas(template, areas[1:], cookies, concurrency, journal, code_value)
+        result['elapsed'] = time.time() - started
+        result['success'] = 1 + len(added)
+        result['errors'] = len(failed)
+        result['failed'] = [{"category": c, "subcategory": s, "error": e} for c, s, e in failed]
+    finally:
+        driver.quit()
+    return result
+
+
+def standin_project_counts(server, template_url):
+    """
+    Areas the stand-in server stored for the replayed project, as {(category, subcategory): n}
+    """
+    project_id = urlsplit(template_url).path.rstrip("/").split("/")[-2]
+    project = server.RequestHandlerClass.state.projects.get(project_id, {"areas": []})
+    counts = {}
+    for area in project['areas']:
+        key = (area['category'], area['subcategory'])
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def main(argv=None):
+    """
+    Command line entry point: replay one code against the stand-in server or a live URL
+    """
+    parser = argparse.ArgumentParser(description="Populate a code by replaying its area API call.")
+    parser.add_argument("code", help="code value from all_codes.json (e.g. CEZ_IECC2015)")
+    parser.add_argument("--catalog", help="catalog JSON path (default: <code>_areas_catalog.json)")
+    parser.add_argument("--url", help="landing page (default: local stand-in server)")
+    parser.add_argument("--latency", type=float, default=0.05, help="stand-in server latency (s)")
+    parser.add_argument("--concurrency", type=int, default=4, help="requests in flight")
+    parser.add_argument("--journal", help="progress journal (JSONL)")
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    args = parser.parse_args(argv)
+
+    try:
+        code = find_code(args.code)
+    except ValueError as e:
+        parser.error(str(e))
+    catalog = load_catalog(args.catalog or catalog_path_for(code['value']))
+
+    server = None
+    url = args.url
+    if not url:
+        server, url = serve_in_thread(latency=args.latency)
+        print(f"🧪 Using stand-in server at {url} (latency {args.latency}s)")
+
+    try:
+        result = replay_code(code['value'], catalog, url, args.concurrency, args.journal,
+                             headless=not args.headed)
+        print(f"\n📊 {code['text']}: {result['success']}/{result['total']} areas "
+              f"in {result['elapsed']:.1f}s ({result['errors']} errors)")
+        for failure in result['failed'][:10]:
+            print(f"   ❌ {failure['category']} - {failure['subcategory']}: {failure['error']}")
+
+        if server and result['template']:
+            stored = standin_project_counts(server, result['template']['url'])
+            expected = count_combinations(catalog['categories'])
+            duplicates = sum(n - 1 for n in stored.values() if n > 1)
+            ok = sum(stored.values()) == expected and not duplicates
+            print(f"{'✅' if ok else '❌'} Stand-in project holds {sum(stored.values())}/{expected} areas"
+                  f" ({duplicates} duplicates)")
+            if not ok:
+                return 1
+    finally:
+        if server:
+            server.shutdown()
+    return 0 if result['errors'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,670 @@
+#!/usr/bin/env python3
+"""
+Job Service
+Goal: A long-running daemon that queues population and discovery jobs in SQLite and runs them on leased browser workers
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import signal
+import sqlite3
+import argparse
+import threading
+import http.client
+from urllib.parse import urlparse, parse_qs, urlsplit
+from socketserver import ThreadingMixIn, UnixStreamServer
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from code_catalogs import BASE_DIR, find_code, catalog_path_for, read_spec_file
+from catalog_store import CatalogStore, DEFAULT_STORE
+from progress_journal import DEFAULT_JOURNAL
+
+DEFAULT_QUEUE = os.path.join(BASE_DIR, "jobs.sqlite3")
+DEFAULT_ADDRESS = "http://127.0.0.1:8790"
+DEFAULT_LEASE = 120  # seconds a leased job stays with a worker without a heartbeat
+
+JOB_KINDS = ("populate", "plan", "discover")
+
+# Payload key each job kind can't run without
+REQUIRED_PAYLOAD = {"populate": "code", "plan": "spec", "discover": "codes"}
+
+# Job states
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    worker TEXT,
+    lease_expires REAL,
+    submitted REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs(status, priority DESC, id);
+CREATE INDEX IF NOT EXISTS jobs_lease ON jobs(status, lease_expires);
+"""
+
+JOB_COLUMNS = ("id", "kind", "payload", "priority", "status", "attempts", "max_attempts", "worker",
+               "lease_expires", "submitted", "started", "finished", "result", "error")
+
+
+def check_payload(kind, payload):
+    """
+    Raise ValueError for a payload the job's worker could not run, so it is refused at submit time
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("payload must be a JSON object")
+    key = REQUIRED_PAYLOAD[kind]
+    if not payload.get(key):
+        raise ValueError(f"{kind} jobs need '{key}' in their payload")
+    if kind == "populate":
+        if not isinstance(payload['code'], str):
+            raise ValueError("'code' must be a code value")
+        find_code(payload['code'])
+    elif kind == "plan":
+        if not isinstance(payload['spec'], (dict, list, str)):
+            raise ValueError("'spec' must be a plan or a plan file path")
+    else:
+        if not isinstance(payload['codes'], list) or not all(isinstance(value, str) for value in payload['codes']):
+            raise ValueError("'codes' must be a list of code values")
+        for code_value in payload['codes']:
+            find_code(code_value)
+
+
+class JobQueue:
+    """
+    Priority queue of jobs in one SQLite file, shared by the API and any number of workers.
+
+    Higher priority runs first, then submission order. A worker leases a job
+    for `seconds` and must heartbeat before the lease runs out; a job whose
+    lease expires goes back to the queue (or fails once it has used up its
+    attempts), so a worker that dies takes nothing with it. Leasing runs in
+    a write transaction, so two workers never get the same job. Connections
+    are per thread, as in CatalogStore.
+    """
+
+    def __init__(self, path=DEFAULT_QUEUE):
+        self.path = path
+        self._local = threading.local()
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Autocommit; writes that must be atomic open their own transaction
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    def _write(self, statements):
+        """
+        Run [(sql, params)] in one IMMEDIATE transaction; returns the cursors
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            cursors = [connection.execute(sql, params) for sql, params in statements]
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return cursors
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    @staticmethod
+    def _job(row):
+        if row is None:
+            return None
+        job = dict(zip(JOB_COLUMNS, row))
+        job['payload'] = json.loads(job['payload'])
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def submit(self, kind, payload, priority=0, max_attempts=3):
+        """
+        Queue a job; returns its id
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind '{kind}' (expected one of: {', '.join(JOB_KINDS)})")
+        check_payload(kind, payload)
+        cursor, = self._write([(
+            "INSERT INTO jobs (kind, payload, priority, max_attempts, submitted) VALUES (?, ?, ?, ?, ?)",
+            (kind, json.dumps(payload), int(priority), int(max_attempts), time.time()),
+        )])
+        return cursor.lastrowid
+
+    def _expire(self, now):
+        return [
+            ("UPDATE jobs SET status = ?, finished = ?, error = 'lease expired', worker = NULL "
+             "WHERE status = ? AND lease_expires < ? AND attempts >= max_attempts", (FAILED, now, LEASED, now)),
+            ("UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL "
+             "WHERE status = ? AND lease_expires < ?", (QUEUED, LEASED, now)),
+        ]
+
+    def requeue_expired(self):
+        """
+        Return jobs whose lease ran out to the queue; returns how many were requeued
+        """
+        return self._write(self._expire(time.time()))[1].rowcount
+
+    def lease(self, worker, seconds=DEFAULT_LEASE):
+        """
+        Take the next job for `worker` until now + seconds; None when the queue is empty
+        """
+        now = time.time()
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params in self._expire(now):
+                connection.execute(sql, params)
+            row = connection.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY priority DESC, id LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is not None:
+                connection.execute(
+                    "UPDATE jobs SET status = ?, worker = ?, lease_expires = ?, attempts = attempts + 1, "
+                    "started = ? WHERE id = ?", (LEASED, worker, now + seconds, now, row[0]),
+                )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return self.get(row[0]) if row is not None else None
+
+    def heartbeat(self, job_id, worker, seconds=DEFAULT_LEASE):
+        """
+        Extend a lease; False when the worker no longer holds it
+        """
+        cursor, = self._write([(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = ? AND worker = ?",
+            (time.time() + seconds, job_id, LEASED, worker),
+        )])
+        return cursor.rowcount == 1
+
+    def finish(self, job_id, worker, result=None, error=None):
+        """
+        Record a leased job's outcome; False (and nothing recorded) when the lease was lost
+        """
+        cursor, = self._write([(
+            "UPDATE jobs SET status = ?, finished = ?, result = ?, error = ?, lease_expires = NULL "
+            "WHERE id = ? AND status = ? AND worker = ?",
+            (FAILED if error else DONE, time.time(), json.dumps(result) if result is not None else None,
+             error, job_id, LEASED, worker),
+        )])
+        return cursor.rowcount == 1
+
+    def release(self, job_id, worker):
+        """
+        Hand a leased job back to the queue untried (a worker shutting down)
+        """
+        cursor, = self._write([(
+            "UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL, attempts = attempts - 1 "
+            "WHERE id = ? AND status = ? AND worker = ?", (QUEUED, job_id, LEASED, worker),
+        )])
+        return cursor.rowcount == 1
+
+    def cancel(self, job_id):
+        """
+        Drop a job that has not been leased yet
+        """
+        cursor, = self._write([(
+            "UPDATE jobs SET status = ?, finished = ? WHERE id = ? AND status = ?",
+            (CANCELLED, time.time(), job_id, QUEUED),
+        )])
+        return cursor.rowcount == 1
+
+    def get(self, job_id):
+        row = self._connection().execute(
+            f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return self._job(row)
+
+    def jobs(self, status=None, limit=100):
+        """
+        Most recent jobs first, optionally only those in one state
+        """
+        where, params = ("WHERE status = ?", [status]) if status else ("", [])
+        rows = self._connection().execute(
+            f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs {where} ORDER BY id DESC LIMIT ?", params + [int(limit)]
+        )
+        return [self._job(row) for row in rows]
+
+    def counts(self):
+        """
+        {state: number of jobs}
+        """
+        return dict(self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+
+
+def compact_result(result):
+    """
+    A populate() result without the per-area timings, for storing with the job
+    """
+    return {key: value for key, value in result.items() if key != 'area_seconds'}
+
+
+class JobWorker:
+    """
+    One browser worker: leases jobs, keeps them alive with heartbeats and records the outcome.
+
+    The worker's WarmSession survives from job to job, so only the first job
+    pays the browser startup. Heartbeats run on a side thread every third of
+    the lease; if the lease is lost anyway (the daemon was paused, say) the
+    job's outcome is dropped, since the job has been handed out again.
+    """
+
+    def __init__(self, queue, name, url=None, headless=True, lease_seconds=DEFAULT_LEASE, store=None,
+                 journal=DEFAULT_JOURNAL):
+        self.queue = queue
+        self.name = name
+        self.url = url
+        self.headless = headless
+        self.lease_seconds = lease_seconds
+        self.store = store
+        self.journal = journal
+        self.session = None
+        self.stopping = threading.Event()
+        self.current = None
+        self.completed = 0
+
+    def _session(self):
+        if self.session is None:
+            # The population engine pulls in selenium; the queue and API do not need it
+            from comcheck_engine import APP_URL, WarmSession
+            from driver_factory import DriverConfig
+            self.session = WarmSession(self.url or APP_URL,
+                                       DriverConfig() if self.headless else DriverConfig.interactive())
+        return self.session
+
+    def _catalog_store(self):
+        return CatalogStore(self.store, readonly=True) if self.store and os.path.exists(self.store) else None
+
+    def run_populate(self, payload):
+        from comcheck_engine import populate, run_ok
+        code = find_code(payload['code'])
+        catalog = payload.get('catalog')
+        if catalog is None:
+            store = self._catalog_store()
+            catalog = store.catalog(code['value']) if store and store.has(code['value']) \
+                else catalog_path_for(code['value'])
+        result = populate(code['value'], catalog, batch=payload.get('batch', False), journal=self.journal,
+                          session=self._session(), verify=payload.get('verify', True))
+        result['status'] = 'ok' if run_ok(result) else 'failed'
+        return compact_result(result)
+
+    def run_plan(self, payload):
+        from plan_compiler import compile_plan, plan_catalogs
+        from comcheck_engine import populate, run_ok
+        spec = payload['spec']
+        if isinstance(spec, str):
+            spec = read_spec_file(spec)
+        store = self._catalog_store()
+        if store is None:
+            raise RuntimeError(f"Plan jobs need a catalog store ({self.store or DEFAULT_STORE})")
+        steps, problems = compile_plan(spec, store, payload.get('code'))
+        if problems:
+            raise ValueError("; ".join(problems))
+        results = {}
+        for code_value, catalog in plan_catalogs(steps).items():
+            result = populate(code_value, catalog, batch=payload.get('batch', False), journal=self.journal,
+                              session=self._session())
+            result['status'] = 'ok' if run_ok(result) else 'failed'
+            results[code_value] = compact_result(result)
+        return {"steps": len(steps), "codes": results,
+                "status": 'ok' if all(r['status'] == 'ok' for r in results.values()) else 'failed'}
+
+    def run_discover(self, payload):
+        from catalog_discovery import discover_code, write_catalog, discovered_path_for
+        store = CatalogStore(self.store) if self.store else None
+        session = self._session()
+        written = {}
+        for code_value in payload['codes']:
+            code = find_code(code_value)
+            if session.driver is None:
+                session.start()
+            catalog, dropped = discover_code(session.driver, code)
+            path = catalog_path_for(code['value']) if payload.get('force') else discovered_path_for(code['value'])
+            write_catalog(catalog, path)
+            if store is not None:
+                store.import_catalog(code['value'], catalog)
+            written[code['value']] = {"path": path, "areas": catalog['total_subcategories'], "dropped": dropped}
+        return {"catalogs": written, "status": 'ok'}
+
+    def execute(self, job):
+        return getattr(self, f"run_{job['kind']}")(job['payload'])
+
+    def _heartbeat(self, job, done, lost):
+        while not done.wait(self.lease_seconds / 3):
+            if not self.queue.heartbeat(job['id'], self.name, self.lease_seconds):
+                lost.set()
+                return
+
+    def process(self, job):
+        """
+        Run one leased job to completion, heartbeating while it runs.
+
+        A job that raises is recorded as failed, which uses up one of its
+        attempts. Only an interrupted worker (KeyboardInterrupt, SystemExit)
+        hands the job back with its attempt refunded.
+        """
+        self.current = job['id']
+        done, lost = threading.Event(), threading.Event()
+        beats = threading.Thread(target=self._heartbeat, args=(job, done, lost), daemon=True)
+        beats.start()
+        print(f"🛠️  [{self.name}] job {job['id']} ({job['kind']}, attempt {job['attempts']})")
+        result, error, interrupted = None, None, False
+        try:
+            result = self.execute(job)
+            if result.get('status') == 'failed' or result.get('fatal'):
+                error = result.get('fatal') or "job finished with failures"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        except BaseException:
+            interrupted = True
+            raise
+        finally:
+            done.set()
+            beats.join()
+            self.current = None
+            if interrupted:
+                self.queue.release(job['id'], self.name)
+                print(f"↩️  [{self.name}] job {job['id']} handed back (interrupted)")
+        if lost.is_set() or not self.queue.finish(job['id'], self.name, result, error):
+            print(f"⚠️  [{self.name}] lost the lease on job {job['id']}; its outcome was dropped")
+        else:
+            self.completed += 1
+            print(f"{'❌' if error else '✅'} [{self.name}] job {job['id']}" + (f": {error}" if error else ""))
+
+    def run(self, idle_sleep=2.0):
+        """
+        Lease and run jobs until stop() is called
+        """
+        try:
+            while not self.stopping.is_set():
+                job = self.queue.lease(self.name, self.lease_seconds)
+                if job is None:
+                    self.stopping.wait(idle_sleep)
+                    continue
+                self.process(job)
+        finally:
+            self.close()
+
+    def stop(self):
+        self.stopping.set()
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+        self.queue.close()
+
+
+class JobHandler(BaseHTTPRequestHandler):
+    """
+    JSON API: GET /jobs, GET /jobs/<id>, POST /jobs, POST /jobs/<id>/cancel, GET /health
+    """
+    queue = None    # set by make_server
+    workers = ()
+    verbose = False
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+    def address_string(self):
+        # Unix socket clients have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def _json(self, status, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _route(self):
+        return [part for part in urlparse(self.path).path.split("/") if part]
+
+    def do_GET(self):
+        route = self._route()
+        query = parse_qs(urlparse(self.path).query)
+        if route == ["health"]:
+            return self._json(200, {
+                "jobs": self.queue.counts(),
+                "workers": [{"name": worker.name, "job": worker.current, "completed": worker.completed}
+                            for worker in self.workers],
+            })
+        if route == ["jobs"]:
+            limit = query.get("limit", ["100"])[0]
+            if not limit.isdigit():
+                return self._json(400, {"error": f"limit must be a whole number, not {limit!r}"})
+            return self._json(200, self.queue.jobs(query.get("status", [None])[0], int(limit)))
+        if len(route) == 2 and route[0] == "jobs" and route[1].isdigit():
+            job = self.queue.get(int(route[1]))
+            return self._json(200, job) if job else self._json(404, {"error": "no such job"})
+        self._json(404, {"error": "not found"})
+
+    def do_POST(self):
+        route = self._route()
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._json(400, {"error": "invalid JSON"})
+        if route == ["jobs"]:
+            if not isinstance(body, dict):
+                return self._json(400, {"error": "the request body must be a JSON object"})
+            try:
+                job_id = self.queue.submit(body.get("kind"), body.get("payload", {}),
+                                           body.get("priority", 0), body.get("max_attempts", 3))
+            except (TypeError, ValueError) as e:
+                return self._json(400, {"error": str(e)})
+            return self._json(201, {"id": job_id})
+        if len(route) == 3 and route[0] == "jobs" and route[1].isdigit() and route[2] == "cancel":
+            if self.queue.cancel(int(route[1])):
+                return self._json(200, {"id": int(route[1]), "status": CANCELLED})
+            return self._json(409, {"error": "only queued jobs can be cancelled"})
+        self._json(404, {"error": "not found"})
+
+
+class ThreadingUnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(queue, address=DEFAULT_ADDRESS, workers=(), verbose=False):
+    """
+    API server on http://host:port or, for any other address, a Unix socket at that path
+    """
+    handler = type("BoundJobHandler", (JobHandler,), {"queue": queue, "workers": workers, "verbose": verbose})
+    if address.startswith("http://"):
+        parts = urlsplit(address)
+        server = ThreadingHTTPServer((parts.hostname, parts.port), handler)
+        server.daemon_threads = True
+        return server
+    if os.path.exists(address):
+        os.unlink(address)
+    return ThreadingUnixHTTPServer(address, handler)
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=30):
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+def call(address, method, path, payload=None):
+    """
+    One request to the job service's API; returns (status, decoded JSON)
+    """
+    if address.startswith("http://"):
+        parts = urlsplit(address)
+        connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+    else:
+        connection = UnixHTTPConnection(address)
+    try:
+        body = json.dumps(payload) if payload is not None else None
+        connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read() or b"null")
+    finally:
+        connection.close()
+
+
+def serve(queue_path=DEFAULT_QUEUE, address=DEFAULT_ADDRESS, workers=1, url=None, headless=True,
+          store=DEFAULT_STORE, lease_seconds=DEFAULT_LEASE, verbose=False):
+    """
+    Run the API and `workers` browser workers until interrupted
+    """
+    queue = JobQueue(queue_path)
+    requeued = queue.requeue_expired()
+    pool = [JobWorker(JobQueue(queue_path), f"{socket.gethostname()}:{os.getpid()}:w{number}", url=url,
+                      headless=headless, lease_seconds=lease_seconds, store=store)
+            for number in range(1, workers + 1)]
+    server = make_server(queue, address, pool, verbose)
+    threads = [threading.Thread(target=worker.run, name=worker.name) for worker in pool]
+    for thread in threads:
+        thread.start()
+    print(f"🗂️  Job service on {address}: {workers} worker(s), queue {queue_path}"
+          + (f", {requeued} expired lease(s) requeued" if requeued else ""))
+    signal.signal(signal.SIGTERM, lambda *_: server.shutdown())
+    serving = threading.Thread(target=server.serve_forever)
+    serving.start()
+    try:
+        while serving.is_alive():
+            serving.join(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+    finally:
+        print("\n⛔ Stopping: workers finish their current job first...")
+        for worker in pool:
+            worker.stop()
+        for thread in threads:
+            thread.join()
+        server.server_close()
+        if not address.startswith("http://") and os.path.exists(address):
+            os.unlink(address)
+        queue.close()
+
+
+def main(argv=None):
+    """
+    Command line entry point: run the daemon or a standalone worker, or talk to a running daemon
+    """
+    parser = argparse.ArgumentParser(description="Queue and run COMcheck population and discovery jobs.")
+    parser.add_argument("--address", default=DEFAULT_ADDRESS, help="API as http://host:port or a Unix socket path")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="run the API and browser workers")
+    worker_parser = commands.add_parser("worker", help="run a browser worker on the queue file only")
+    for command in (serve_parser, worker_parser):
+        command.add_argument("--queue", default=DEFAULT_QUEUE, help="SQLite job queue")
+        command.add_argument("--url", help="COMcheck-Web landing page")
+        command.add_argument("--headed", action="store_true", help="show the browser windows")
+        command.add_argument("--store", default=DEFAULT_STORE, help="SQLite catalog store for plans and discovery")
+        command.add_argument("--lease", type=float, default=DEFAULT_LEASE, help="lease length in seconds")
+    serve_parser.add_argument("--workers", type=int, default=1, help="browser workers in the daemon (0: API only)")
+    serve_parser.add_argument("--verbose", action="store_true", help="log every API request")
+
+    submit_parser = commands.add_parser("submit", help="queue a job")
+    submit_parser.add_argument("kind", choices=JOB_KINDS)
+    submit_parser.add_argument("codes", nargs="*", help="code value (populate; plan default) or codes (discover)")
+    submit_parser.add_argument("--catalog", help="catalog JSON path (populate)")
+    submit_parser.add_argument("--spec", help="YAML/JSON plan spec (plan); read here, sent with the job")
+    submit_parser.add_argument("--batch", action="store_true", help="add each category in one in-page pass")
+    submit_parser.add_argument("--force", action="store_true",
+                               help="let discovery overwrite the catalogs the engine reads (discover)")
+    submit_parser.add_argument("--priority", type=int, default=0, help="higher runs first")
+    list_parser = commands.add_parser("list", help="list jobs")
+    list_parser.add_argument("--status", choices=(QUEUED, LEASED, DONE, FAILED, CANCELLED))
+    show_parser = commands.add_parser("show", help="print one job")
+    show_parser.add_argument("id", type=int)
+    cancel_parser = commands.add_parser("cancel", help="cancel a queued job")
+    cancel_parser.add_argument("id", type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.queue, args.address, args.workers, args.url, not args.headed, args.store, args.lease,
+              args.verbose)
+        return 0
+    if args.command == "worker":
+        worker = JobWorker(JobQueue(args.queue), f"{socket.gethostname()}:{os.getpid()}", url=args.url,
+                           headless=not args.headed, lease_seconds=args.lease, store=args.store)
+        signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+        print(f"🛠️  Worker {worker.name} on {args.queue}")
+        try:
+            worker.run()
+        except KeyboardInterrupt:
+            worker.stop()
+        return 0
+
+    try:
+        if args.command == "submit":
+            if args.kind == "populate":
+                if len(args.codes) != 1:
+                    parser.error("populate takes exactly one code")
+                payload = {"code": args.codes[0], "batch": args.batch}
+                if args.catalog:
+                    payload['catalog'] = os.path.abspath(args.catalog)
+            elif args.kind == "plan":
+                if not args.spec:
+                    parser.error("plan jobs need --spec")
+                payload = {"spec": read_spec_file(args.spec), "batch": args.batch}
+                if args.codes:
+                    payload['code'] = args.codes[0]
+            else:
+                if not args.codes:
+                    parser.error("discover takes one or more codes")
+                payload = {"codes": args.codes, "force": args.force}
+            status, reply = call(args.address, "POST", "/jobs",
+                                 {"kind": args.kind, "payload": payload, "priority": args.priority})
+            if status != 201:
+                print(f"❌ {reply['error']}")
+                return 1
+            print(f"📥 Queued job {reply['id']}")
+        elif args.command == "list":
+            status, jobs = call(args.address, "GET", "/jobs" + (f"?status={args.status}" if args.status else ""))
+            for job in jobs:
+                target = job['payload'].get('code') or ", ".join(job['payload'].get('codes', [])) or "-"
+                print(f"  {job['id']:>5} {job['status']:<9} p{job['priority']:<3} {job['kind']:<9} {target}"
+                      + (f"  ({job['error']})" if job['error'] else ""))
+        elif args.command == "show":
+            status, job = call(args.address, "GET", f"/jobs/{args.id}")
+            print(json.dumps(job, indent=2))
+        else:
+            status, reply = call(args.address, "POST", f"/jobs/{args.id}/cancel")
+            print(f"🚫 Cancelled job {args.id}" if status == 200 else f"❌ {reply['error']}")
+    except OSError as e:
+        print(f"❌ No job service at {args.address}: {e}")
+        return 1
+    return 0 if status < 300 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Live Metrics
+Goal: Counters, gauges and latency histograms for runs and sweeps, served as Prometheus text and dumped to JSON
+"""
+
+import json
+import time
+import threading
+from contextlib import contextmanager
+from multiprocessing.managers import BaseManager
+from urllib.parse import urlparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Upper bounds (s) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+DEFAULT_METRICS_PORT = 9464
+
+# name: (type, help)
+METRIC_HELP = {
+    "comcheck_areas_added_total": ("counter", "Areas added to a project, per code"),
+    "comcheck_areas_failed_total": ("counter", "Area adds that failed, per code and failure class"),
+    "comcheck_area_seconds": ("histogram", "Wall-clock time per added area, per code"),
+    "comcheck_step_seconds": ("histogram", "Latency of each add-area step"),
+    "comcheck_active_workers": ("gauge", "Workers populating a code right now"),
+    "comcheck_browser_restarts_total": ("counter", "Browsers restarted mid-session, per reason"),
+    "comcheck_codes_finished_total": ("counter", "Codes finished, per status"),
+    "comcheck_governor_limit": ("gauge", "Adds in flight the rate governor allows"),
+    "comcheck_uptime_seconds": ("gauge", "Seconds since the registry was created"),
+}
+
+
+def _labels_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Metrics:
+    """
+    Thread-safe registry of labelled counters, gauges and histograms.
+
+    Metrics are created on first use; their labels are plain keyword
+    arguments (code=..., step=...). render() gives the Prometheus text
+    exposition format and snapshot() the same numbers as a dict. Sweep
+    workers share one registry through a MetricsManager.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.started = time.time()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            key = _labels_key(labels)
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self.gauges.setdefault(name, {})[_labels_key(labels)] = value
+
+    def add(self, name, value, **labels):
+        """
+        Move a gauge up or down
+        """
+        with self._lock:
+            series = self.gauges.setdefault(name, {})
+            key = _labels_key(labels)
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name, seconds, times=1, **labels):
+        """
+        Record `times` samples of `seconds` in a histogram
+        """
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            key = _labels_key(labels)
+            histogram = series.setdefault(key, {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0})
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram['buckets'][index] += times
+                    break
+            histogram['sum'] += seconds * times
+            histogram['count'] += times
+
+    def render(self):
+        """
+        All metrics in the Prometheus text exposition format
+        """
+        lines = []
+
+        def header(name, kind):
+            lines.append(f"# HELP {name} {METRIC_HELP.get(name, (kind, name))[1]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            for kind, family in (("counter", self.counters), ("gauge", self.gauges)):
+                for name, series in sorted(family.items()):
+                    header(name, kind)
+                    lines.extend(f"{name}{_format_labels(key)} {value}" for key, value in sorted(series.items()))
+            for name, series in sorted(self.histograms.items()):
+                header(name, "histogram")
+                for key, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(self.buckets, histogram['buckets']):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(key, [('le', str(bound))])} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(key, [('le', '+Inf')])} {histogram['count']}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram['sum']}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram['count']}")
+        header("comcheck_uptime_seconds", "gauge")
+        lines.append(f"comcheck_uptime_seconds {time.time() - self.started:.1f}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """
+        {'counters'|'gauges'|'histograms': {name: [{'labels', value or histogram}]}} for JSON
+        """
+        def entries(family, convert):
+            return {name: [dict(labels=dict(key), **convert(value)) for key, value in sorted(series.items())]
+                    for name, series in sorted(family.items())}
+
+        with self._lock:
+            return {
+                "started": self.started,
+                "elapsed": time.time() - self.started,
+                "buckets": list(self.buckets),
+                "counters": entries(self.counters, lambda value: {"value": value}),
+                "gauges": entries(self.gauges, lambda value: {"value": value}),
+                "histograms": entries(self.histograms, lambda histogram: {
+                    "buckets": list(histogram['buckets']), "sum": histogram['sum'], "count": histogram['count'],
+                }),
+            }
+
+    def write_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+
+class NullMetrics:
+    """
+    Stand-in used when nobody is collecting metrics
+    """
+
+    def inc(self, name, value=1, **labels):
+        pass
+
+    def set(self, name, value, **labels):
+        pass
+
+    def add(self, name, value, **labels):
+        pass
+
+    def observe(self, name, seconds, times=1, **labels):
+        pass
+
+
+NULL_METRICS = NullMetrics()
+
+
+class MeteredTimer:
+    """
+    Wraps a step timer so every step's duration also lands in comcheck_step_seconds
+    """
+
+    def __init__(self, timer, metrics):
+        self.timer = timer
+        self.metrics = metrics
+
+    @contextmanager
+    def step(self, name):
+        started = time.perf_counter()
+        try:
+            with self.timer.step(name):
+                yield
+        finally:
+            self.metrics.observe("comcheck_step_seconds", time.perf_counter() - started, step=name)
+
+    def tagged(self, **tags):
+        return self.timer.tagged(**tags)
+
+
+def metered(timer, metrics):
+    """
+    timer, with step latencies also sent to metrics when they are being collected
+    """
+    return timer if metrics is NULL_METRICS else MeteredTimer(timer, metrics)
+
+
+class MetricsManager(BaseManager):
+    """
+    Serves one Metrics registry to the sweep's worker processes
+    """
+
+
+MetricsManager.register("Metrics", Metrics)
+
+
+def shared_metrics(**options):
+    """
+    Start a manager process holding a Metrics registry; returns (manager, metrics proxy)
+    """
+    manager = MetricsManager()
+    manager.start()
+    return manager, manager.Metrics(**options)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """
+    GET /metrics (Prometheus text) and GET /metrics.json
+    """
+    metrics = None  # set by serve_metrics
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/metrics":
+            body, content_type = self.metrics.render(), "text/plain; version=0.0.4; charset=utf-8"
+        elif path == "/metrics.json":
+            body, content_type = json.dumps(self.metrics.snapshot()), "application/json"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def serve_metrics(metrics, port=DEFAULT_METRICS_PORT, host="127.0.0.1"):
+    """
+    Serve the registry on a background thread; returns the server (call shutdown() when done)
+    """
+    handler = type("BoundMetricsHandler", (MetricsHandler,), {"metrics": metrics})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"📈 Metrics on http://{host}:{server.server_address[1]}/metrics")
+    return server
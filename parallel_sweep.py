@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Parallel Multi-Code Sweep
+Goal: Spread every code in all_codes.json over a pool of headless browser workers
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.util import Finalize
+
+from code_catalogs import CODES_FILE, load_codes, catalog_path_for
+from comcheck_engine import APP_URL, WarmSession, populate, run_ok
+from driver_factory import DriverConfig, browser_rss_mb, session_alive
+from browser_recycling import RecyclePolicy, DEFAULT_MAX_RSS_MB
+from progress_journal import DEFAULT_JOURNAL
+from catalog_store import CatalogStore
+from rate_governor import shared_governor, report as report_governor
+from grid_nodes import load_nodes, shared_pool, report as report_nodes
+from metrics import DEFAULT_METRICS_PORT, shared_metrics, serve_metrics
+
+
+def default_workers():
+    """
+    One browser per core, leaving a core for the scheduler and the OS
+    """
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+# One warm browser per worker process, reused for every code the worker runs
+_worker_session = None
+# The remote node (name) this worker's browser runs on, when sweeping over a grid
+_worker_node = None
+# Read-only catalog store connections, one per worker process and store path
+_worker_stores = {}
+# Exit handler closing this worker's browser, registered with the first session
+_worker_finalizer = None
+
+
+def _close_worker_session(nodes=None, ok=True, error=None):
+    global _worker_session, _worker_node
+    if _worker_session is not None:
+        _worker_session.close()
+    if nodes is not None and _worker_node is not None:
+        nodes.release(_worker_node, ok, error)
+    _worker_session = _worker_node = None
+
+
+def worker_session(url, nodes=None, avoid=None):
+    """
+    This worker's WarmSession, created on first use and closed when the worker exits.
+
+    With nodes (a proxy to the sweep's NodePool) the browser is a remote one
+    on a node slot this worker holds until its session is closed, preferably
+    not on the node named `avoid`.
+    """
+    global _worker_session, _worker_node, _worker_finalizer
+    if _worker_session is None or _worker_session.url != url:
+        _close_worker_session(nodes)
+        config = DriverConfig()
+        if nodes is not None:
+            slot = nodes.acquire(avoid)
+            if slot is None:
+                raise RuntimeError("No healthy grid node has a free browser slot")
+            _worker_node, config.remote_url = slot
+        _worker_session = WarmSession(url, config, max_rss_mb=DEFAULT_MAX_RSS_MB)
+        if _worker_finalizer is None:
+            # Pool workers leave through os._exit, which skips atexit handlers
+            _worker_finalizer = Finalize(None, _close_worker_session, args=(nodes,), exitpriority=10)
+    return _worker_session
+
+
+def worker_catalog(code_value, store):
+    """
+    A code's catalog read from the SQLite store by this worker
+    """
+    if store not in _worker_stores:
+        _worker_stores[store] = CatalogStore(store, readonly=True)
+    return _worker_stores[store].catalog(code_value)
+
+
+def run_code(code, catalog, url, journal=None, resume=False, store=None, governor=None, nodes=None, metrics=None,
+             recycle=False):
+    """
+    Worker entry point: populate one code in this worker's warm headless browser.
+
+    With a store, catalog is ignored and the code's catalog is read from it.
+    With a governor (a proxy to the sweep's RateGovernor), every add waits
+    for one of its slots. With nodes (a proxy to the sweep's NodePool) the
+    browser runs on a remote node; if it cannot be started there, or its
+    session is lost mid-run, the failure counts against the node and the
+    code moves to another node once.
+    With metrics (a proxy to the sweep's Metrics), the worker's adds, step
+    latencies and browser restarts are counted there. With recycle=True the
+    browser is swapped for a fresh one mid-code when it grows too large or
+    slow (see WarmSession.recycle).
+    """
+    if store:
+        catalog = worker_catalog(code['value'], store)
+    failed_node = None
+    for attempt in range(2 if nodes is not None else 1):
+        session = worker_session(url, nodes, avoid=failed_node)
+        if metrics is not None:
+            session.metrics = metrics
+        result = populate(code['value'], catalog, journal=journal, resume=resume, session=session,
+                          recycle=RecyclePolicy(rss_probe=browser_rss_mb) if recycle else None,
+                          governor=governor, metrics=metrics)
+        if nodes is None or (session.driver is not None and session_alive(session.driver)):
+            break
+        # The browser never came up or its session died: give the slot back as failed and pick another node
+        failed_node = _worker_node
+        _close_worker_session(nodes, ok=False, error=result.get('fatal') or "browser session lost")
+    if _worker_node is not None:
+        result['node'] = _worker_node
+    result['text'] = code['text']
+    result['status'] = 'ok' if run_ok(result) else 'failed'
+    return result
+
+
+def plan_sweep(codes, catalog_for=catalog_path_for, store=None):
+    """
+    Split codes into (code, catalog) jobs and results for codes that have no catalog yet.
+
+    With a store (CatalogStore), a code has a catalog when the store holds one;
+    the job's catalog is then None and workers query the store themselves.
+    """
+    jobs = []
+    skipped = {}
+    for code in codes:
+        if store is not None:
+            catalog, found, where = None, store.has(code['value']), "in the catalog store"
+        else:
+            catalog = catalog_for(code['value'])
+            found, where = os.path.exists(catalog), f"at {catalog}"
+        if found:
+            jobs.append((code, catalog))
+        else:
+            skipped[code['value']] = {
+                "code": code['value'],
+                "text": code['text'],
+                "status": "skipped",
+                "reason": f"no catalog {where}",
+            }
+    return jobs, skipped
+
+
+def sweep(codes, workers=None, url=APP_URL, journal=None, resume=False, store=None, governed=True, nodes=None,
+          metrics_port=None, metrics_json=None, recycle=False):
+    """
+    Populate every code across a pool of worker processes.
+
+    Args:
+        codes (list): Code entries from all_codes.json.
+        workers (int): Number of browser processes (default: cores - 1).
+        url (str): COMcheck-Web landing page.
+        journal (str): Progress journal shared by all workers.
+        resume (bool): Skip areas already in each project.
+        store (str): SQLite catalog store to read catalogs from instead of the JSON files.
+        governed (bool): Share a RateGovernor between the workers, so the number
+            of adds in flight follows what the site can take (see rate_governor).
+        nodes (list): Remote WebDriver nodes ({'url', 'capacity', 'name'}, see
+            grid_nodes.load_nodes) to run the browsers on instead of this
+            machine; workers default to, and are capped at, their healthy capacity.
+        metrics_port (int): Serve live Prometheus metrics for the sweep on this local port.
+        metrics_json (str): Write the sweep's metrics as JSON here when it ends.
+        recycle (bool): Let workers recycle their browser mid-code (see run_code).
+
+    Returns:
+        dict: One result per code value, in all_codes.json order.
+    """
+    node_manager, node_pool = shared_pool(nodes) if nodes else (None, None)
+    if node_pool is not None:
+        state = node_pool.check_all()
+        report_nodes(state)
+        capacity = node_pool.capacity()
+        if not capacity:
+            node_manager.shutdown()
+            raise RuntimeError("No healthy grid nodes to run on")
+        if workers and workers > capacity:
+            print(f"⚠️  {workers} workers requested, but the healthy nodes only have {capacity} browser slots")
+        workers = min(workers or capacity, capacity)
+    workers = workers or default_workers()
+    catalog_store = CatalogStore(store, readonly=True) if store else None
+    jobs, results = plan_sweep(codes, store=catalog_store)
+    print(f"🚀 Sweeping {len(jobs)} codes on {workers} workers ({len(results)} skipped without catalog)")
+    if catalog_store:
+        areas = sum(catalog_store.total_combinations(code['value']) for code, _ in jobs)
+        print(f"📊 {areas} areas to add, from {store}")
+        catalog_store.close()
+
+    manager, governor = shared_governor(workers) if governed and jobs else (None, None)
+    metrics_manager, metrics = shared_metrics() if metrics_port or metrics_json else (None, None)
+    metrics_server = serve_metrics(metrics, metrics_port) if metrics_port else None
+    started = time.time()
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = {
+            executor.submit(run_code, code, catalog, url, journal, resume, store, governor, node_pool, metrics,
+                            recycle): code
+            for code, catalog in jobs
+        }
+        for future in as_completed(futures):
+            code = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"code": code['value'], "text": code['text'], "status": "failed", "fatal": str(e)}
+            results[code['value']] = result
+            if metrics is not None and governor:
+                metrics.set("comcheck_governor_limit", governor.state()['limit'])
+            browser = result.get('browser') or {}
+            print(f"  {'✅' if result['status'] == 'ok' else '❌'} {code['text']}: "
+                  f"{result.get('success', 0)}/{result.get('total', 0)} areas"
+                  + (f" ({'warm switch' if result['session']['warm'] else 'browser start'} "
+                     f"{result['session']['seconds']:.1f}s, "
+                     f"{browser.get('rss_mb_end') or 0:.0f} MB RSS)" if browser else "")
+                  + (f" [limit {governor.state()['limit']}]" if governor else "")
+                  + (f" on {result['node']}" if result.get('node') else ""))
+    except KeyboardInterrupt:
+        print("\n⛔ Interrupted, cancelling pending codes...")
+        executor.shutdown(wait=True, cancel_futures=True)
+        raise
+    finally:
+        executor.shutdown(wait=True)
+        if governor:
+            report_governor(governor.state())
+            manager.shutdown()
+        if node_pool is not None:
+            print("🌐 Grid nodes:")
+            report_nodes(node_pool.state())
+            node_manager.shutdown()
+        if metrics is not None:
+            if metrics_server:
+                metrics_server.shutdown()
+            if metrics_json:
+                metrics.write_json(metrics_json)
+                print(f"📁 Saved metrics to: {metrics_json}")
+            metrics_manager.shutdown()
+
+    print(f"\n🏁 Sweep finished in {time.time() - started:.1f}s")
+    return {code['value']: results[code['value']] for code in codes if code['value'] in results}
+
+
+def main(argv=None):
+    """
+    Command line entry point for a full or partial sweep
+    """
+    parser = argparse.ArgumentParser(description="Populate many COMcheck codes in parallel.")
+    parser.add_argument("codes", nargs="*", help="code values to run (default: all of all_codes.json)")
+    parser.add_argument("--workers", type=int, default=None, help="browser processes (default: cores - 1)")
+    parser.add_argument("--url", default=APP_URL, help="COMcheck-Web landing page")
+    parser.add_argument("--codes-file", default=CODES_FILE, help="code list JSON")
+    parser.add_argument("--output", help="write merged results JSON here")
+    parser.add_argument("--journal", default=DEFAULT_JOURNAL, help="progress journal (JSONL)")
+    parser.add_argument("--resume", action="store_true", help="skip areas already in each project")
+    parser.add_argument("--store", help="SQLite catalog store (see catalog_store.py) instead of catalog JSON files")
+    parser.add_argument("--ungoverned", action="store_true",
+                        help="let every worker add areas flat out instead of sharing an adaptive limit")
+    parser.add_argument("--nodes", help="YAML/JSON list of remote WebDriver nodes (url, capacity) to run browsers on")
+    parser.add_argument("--metrics-port", type=int, nargs="?", const=DEFAULT_METRICS_PORT,
+                        help=f"serve Prometheus metrics on this local port (default {DEFAULT_METRICS_PORT})")
+    parser.add_argument("--metrics-json", help="write the sweep's metrics as JSON here at exit")
+    parser.add_argument("--recycle", action="store_true",
+                        help="restart browsers mid-code and reopen the project (stand-in only so far)")
+    args = parser.parse_args(argv)
+
+    if args.store and not os.path.exists(args.store):
+        parser.error(f"No catalog store at {args.store} (run: python catalog_store.py import)")
+    nodes = None
+    if args.nodes:
+        try:
+            nodes = load_nodes(args.nodes)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+
+    codes = load_codes(args.codes_file)
+    if args.codes:
+        unknown = set(args.codes) - {code['value'] for code in codes}
+        if unknown:
+            parser.error(f"Unknown code values: {', '.join(sorted(unknown))}")
+        codes = [code for code in codes if code['value'] in args.codes]
+
+    try:
+        results = sweep(codes, workers=args.workers, url=args.url,
+                        journal=args.journal, resume=args.resume, store=args.store,
+                        governed=not args.ungoverned, nodes=nodes, metrics_port=args.metrics_port,
+                        metrics_json=args.metrics_json, recycle=args.recycle)
+    except KeyboardInterrupt:
+        return 130
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"📁 Saved results to: {args.output}")
+
+    failed = [r for r in results.values() if r['status'] == 'failed']
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Space-Type Plan Compiler
+Goal: Turn a YAML/JSON spec of (code, category, subcategories) into one flat, checked list of areas to add
+"""
+
+import os
+import sys
+import argparse
+from collections import Counter
+
+from code_catalogs import read_spec_file
+from catalog_store import CatalogStore, DEFAULT_STORE
+
+# Spec value meaning "every subcategory (or category) in the catalog"
+ALL = ("all", "*")
+
+
+def _entries(spec):
+    """
+    The spec's plan entries: {'plans': [...]}, a bare list, or a single entry
+    """
+    if isinstance(spec, list):
+        return spec
+    if isinstance(spec, dict) and 'plans' in spec:
+        return spec['plans'] if isinstance(spec['plans'], list) else [spec['plans']]
+    return [spec]
+
+
+def _names(value):
+    """
+    A spec value as a list of names: a single string is one name; None for anything but strings
+    """
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list) and all(isinstance(name, str) for name in value):
+        return value
+    return None
+
+
+def _requested(categories, catalog_categories):
+    """
+    ([(category, subcategories or None for all)], problems) from a spec entry's categories value
+    """
+    if categories is None or categories in ALL:
+        return [(category, None) for category in catalog_categories], []
+    if isinstance(categories, dict):
+        requested, problems = [], []
+        for category, subs in categories.items():
+            if subs in ALL:
+                requested.append((category, None))
+            elif _names(subs) is not None:
+                requested.append((category, _names(subs)))
+            else:
+                problems.append(f"'{category}': subcategories must be a name, a list of names or 'all', "
+                                f"not {type(subs).__name__}")
+        return requested, problems
+    names = _names(categories)
+    if names is None:
+        return [], [f"categories must be 'all', a list of names or a mapping, not {type(categories).__name__}"]
+    return [(category, None) for category in names], []
+
+
+def compile_plan(spec, store, default_code=None):
+    """
+    Validate a spec against the catalog store and flatten it into steps.
+
+    Each entry names a code and its categories, either as a mapping of
+    category to a subcategory list (a single name or 'all'), as a list of
+    whole categories, or as 'all'. A bare {category: [subcategories]} mapping
+    (the cxl_pop.py space-type file) is accepted with default_code. Entries
+    and values of any other shape are reported as problems.
+
+    Returns:
+        tuple: (steps, problems). steps is a list of (code, category, subcategory)
+               with duplicates dropped, ordered by code as first named in the
+               spec, then by catalog order within the code. problems lists
+               spec entries the catalogs do not have.
+    """
+    wanted = {}
+    problems = []
+    for number, entry in enumerate(_entries(spec), 1):
+        if not isinstance(entry, dict):
+            problems.append(f"entry {number}: expected a mapping with 'code' and 'categories', "
+                            f"not {type(entry).__name__}")
+            continue
+        if 'code' not in entry and default_code and 'categories' not in entry:
+            entry = {"code": default_code, "categories": entry}
+        code_value = entry.get('code') or default_code
+        if not code_value:
+            problems.append(f"entry {number}: no code")
+            continue
+        if not store.has(code_value):
+            problems.append(f"entry {number}: no catalog stored for {code_value}")
+            continue
+        catalog_categories = store.catalog(code_value)['categories']
+        areas = wanted.setdefault(code_value, set())
+        requested, invalid = _requested(entry.get('categories'), catalog_categories)
+        problems.extend(f"entry {number} ({code_value}): {problem}" for problem in invalid)
+        for category, subs in requested:
+            if category not in catalog_categories:
+                problems.append(f"{code_value}: unknown category '{category}'")
+                continue
+            known = catalog_categories[category]
+            for sub in known if subs is None else subs:
+                if sub in known:
+                    areas.add((category, sub))
+                else:
+                    problems.append(f"{code_value}: '{sub}' is not a subcategory of '{category}'")
+
+    steps = []
+    for code_value, areas in wanted.items():
+        for category, subs in store.catalog(code_value)['categories'].items():
+            steps.extend((code_value, category, sub) for sub in subs if (category, sub) in areas)
+    return steps, problems
+
+
+def plan_catalogs(steps):
+    """
+    {code: catalog} holding exactly the plan's areas, in plan order, ready for populate()
+    """
+    catalogs = {}
+    for code_value, category, sub in steps:
+        catalog = catalogs.setdefault(code_value, {"categories": {}})
+        catalog['categories'].setdefault(category, []).append(sub)
+    return catalogs
+
+
+def run_plan(steps, url=None, headless=True, batch=False, journal=None):
+    """
+    Populate every code in the plan, sharing one warm browser; returns {code: populate() result + 'status'}
+    """
+    # The population engine pulls in selenium; compiling and dry runs do not need it
+    from comcheck_engine import APP_URL, WarmSession, populate, run_ok
+    from driver_factory import DriverConfig
+
+    session = WarmSession(url or APP_URL, DriverConfig() if headless else DriverConfig.interactive())
+    results = {}
+    try:
+        for code_value, catalog in plan_catalogs(steps).items():
+            result = populate(code_value, catalog, batch=batch, journal=journal, session=session)
+            result['status'] = 'ok' if run_ok(result) else 'failed'
+            results[code_value] = result
+        session.report()
+    finally:
+        session.close()
+    return results
+
+
+def main(argv=None):
+    """
+    Command line entry point: compile a plan, print it on --dry-run, otherwise run it
+    """
+    parser = argparse.ArgumentParser(description="Compile and run a space-type plan.")
+    parser.add_argument("spec", help="YAML/JSON plan spec")
+    parser.add_argument("--code", help="code for specs that don't name one (e.g. cxl_pop.py space types)")
+    parser.add_argument("--store", default=DEFAULT_STORE, help="SQLite catalog store to validate against")
+    parser.add_argument("--dry-run", action="store_true", help="print the step count and stop")
+    parser.add_argument("--list", action="store_true", help="with --dry-run, print every step")
+    parser.add_argument("--url", help="COMcheck-Web landing page")
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    parser.add_argument("--batch", action="store_true", help="add each category in one in-page pass")
+    parser.add_argument("--journal", help="progress journal (JSONL)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.store):
+        parser.error(f"No catalog store at {args.store} (run: python catalog_store.py import)")
+    steps, problems = compile_plan(read_spec_file(args.spec), CatalogStore(args.store, readonly=True), args.code)
+    for problem in problems:
+        print(f"❌ {problem}")
+    per_code = Counter(code_value for code_value, _, _ in steps)
+    print(f"📋 {len(steps)} steps across {len(per_code)} codes"
+          + "".join(f"\n   {code_value}: {count}" for code_value, count in per_code.items()))
+    if args.dry_run:
+        if args.list:
+            for code_value, category, sub in steps:
+                print(f"   {code_value} | {category} | {sub}")
+        return 1 if problems else 0
+    if problems:
+        return 1
+
+    results = run_plan(steps, url=args.url, headless=not args.headed, batch=args.batch, journal=args.journal)
+    return 0 if all(result['status'] == 'ok' for result in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
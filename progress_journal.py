@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Progress Journal
+Goal: Append-only record of every area attempt so interrupted runs can resume
+"""
+
+import os
+import json
+import time
+
+DEFAULT_JOURNAL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "progress_journal.jsonl")
+
+ADDED = "added"
+FAILED = "failed"
+# Not an area attempt: which project holds a code's areas (see project())
+PROJECT = "project"
+
+
+class ProgressJournal:
+    """
+    JSONL journal keyed by (code, category, subcategory).
+
+    Every attempt is one line; the latest line for a key wins. Lines are
+    written with a single append each, so several worker processes can
+    share one file.
+    """
+
+    def __init__(self, path=DEFAULT_JOURNAL):
+        self.path = path
+
+    def record(self, code, category, subcategory, status, **extra):
+        """
+        Append one attempt to the journal
+        """
+        entry = {
+            "ts": time.time(),
+            "code": code,
+            "category": category,
+            "subcategory": subcategory,
+            "status": status,
+        }
+        entry.update(extra)
+        line = json.dumps(entry) + "\n"
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def record_project(self, code, reference):
+        """
+        Remember the project a code's areas go into, so a later run can reopen it
+        """
+        self.record(code, None, None, PROJECT, project=reference)
+
+    def project(self, code):
+        """
+        The last project reference recorded for a code, or None
+        """
+        reference = None
+        for entry in self.entries(code):
+            if entry['status'] == PROJECT:
+                reference = entry.get('project')
+        return reference
+
+    def entries(self, code=None):
+        """
+        Yield journal entries in write order, optionally for one code
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn last line from a killed run
+                if code is None or entry.get('code') == code:
+                    yield entry
+
+    def latest(self, code):
+        """
+        {(category, subcategory): last area attempt} for one code
+        """
+        state = {}
+        for entry in self.entries(code):
+            if entry['status'] == PROJECT:
+                continue
+            state[(entry['category'], entry['subcategory'])] = entry
+        return state
+
+    def completed(self, code):
+        """
+        Set of (category, subcategory) whose last recorded attempt succeeded
+        """
+        return {key for key, entry in self.latest(code).items() if entry['status'] == ADDED}
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Shared Rate Governor
+Goal: Let parallel workers push the site as hard as it allows, backing off (AIMD) when it slows down or errors
+"""
+
+import sys
+import json
+import time
+import argparse
+import statistics
+import threading
+import http.client
+from multiprocessing.managers import BaseManager
+from urllib.parse import urlsplit
+
+from code_catalogs import find_code, catalog_path_for, load_catalog
+
+
+class RateGovernor:
+    """
+    One concurrency limit and request pacing shared by every worker.
+
+    Workers call acquire() before adding an area (or a batch) and release()
+    with its duration and failures after. At most `limit` adds run at once,
+    and consecutive starts are spaced by `interval` seconds. Every `window`
+    finished areas the governor compares the window with the first healthy
+    one: when the error rate is above `error_rate`, or the median area time
+    is above `slowdown` times the baseline, the limit is multiplied by
+    `decrease` and the interval doubled; otherwise the limit grows by
+    `increase` and the interval halves. Workers over the limit simply wait
+    in acquire(), so the number of active workers follows the limit.
+    """
+
+    def __init__(self, max_limit, min_limit=1, start=None, window=20, error_rate=0.1, slowdown=1.5,
+                 increase=1, decrease=0.5, min_interval=0.0, max_interval=2.0, step_interval=0.05):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = float(start or min_limit)
+        self.window = window
+        self.error_rate = error_rate
+        self.slowdown = slowdown
+        self.increase = increase
+        self.decrease = decrease
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.step_interval = step_interval
+        self.interval = min_interval
+        self.active = 0
+        self.peak_active = 0
+        self.next_start = 0.0
+        self.baseline = None
+        self.seconds = []
+        self.failures = 0
+        self.finished = 0
+        self.waited = 0.0
+        self.history = []
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """
+        Block until this worker may start an add; returns the seconds spent waiting
+        """
+        started = time.monotonic()
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if self.active < int(self.limit) and now >= self.next_start:
+                    break
+                wait = self.next_start - now if self.active < int(self.limit) else None
+                self._condition.wait(wait)
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+            self.next_start = now + self.interval
+            waited = time.monotonic() - started
+            self.waited += waited
+        return waited
+
+    def release(self, seconds, failures=0, count=1):
+        """
+        Report a finished add of `count` areas taking `seconds` each, `failures` of which failed
+        """
+        with self._condition:
+            self.active -= 1
+            self.seconds.extend([seconds] * (count - failures))
+            self.failures += failures
+            self.finished += count
+            if len(self.seconds) + self.failures >= self.window:
+                self._adjust()
+            self._condition.notify_all()
+
+    def _adjust(self):
+        """
+        Additive increase or multiplicative decrease after a full window
+        """
+        total = len(self.seconds) + self.failures
+        errors = self.failures / total
+        median = statistics.median(self.seconds) if self.seconds else None
+        if self.baseline is None and median is not None and errors <= self.error_rate:
+            self.baseline = median
+        if errors > self.error_rate:
+            reason = f"error rate {errors:.0%}"
+        elif median is not None and median > self.slowdown * self.baseline:
+            reason = f"median {median:.2f}s vs {self.baseline:.2f}s baseline"
+        else:
+            reason = None
+        if reason:
+            self.limit = max(self.min_limit, self.limit * self.decrease)
+            self.interval = min(self.max_interval, max(self.interval * 2, self.step_interval))
+        else:
+            self.limit = min(self.max_limit, self.limit + self.increase)
+            self.interval = max(self.min_interval, self.interval / 2 if self.interval > self.step_interval else 0.0)
+        self.history.append({"finished": self.finished, "limit": int(self.limit), "interval": self.interval,
+                             "median": median, "errors": errors, "backoff": reason})
+        self.seconds = []
+        self.failures = 0
+
+    def state(self):
+        """
+        The current limit, pacing and load
+        """
+        with self._condition:
+            return {
+                "limit": int(self.limit),
+                "interval": self.interval,
+                "active": self.active,
+                "peak_active": self.peak_active,
+                "baseline": self.baseline,
+                "finished": self.finished,
+                "waited": self.waited,
+                "backoffs": sum(1 for change in self.history if change['backoff']),
+            }
+
+    def changes(self):
+        with self._condition:
+            return list(self.history)
+
+
+class GovernorManager(BaseManager):
+    """
+    Serves one RateGovernor to the sweep's worker processes
+    """
+
+
+GovernorManager.register("RateGovernor", RateGovernor)
+
+
+def shared_governor(max_limit, **options):
+    """
+    Start a manager process holding a RateGovernor; returns (manager, governor proxy).
+
+    The proxy can be passed to pool workers; shut the manager down when done.
+    """
+    manager = GovernorManager()
+    manager.start()
+    return manager, manager.RateGovernor(max_limit, **options)
+
+
+def report(state):
+    print(f"🚦 Governor: limit {state['limit']} (peak {state['peak_active']} active), "
+          f"pacing {state['interval'] * 1000:.0f}ms, {state['backoffs']} backoffs, "
+          f"{state['waited']:.1f}s spent waiting")
+
+
+def exercise(url, code_value, threads=8, areas=200, governor=None):
+    """
+    Hammer the stand-in server's area API from `threads` threads, paced by the governor.
+
+    Returns:
+        dict: areas 'added', 'failed', 'elapsed' and the governor's 'state' and 'changes'
+    """
+    parts = urlsplit(url)
+    api = parts.path.rstrip("/") + "/api"
+    categories = load_catalog(catalog_path_for(code_value))['categories']
+    work = [(category, sub) for category, subs in categories.items() for sub in subs or []]
+    work = (work * (areas // max(1, len(work)) + 1))[:areas]
+
+    def post(connection, path, payload):
+        connection.request("POST", path, body=json.dumps(payload), headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read() or b"{}")
+
+    setup = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+    status, project = post(setup, f"{api}/project", {"code": code_value})
+    setup.close()
+    if status != 200:
+        raise RuntimeError(f"Could not create a stand-in project: HTTP {status}")
+
+    lock = threading.Lock()
+    counts = {"added": 0, "failed": 0}
+
+    def worker():
+        connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+        while True:
+            with lock:
+                if not work:
+                    break
+                category, sub = work.pop()
+            if governor:
+                governor.acquire()
+            started = time.perf_counter()
+            try:
+                status, _ = post(connection, f"{api}/project/{project['id']}/areas",
+                                 {"category": category, "subcategory": sub})
+            except (OSError, ValueError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+                status = None
+            ok = status == 200
+            if governor:
+                governor.release(time.perf_counter() - started, failures=0 if ok else 1)
+            with lock:
+                counts['added' if ok else 'failed'] += 1
+        connection.close()
+
+    started = time.time()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    result = dict(counts, elapsed=time.time() - started)
+    if governor:
+        result['state'] = governor.state()
+        result['changes'] = governor.changes()
+    return result
+
+
+def main(argv=None):
+    """
+    Command line entry point: watch the governor settle against a stand-in server that slows under load
+    """
+    from standin_server import serve_in_thread
+
+    parser = argparse.ArgumentParser(description="Exercise the rate governor against the stand-in server.")
+    parser.add_argument("--code", default="CEZ_IECC2015", help="code whose catalog supplies the areas")
+    parser.add_argument("--threads", type=int, default=8, help="workers competing for the site")
+    parser.add_argument("--areas", type=int, default=300, help="area requests to send")
+    parser.add_argument("--latency", type=float, default=0.1, help="stand-in latency per call (s)")
+    parser.add_argument("--capacity", type=int, default=3, help="calls in flight before the stand-in slows down")
+    parser.add_argument("--window", type=int, default=20, help="areas per governor decision")
+    parser.add_argument("--ungoverned", action="store_true", help="run without the governor, for comparison")
+    args = parser.parse_args(argv)
+
+    try:
+        code = find_code(args.code)
+    except ValueError as e:
+        parser.error(str(e))
+    server, url = serve_in_thread(latency=args.latency, capacity=args.capacity)
+    print(f"🧪 Stand-in at {url}: {args.latency}s per call, full speed up to {args.capacity} in flight")
+    governor = None if args.ungoverned else RateGovernor(args.threads, window=args.window)
+    try:
+        result = exercise(url, code['value'], args.threads, args.areas, governor)
+    finally:
+        server.shutdown()
+
+    for change in result.get('changes', []):
+        median = f"{change['median'] * 1000:.0f}ms" if change['median'] is not None else "-"
+        print(f"   after {change['finished']:>4}: limit {change['limit']}, median {median}, "
+              f"errors {change['errors']:.0%}" + (f"  ⬇️ {change['backoff']}" if change['backoff'] else "  ⬆️"))
+    print(f"\n📊 {result['added']} added, {result['failed']} rejected in {result['elapsed']:.1f}s "
+          f"({result['added'] / result['elapsed']:.1f} areas/s)")
+    if governor:
+        report(result['state'])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
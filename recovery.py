@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Failure Recovery
+Goal: Classify add-area failures, reset the page once per failure and stop hammering a broken category
+"""
+
+from collections import Counter
+
+# Failure classes
+SESSION = "session"      # the browser or window is gone; nothing to recover in-page
+TIMEOUT = "timeout"      # an element never reached the expected state
+MODAL = "modal"          # stale, hidden or covered elements: the modal is out of step
+DATA = "data"            # the catalog names a radio or option the modal doesn't have
+UNKNOWN = "unknown"
+
+CIRCUIT_OPEN = "skipped: too many failures in this category"
+
+SESSION_ERRORS = {"InvalidSessionIdException", "NoSuchWindowException"}
+MODAL_ERRORS = {
+    "StaleElementReferenceException", "ElementClickInterceptedException",
+    "ElementNotInteractableException", "NoSuchElementException", "JavascriptException",
+}
+
+
+def classify(error):
+    """
+    Failure class of an exception, looking through the causes it was raised from
+    """
+    current = error
+    while current is not None:
+        name = type(current).__name__
+        if name in SESSION_ERRORS or (name == "WebDriverException" and "disconnected" in str(current)):
+            return SESSION
+        if name == "TimeoutException":
+            return TIMEOUT
+        if name in MODAL_ERRORS:
+            return MODAL
+        current = current.__cause__
+    if isinstance(error, LookupError):
+        return DATA
+    return UNKNOWN
+
+
+class RecoveryManager:
+    """
+    Per-run failure handling for the add-area loop.
+
+    Every failure is classified and followed by one call to reset, which must
+    put the page back in a known-good state and return True. Session failures
+    are re-raised, since no page script can bring a dead browser back. After
+    `threshold` consecutive failures in one category its circuit opens and the
+    rest of that category is skipped instead of timing out area by area; the
+    post-run verification re-adds whatever was skipped.
+    """
+
+    def __init__(self, reset, threshold=3):
+        self.reset = reset
+        self.threshold = threshold
+        self.consecutive = Counter()
+        self.open = set()
+        self.failures = Counter()
+        self.resets = 0
+        self.short_circuited = 0
+
+    def allow(self, category_name):
+        """
+        False (and counted) while the category's circuit is open
+        """
+        if category_name in self.open:
+            self.short_circuited += 1
+            return False
+        return True
+
+    def success(self, category_name):
+        self.consecutive[category_name] = 0
+
+    def failure(self, category_name, error):
+        """
+        Record a failed add and restore the page; returns the failure class
+        """
+        kind = classify(error)
+        self.failures[kind] += 1
+        if kind == SESSION:
+            raise error
+        self.consecutive[category_name] += 1
+        if self.consecutive[category_name] >= self.threshold:
+            self.open.add(category_name)
+        self.resets += 1
+        if not self.reset():
+            raise RuntimeError(f"Could not restore the Interior Lighting tab after a {kind} failure") from error
+        return kind
+
+    def summary(self):
+        return {
+            "failures": dict(self.failures),
+            "resets": self.resets,
+            "open_categories": sorted(self.open),
+            "short_circuited": self.short_circuited,
+        }
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Local Stand-in COMcheck-Web Server
+Goal: Serve the elements the automation depends on, offline and with configurable latency
+"""
+
+import os
+import sys
+import json
+import html
+import time
+import random
+import argparse
+import threading
+from itertools import count
+from xml.etree import ElementTree
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from code_catalogs import CODES_FILE, load_codes, load_catalog, catalog_path_for
+
+APP_PATH = "/COMcheckWeb/"
+
+LANDING_HTML = """<!DOCTYPE html>
+<html><head><title>COMcheck-Web (stand-in)</title></head>
+<body>
+<h1>COMcheck-Web</h1>
+<button id="startButton" onclick="window.open('app.html', '_blank')">Start COMcheck-Web</button>
+</body></html>
+"""
+
+APP_HTML = """<!DOCTYPE html>
+<html><head><title>COMcheck-Web Project (stand-in)</title>
+<style>
+  #loadingIndicator { position: fixed; top: 0; left: 0; right: 0; background: #ffc; }
+  #areaModal { position: fixed; top: 40px; left: 40px; background: #fff; border: 1px solid #888; padding: 8px; }
+  .hidden { display: none; }
+</style></head>
+<body>
+<div id="loadingIndicator">Loading...</div>
+<label for="code">Code:</label>
+<select id="code"><option value="">-- Select code --</option>__CODE_OPTIONS__</select>
+
+<div id="projectType">
+  <input type="radio" name="project_type" id="project_new" checked><label for="project_new">New Construction</label>
+  <input type="radio" name="project_type" id="project_addition"><label for="project_addition">Addition</label>
+  <input type="radio" name="project_type" id="project_alteration"><label for="project_alteration">Alterations</label>
+</div>
+<label for="importProject">Open project (.cxl):</label>
+<input type="file" id="importProject" accept=".cxl">
+
+<div id="tabs">
+  <input type="radio" name="bat_category" id="bat_category_envelope" class="hidden">
+  <label for="bat_category_envelope">Building Envelope Area Types</label>
+  <input type="radio" name="bat_category" id="bat_category_int_lighting" class="hidden">
+  <label for="bat_category_int_lighting">Interior Lighting Method and Areas</label>
+</div>
+
+<div id="intLightingPanel" class="hidden">
+  <a id="addAreaCategory" class="checkButton addButton" href="#">Add Area Category</a>
+  <table id="areaCategoryTable"><thead><tr><th>#</th><th>Category</th><th>Area Type</th></tr></thead>
+  <tbody></tbody></table>
+</div>
+
+<script>
+var LATENCY = __LATENCY__, JITTER = __JITTER__;
+var project = null, categories = {};
+
+function delay() { return Math.max(0, LATENCY * (1 + JITTER * (Math.random() * 2 - 1))); }
+function later(fn) { setTimeout(fn, delay()); }
+function api(method, path, body) {
+    return fetch(path, {
+        method: method,
+        headers: {'Content-Type': 'application/json'},
+        body: body === undefined ? undefined : JSON.stringify(body)
+    }).then(function (response) { return response.json(); });
+}
+function loading(on) { document.getElementById('loadingIndicator').style.display = on ? 'block' : 'none'; }
+function byId(id) { return document.getElementById(id); }
+
+function addRow(area) {
+    var row = byId('areaCategoryTable').tBodies[0].insertRow();
+    [area.number, area.category, area.subcategory].forEach(function (text) {
+        row.insertCell().textContent = text;
+    });
+}
+
+// app.html?project=<id> reopens a saved project (used when a browser is recycled)
+var reopen = new URLSearchParams(location.search).get('project');
+if (reopen) {
+    api('GET', 'api/project/' + encodeURIComponent(reopen)).then(function (saved) {
+        return api('GET', 'api/catalog?code=' + encodeURIComponent(saved.code)).then(function (catalog) {
+            project = saved.id;
+            categories = catalog.categories;
+            byId('code').value = saved.code;
+            saved.areas.forEach(addRow);
+            loading(false);
+        });
+    });
+} else {
+    later(function () { loading(false); });
+}
+
+byId('code').addEventListener('change', function () {
+    loading(true);
+    api('POST', 'api/project', {code: this.value}).then(function (data) {
+        project = data.id;
+        categories = data.categories;
+        byId('areaCategoryTable').tBodies[0].innerHTML = '';
+        loading(false);
+    });
+});
+
+// Opening a .cxl file imports it as a new project
+byId('importProject').addEventListener('change', function () {
+    var file = this.files[0];
+    if (!file) return;
+    loading(true);
+    file.text().then(function (cxl) {
+        return api('POST', 'api/project/import', {cxl: cxl});
+    }).then(function (data) {
+        loading(false);
+        if (data.error) return;
+        project = data.id;
+        categories = data.categories;
+        byId('code').value = data.code;
+        byId('areaCategoryTable').tBodies[0].innerHTML = '';
+        data.areas.forEach(addRow);
+    });
+});
+
+byId('bat_category_int_lighting').addEventListener('change', function () {
+    byId('intLightingPanel').classList.remove('hidden');
+});
+byId('bat_category_envelope').addEventListener('change', function () {
+    byId('intLightingPanel').classList.add('hidden');
+});
+
+function closeModal() {
+    var modal = byId('areaModal');
+    if (modal) modal.parentNode.removeChild(modal);
+}
+
+function openModal() {
+    closeModal();
+    var modal = document.createElement('div');
+    modal.id = 'areaModal';
+    var names = Object.keys(categories);
+    names.forEach(function (name, i) {
+        var row = document.createElement('div');
+        var radio = document.createElement('input');
+        radio.type = 'radio';
+        radio.name = 'areaCategory';
+        radio.id = 'area_category_' + i;
+        var label = document.createElement('label');
+        label.htmlFor = radio.id;
+        label.textContent = name;
+        var select = document.createElement('select');
+        select.disabled = true;
+        select.add(new Option('Select Area Category...', ''));
+        radio.addEventListener('click', function () {
+            modal.querySelectorAll('select').forEach(function (other) { other.disabled = true; });
+            later(function () {
+                if (select.options.length < 2) {
+                    categories[name].forEach(function (sub) { select.add(new Option(sub, sub)); });
+                }
+                select.disabled = false;
+            });
+        });
+        row.appendChild(radio);
+        row.appendChild(label);
+        row.appendChild(select);
+        modal.appendChild(row);
+    });
+    var create = document.createElement('button');
+    create.className = 'accept default';
+    create.textContent = '\\u00bb Create Area Category';
+    create.addEventListener('click', function () {
+        var radio = modal.querySelector("input[type='radio']:checked");
+        var select = radio && radio.parentElement.querySelector('select');
+        if (!select || !select.value) return;
+        var label = modal.querySelector("label[for='" + radio.id + "']").textContent;
+        api('POST', 'api/project/' + project + '/areas', {category: label, subcategory: select.value})
+            .then(function (area) {
+                if (area.error) return;  // rejected: the modal stays open
+                closeModal();
+                addRow(area);
+            });
+    });
+    var cancel = document.createElement('button');
+    cancel.className = 'cancel';
+    cancel.textContent = 'Cancel';
+    cancel.addEventListener('click', closeModal);
+    modal.appendChild(create);
+    modal.appendChild(cancel);
+    document.body.appendChild(modal);
+}
+
+byId('addAreaCategory').addEventListener('click', function (event) {
+    event.preventDefault();
+    later(openModal);
+});
+</script>
+</body></html>
+"""
+
+
+class StandinState:
+    """
+    Projects created by app windows, and the knobs shared by all request handlers
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, capacity=None, codes_file=CODES_FILE, catalog_for=catalog_path_for):
+        self.latency = latency
+        self.jitter = jitter
+        self.capacity = capacity
+        self.in_flight = 0
+        self.busy_rejections = 0
+        self.codes = load_codes(codes_file)
+        self.catalog_for = catalog_for
+        self.projects = {}
+        self.lock = threading.Lock()
+        self._ids = count(1)
+        self._catalogs = {}
+
+    def delay(self):
+        """
+        Sleep for one simulated server round-trip; False when the server is too busy to answer.
+
+        With a capacity, calls beyond that many in flight slow every call down
+        in proportion, and beyond twice that many are turned away, like a site
+        that is being pushed too hard.
+        """
+        with self.lock:
+            self.in_flight += 1
+            load = self.in_flight
+        try:
+            if self.capacity and load > 2 * self.capacity:
+                self.busy_rejections += 1
+                return False
+            scale = max(1.0, load / self.capacity) if self.capacity else 1.0
+            if self.latency:
+                time.sleep(max(0.0, self.latency * scale * (1 + self.jitter * random.uniform(-1, 1))))
+            return True
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def categories(self, code_value):
+        """
+        Non-empty categories of a code's catalog ({} when the code has no catalog)
+        """
+        if code_value not in self._catalogs:
+            path = self.catalog_for(code_value)
+            categories = load_catalog(path)['categories'] if os.path.exists(path) else {}
+            self._catalogs[code_value] = {name: subs for name, subs in categories.items() if subs}
+        return self._catalogs[code_value]
+
+    def create_project(self, code_value):
+        with self.lock:
+            project_id = str(next(self._ids))
+            self.projects[project_id] = {"id": project_id, "code": code_value, "areas": []}
+        return project_id
+
+    def add_area(self, project_id, category, subcategory):
+        with self.lock:
+            project = self.projects[project_id]
+            if subcategory not in self.categories(project['code']).get(category, []):
+                raise ValueError(f"'{subcategory}' is not an area type of '{category}'")
+            area = {"number": len(project['areas']) + 1, "category": category, "subcategory": subcategory}
+            project['areas'].append(area)
+        return area
+
+    def import_project(self, cxl):
+        """
+        A new project built from a CXL document in cxl_writer's layout; areas
+        the code's catalog doesn't have are left out, as a rejected add would be
+        """
+        root = ElementTree.fromstring(cxl)
+        project_id = self.create_project(root.findtext("control/code", ""))
+        for area in root.iter("areaCategory"):
+            try:
+                self.add_area(project_id, area.findtext("category"), area.findtext("activityType"))
+            except ValueError:
+                pass
+        return self.projects[project_id]
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """
+    Routes for the landing page, the application window and its JSON API
+    """
+    state = None  # set by make_server
+    verbose = False
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real backend
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, content_type):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _json(self, status, payload):
+        self._send(status, json.dumps(payload), "application/json")
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _route(self):
+        path = urlparse(self.path).path
+        if not path.startswith(APP_PATH):
+            return None
+        return path[len(APP_PATH):].strip("/").split("/")
+
+    def do_GET(self):
+        route = self._route()
+        if route == [""]:
+            return self._send(200, LANDING_HTML, "text/html")
+        if route == ["app.html"]:
+            return self._send(200, self._app_html(), "text/html")
+        if route and len(route) == 3 and route[:2] == ["api", "project"]:
+            if not self.state.delay():
+                return self._json(503, {"error": "server busy"})
+            project = self.state.projects.get(route[2])
+            if project is None:
+                return self._json(404, {"error": "no such project"})
+            return self._json(200, project)
+        if route == ["api", "catalog"]:
+            code_value = parse_qs(urlparse(self.path).query).get("code", [""])[0]
+            return self._json(200, {"code": code_value, "categories": self.state.categories(code_value)})
+        self._json(404, {"error": "not found"})
+
+    def do_POST(self):
+        route = self._route()
+        try:
+            body = self._body()
+        except ValueError:
+            return self._json(400, {"error": "invalid JSON"})
+        if not self.state.delay():
+            return self._json(503, {"error": "server busy"})
+        if route == ["api", "project"]:
+            code_value = body.get("code", "")
+            project_id = self.state.create_project(code_value)
+            return self._json(200, {"id": project_id, "categories": self.state.categories(code_value)})
+        if route == ["api", "project", "import"]:
+            try:
+                project = self.state.import_project(body.get("cxl", ""))
+            except ElementTree.ParseError as e:
+                return self._json(400, {"error": f"invalid CXL: {e}"})
+            return self._json(200, dict(project, categories=self.state.categories(project['code'])))
+        if route and len(route) == 4 and route[:2] == ["api", "project"] and route[3] == "areas":
+            if route[2] not in self.state.projects:
+                return self._json(404, {"error": "no such project"})
+            try:
+                area = self.state.add_area(route[2], body.get("category"), body.get("subcategory"))
+            except ValueError as e:
+                return self._json(400, {"error": str(e)})
+            return self._json(200, area)
+        self._json(404, {"error": "not found"})
+
+    def _app_html(self):
+        options = "".join(
+            f'<option value="{html.escape(code["value"])}">{html.escape(code["text"])}</option>'
+            for code in self.state.codes
+        )
+        return (APP_HTML
+                .replace("__CODE_OPTIONS__", options)
+                .replace("__LATENCY__", str(int(self.state.latency * 1000)))
+                .replace("__JITTER__", str(self.state.jitter)))
+
+
+def make_server(host="127.0.0.1", port=0, latency=0.0, jitter=0.0, capacity=None, verbose=False, **state_options):
+    """
+    Build a stand-in server; port 0 picks a free port.
+
+    Args:
+        latency (float): Seconds added to every API call and UI transition.
+        jitter (float): Relative +/- spread applied to each latency sample.
+        capacity (int): API calls in flight the server handles at full speed
+            (see StandinState.delay); None never slows down.
+    """
+    handler = type("BoundStandinHandler", (StandinHandler,), {
+        "state": StandinState(latency=latency, jitter=jitter, capacity=capacity, **state_options),
+        "verbose": verbose,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def app_url(server):
+    """
+    Landing page URL to pass to the engine as url=...
+    """
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}{APP_PATH}"
+
+
+def serve_in_thread(**options):
+    """
+    Start a stand-in server on a background thread; returns (server, landing url)
+    """
+    server = make_server(**options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, app_url(server)
+
+
+def main(argv=None):
+    """
+    Command line entry point: serve until interrupted
+    """
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for COMcheck-Web.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per API call / UI transition")
+    parser.add_argument("--jitter", type=float, default=0.0, help="relative latency spread (0-1)")
+    parser.add_argument("--capacity", type=int, help="API calls in flight before the server slows down and sheds load")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, latency=args.latency, jitter=args.jitter, capacity=args.capacity,
+                         verbose=args.verbose)
+    print(f"🧪 Stand-in COMcheck-Web at {app_url(server)} (latency {args.latency}s ± {args.jitter:.0%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Step Timing
+Goal: Per-step latency samples and WebDriver command counts for the add-area loop
+"""
+
+import math
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+
+def percentile(samples, pct):
+    """
+    Nearest-rank percentile of a list of numbers (pct in 0-100)
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(samples):
+    """
+    count / total / mean / p50 / p95 / max for one list of durations
+    """
+    return {
+        "count": len(samples),
+        "total": sum(samples),
+        "mean": sum(samples) / len(samples) if samples else 0.0,
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "max": max(samples) if samples else 0.0,
+    }
+
+
+class StepTimer:
+    """
+    Collects wall-clock durations per named step (open_modal, find_radio, ...)
+    """
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    @contextmanager
+    def step(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples[name].append(time.perf_counter() - started)
+
+    def tagged(self, **tags):
+        """
+        Label the work done inside the block (code, category, subcategory)
+        """
+        return nullcontext()
+
+    def summary(self):
+        """
+        {step: summarize(durations)} in the order steps were first seen
+        """
+        return {name: summarize(samples) for name, samples in self.samples.items()}
+
+
+class NullTimer:
+    """
+    Stand-in used when nobody is timing the run
+    """
+
+    def step(self, name):
+        return nullcontext()
+
+    def tagged(self, **tags):
+        return nullcontext()
+
+
+NULL_TIMER = NullTimer()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Multi-Window Population
+Goal: Keep several COMcheck-Web projects moving in one Chrome, one application window each
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+from selenium.webdriver.support.ui import WebDriverWait
+
+from code_catalogs import find_code, catalog_path_for, load_catalog, count_combinations
+from driver_factory import DriverConfig, launch_driver, browser_rss_mb
+from comcheck_engine import (
+    APP_URL, BATCH_ADD_JS, BATCH_SELECTORS, start_application, wait_for_loading, select_code,
+    open_interior_lighting, forget_modal_lookups, reset_state, batch_timeout, confirm_batch, read_area_rows,
+    verify_and_rerun, report, run_ok,
+)
+from progress_journal import ProgressJournal, DEFAULT_JOURNAL, ADDED, FAILED
+
+# Chrome throttles timers in background windows to about once a second,
+# which would stall the in-page batches of every window but the focused one
+BACKGROUND_ARGUMENTS = [
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+]
+
+# Starts BATCH_ADD_JS without blocking the driver; the outcome lands in
+# window.__comcheckBatch when the page is done with the category
+START_BATCH_JS = """
+var args = Array.prototype.slice.call(arguments);
+window.__comcheckBatch = null;
+args.push(function (outcome) { window.__comcheckBatch = outcome; });
+(function () {
+""" + BATCH_ADD_JS + """
+}).apply(null, args);
+"""
+
+BATCH_OUTCOME_JS = "return window.__comcheckBatch;"
+
+
+def shard_catalog(catalog, shards):
+    """
+    Split a catalog into up to `shards` catalogs of whole categories with similar area counts
+    """
+    categories = load_catalog(catalog)['categories']
+    assigned = {}
+    sizes = [0] * shards
+    for category, subcategories in sorted(categories.items(), key=lambda item: -len(item[1] or [])):
+        if not subcategories:
+            continue
+        shard = sizes.index(min(sizes))
+        assigned[category] = shard
+        sizes[shard] += len(subcategories)
+    pieces = [{"categories": {}} for _ in range(shards)]
+    for category, subcategories in categories.items():
+        if category in assigned:
+            pieces[assigned[category]]['categories'][category] = subcategories
+    return [piece for piece in pieces if piece['categories']]
+
+
+class TabCoordinator:
+    """
+    Drives several application windows of one browser from a single asyncio loop.
+
+    WebDriver talks to one window at a time, so every command goes through
+    use(), which switches windows only when needed. Each category runs as
+    an in-page batch (BATCH_ADD_JS) that keeps going on its own while the
+    coordinator polls the other windows, so the site's waits overlap across
+    projects instead of adding up.
+    """
+
+    def __init__(self, driver, app_url, journal=None, poll_interval=0.05, step_timeout=5, verify=True):
+        self.driver = driver
+        self.app_url = app_url
+        self.journal = journal
+        self.poll_interval = poll_interval
+        self.step_timeout = step_timeout
+        self.verify = verify
+        self.current = driver.current_window_handle
+        self.switches = 0
+
+    def use(self, handle):
+        if handle != self.current:
+            self.driver.switch_to.window(handle)
+            self.current = handle
+            self.switches += 1
+
+    def open_window(self):
+        """
+        Open one more application window (a separate project); returns its handle
+        """
+        before = set(self.driver.window_handles)
+
+        def _opened(driver):
+            opened = set(driver.window_handles) - before
+            return opened.pop() if opened else False
+
+        self.driver.execute_script("window.open(arguments[0], '_blank');", self.app_url)
+        handle = WebDriverWait(self.driver, 10).until(_opened)
+        self.use(handle)
+        wait_for_loading(self.driver)
+        return handle
+
+    def prepare(self, handle, code_value, fresh=False):
+        """
+        Leave the window on code_value's Interior Lighting tab, reloading it first for a new project
+        """
+        self.use(handle)
+        if fresh:
+            self.driver.get(self.app_url)
+            wait_for_loading(self.driver)
+        select_code(self.driver, code_value)
+        open_interior_lighting(self.driver)
+
+    async def run_job(self, handle, label, code_value, catalog):
+        """
+        Add a catalog's areas in one window, a category per in-page batch
+        """
+        categories = load_catalog(catalog)['categories']
+        result = {"code": code_value, "window": label, "total": count_combinations(categories),
+                  "success": 0, "skipped": 0, "errors": 0, "elapsed": 0.0}
+        started = time.time()
+        for category_name, subcategories in categories.items():
+            if not subcategories:
+                continue
+            self.use(handle)
+            rows_before = read_area_rows(self.driver)
+            self.driver.execute_script(START_BATCH_JS, category_name, list(subcategories),
+                                       BATCH_SELECTORS, int(self.step_timeout * 1000))
+            deadline = time.time() + batch_timeout(subcategories, self.step_timeout)
+            outcome = None
+            while outcome is None and time.time() < deadline:
+                await asyncio.sleep(self.poll_interval)
+                self.use(handle)
+                outcome = self.driver.execute_script(BATCH_OUTCOME_JS)
+            self.use(handle)
+            if outcome is None:
+                outcome = {"added": [], "failed": {sub: "batch timed out" for sub in subcategories}}
+                reset_state(self.driver)
+            added, failed = confirm_batch(self.driver, category_name, outcome, rows_before, categories)
+            result['success'] += len(added)
+            result['errors'] += len(failed)
+            if self.journal:
+                for subcategory in added:
+                    self.journal.record(code_value, category_name, subcategory, ADDED, window=label)
+                for subcategory, reason in failed.items():
+                    self.journal.record(code_value, category_name, subcategory, FAILED, error=reason, window=label)
+            print(f"  [{label}] {category_name}: {len(added)}/{len(subcategories)}"
+                  + (f" ({len(failed)} failed)" if failed else ""))
+        result['elapsed'] = time.time() - started
+
+        if self.verify:
+            # Blocks the loop, but the other windows' batches keep running in their pages
+            self.use(handle)
+            forget_modal_lookups(self.driver)
+            result['verification'] = verify_and_rerun(self.driver, code_value, catalog, journal=self.journal)
+        return result
+
+    async def run(self, jobs, handles):
+        """
+        Spread (code, catalog) jobs over the windows; returns results in job order
+        """
+        results = [None] * len(jobs)
+        pending = list(enumerate(jobs))
+
+        async def window_worker(number, handle):
+            fresh = False
+            while pending:
+                index, (code_value, catalog) = pending.pop(0)
+                label = f"w{number}"
+                try:
+                    self.prepare(handle, code_value, fresh)
+                    results[index] = await self.run_job(handle, label, code_value, catalog)
+                except Exception as e:
+                    print(f"  [{label}] ❌ {code_value}: {e}")
+                    results[index] = {"code": code_value, "window": label, "total": 0, "success": 0,
+                                      "errors": 0, "elapsed": 0.0, "fatal": str(e)}
+                fresh = True
+
+        await asyncio.gather(*(window_worker(number, handle) for number, handle in enumerate(handles, 1)))
+        return results
+
+
+def populate_in_windows(jobs, url=APP_URL, windows=3, headless=True, journal=None, verify=True):
+    """
+    Populate (code, catalog) jobs in up to `windows` application windows of one browser.
+
+    Returns:
+        tuple: (results in job order, browser stats with 'rss_mb_end' and 'window_switches')
+    """
+    config = DriverConfig() if headless else DriverConfig.interactive()
+    config.extra_arguments += BACKGROUND_ARGUMENTS
+    driver, browser = launch_driver(config)
+    try:
+        start_application(driver, url)
+        coordinator = TabCoordinator(driver, driver.current_url,
+                                     journal=ProgressJournal(journal) if journal else None, verify=verify)
+        handles = [driver.current_window_handle]
+        handles += [coordinator.open_window() for _ in range(min(windows, len(jobs)) - 1)]
+        print(f"🪟 {len(handles)} application windows in one browser")
+        results = asyncio.run(coordinator.run(jobs, handles))
+        browser['rss_mb_end'] = browser_rss_mb(driver)
+        browser['window_switches'] = coordinator.switches
+    finally:
+        forget_modal_lookups(driver)
+        driver.quit()
+    return results, browser
+
+
+def main(argv=None):
+    """
+    Command line entry point: several codes (or shards of one) in one browser
+    """
+    parser = argparse.ArgumentParser(description="Populate several COMcheck projects in one browser.")
+    parser.add_argument("codes", nargs="+", help="code values from all_codes.json")
+    parser.add_argument("--windows", type=int, default=3, help="application windows to keep busy")
+    parser.add_argument("--shards", type=int, default=1, help="split each code's catalog over this many projects")
+    parser.add_argument("--url", default=APP_URL, help="COMcheck-Web landing page")
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    parser.add_argument("--journal", default=DEFAULT_JOURNAL, help="progress journal (JSONL)")
+    parser.add_argument("--no-verify", action="store_true", help="skip the area table check per project")
+    args = parser.parse_args(argv)
+
+    jobs = []
+    for code_value in args.codes:
+        try:
+            code = find_code(code_value)
+        except ValueError as e:
+            parser.error(str(e))
+        catalog = load_catalog(catalog_path_for(code['value']))
+        for piece in shard_catalog(catalog, args.shards) if args.shards > 1 else [catalog]:
+            jobs.append((code['value'], piece))
+
+    started = time.time()
+    results, browser = populate_in_windows(jobs, url=args.url, windows=args.windows, headless=not args.headed,
+                                           journal=args.journal, verify=not args.no_verify)
+    for result in results:
+        report(result)
+    print(f"\n🏁 {len(jobs)} projects in {time.time() - started:.1f}s, one browser"
+          + (f" at {browser['rss_mb_end']:.0f} MB RSS" if browser.get('rss_mb_end') is not None else "")
+          + f", {browser['window_switches']} window switches")
+    return 0 if all(run_ok(result) for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
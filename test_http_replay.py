@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test HTTP replay against the stand-in server
+Goal: Replay a recorded area request for a whole catalog and check what the server stored
+"""
+
+import json
+import threading
+import http.client
+from collections import Counter
+from urllib.parse import urlsplit
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from code_catalogs import load_catalog, catalog_path_for
+from standin_server import serve_in_thread
+from http_replay import AreaRequestTemplate, ConnectionPool, replay_areas, standin_project_counts
+
+CODE_VALUE = "CEZ_IECC2015"
+
+
+def create_project(url, code_value):
+    """
+    Start a stand-in project the way the application window does; returns its areas API URL
+    """
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=10)
+    try:
+        connection.request("POST", f"{parts.path}api/project", body=json.dumps({"code": code_value}),
+                           headers={"Content-Type": "application/json"})
+        project = json.loads(connection.getresponse().read())
+    finally:
+        connection.close()
+    return f"{url}api/project/{project['id']}/areas"
+
+
+def record_template(areas_url, category_name, subcategory):
+    """
+    The template for a request like the one the page sends when Create is clicked
+    """
+    recorded = [
+        {"method": "GET", "url": areas_url, "headers": {}, "body": None},
+        {"method": "POST", "url": areas_url, "headers": {"Content-Type": "application/json", "Host": "x"},
+         "body": json.dumps({"category": category_name, "subcategory": subcategory})},
+    ]
+    return AreaRequestTemplate.from_requests(recorded, category_name, subcategory)
+
+
+def test_replay_stores_every_catalog_area_once():
+    """
+    Replaying a full catalog leaves exactly one stored area per catalog entry
+    """
+    categories = load_catalog(catalog_path_for(CODE_VALUE))['categories']
+    areas = [(category, sub) for category, subs in categories.items() for sub in subs or []]
+    server, url = serve_in_thread()
+    try:
+        template = record_template(create_project(url, CODE_VALUE), *areas[0])
+        added, failed = replay_areas(template, areas, concurrency=4)
+        stored = standin_project_counts(server, template.url)
+    finally:
+        server.shutdown()
+
+    assert failed == []
+    assert sorted(added) == sorted(areas)
+    assert stored == dict(Counter(areas))
+
+
+def test_replay_reports_rejected_areas():
+    """
+    Areas the server turns away come back as failures and are not stored
+    """
+    categories = load_catalog(catalog_path_for(CODE_VALUE))['categories']
+    category_name, subs = next((category, subs) for category, subs in categories.items() if subs)
+    areas = [(category_name, subs[0]), (category_name, "No Such Area Type")]
+    server, url = serve_in_thread()
+    try:
+        template = record_template(create_project(url, CODE_VALUE), *areas[0])
+        added, failed = replay_areas(template, areas, concurrency=2)
+        stored = standin_project_counts(server, template.url)
+    finally:
+        server.shutdown()
+
+    assert added == [areas[0]]
+    assert [failure[:2] for failure in failed] == [areas[1]]
+    assert failed[0][2].startswith("HTTP 400")
+    assert stored == {areas[0]: 1}
+
+
+class DroppingHandler(BaseHTTPRequestHandler):
+    """
+    Answers GETs with keep-alive; handles each POST, then drops the connection without replying
+    """
+    protocol_version = "HTTP/1.1"
+    posts = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        type(self).posts += 1
+        self.close_connection = True
+
+
+def test_dropped_post_is_not_resent():
+    """
+    A POST on a reused connection that the server handled and then dropped fails instead of adding twice
+    """
+    handler = type("Handler", (DroppingHandler,), {"posts": 0})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/areas"
+    pool = ConnectionPool(url)
+    try:
+        assert pool.request("GET", url)[0] == 200
+        try:
+            pool.request("POST", url, b"{}", {"Content-Type": "application/json"})
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            pass
+        else:
+            raise AssertionError("the dropped POST did not raise")
+    finally:
+        pool.close()
+        server.shutdown()
+
+    assert handler.posts == 1
+    assert pool.connections_opened == 1
+
+
+if __name__ == "__main__":
+    test_replay_stores_every_catalog_area_once()
+    test_replay_reports_rejected_areas()
+    test_dropped_post_is_not_resent()
+    print("✅ HTTP replay tests passed")
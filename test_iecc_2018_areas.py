@@ -5,11 +5,10 @@ Goal: Select IECC 2018 code and access area categories
 """
 
 import time
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from driver_factory import DriverConfig, create_driver
 
 def test_iecc_2018_area_categories():
     """
@@ -20,9 +19,7 @@ def test_iecc_2018_area_categories():
         print("=== TESTING IECC 2018 AREA CATEGORIES ===")
         print("Step 1: Initializing WebDriver...")
         
-        service = ChromeService()
-        driver = webdriver.Chrome(service=service)
-        driver.maximize_window()
+        driver = create_driver(DriverConfig.interactive())
         
         print("Step 2: Navigating to COMcheck-Web...")
         url = "https://energycode.pnl.gov/COMcheckWeb/"
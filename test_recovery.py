@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test failure classification
+Goal: Check that add_area's errors land in the failure class recovery and metrics expect
+"""
+
+from selenium.common.exceptions import TimeoutException
+
+import comcheck_engine
+from recovery import classify, TIMEOUT, DATA
+
+
+class FakeElement:
+    def click(self):
+        pass
+
+
+class FakeDriver:
+    """
+    Just enough of a driver for add_area once its waits are replaced
+    """
+
+    def find_elements(self, by, value):
+        return []
+
+    def execute_script(self, script, *args):
+        return True
+
+
+def fake_waits(monkeypatch, failing_step):
+    def wait_until(driver, condition, step, timing=None):
+        if step == failing_step:
+            raise TimeoutException(f"{step} timed out")
+        return FakeElement()
+
+    monkeypatch.setattr(comcheck_engine, "wait_until", wait_until)
+    monkeypatch.setattr(comcheck_engine, "open_area_modal", lambda driver, timing: None)
+    monkeypatch.setattr(comcheck_engine, "find_category_radio", lambda driver, category_name: "radio")
+    monkeypatch.setattr(comcheck_engine, "select_subcategory", lambda driver, radio_id, subcategory, timing: None)
+
+
+def add_area_error(monkeypatch, failing_step):
+    fake_waits(monkeypatch, failing_step)
+    try:
+        comcheck_engine.add_area(FakeDriver(), "Office", "Enclosed")
+    except Exception as e:
+        return e
+    raise AssertionError("add_area did not raise")
+
+
+def test_row_that_never_appears_is_a_timeout(monkeypatch):
+    """
+    A row that doesn't show up after Create is classified as a timeout, not unknown
+    """
+    error = add_area_error(monkeypatch, "row_appear")
+    assert isinstance(error, RuntimeError)
+    assert classify(error) == TIMEOUT
+
+
+def test_create_button_timeout_is_a_timeout(monkeypatch):
+    error = add_area_error(monkeypatch, "create")
+    assert classify(error) == TIMEOUT
+
+
+def test_missing_option_is_data():
+    assert classify(LookupError("Could not find radio button for 'Office'")) == DATA